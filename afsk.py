@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+1200 baud AFSK (Bell 202, Dire Wolf's MODEM 1200) in NumPy: AX.25 and IL2P
+frames to audio and back.
+
+tx.py --synth renders its frames straight to a WAV with write_wav instead
+of sending them through Dire Wolf and recording the sound card, so the
+file takes a moment to make instead of as long as it plays. decode_wav
+goes the other way for rx.py --replay: it demodulates recordings of any
+length in overlapping chunks on all CPU cores and deframes both framings,
+with Reed-Solomon correction for IL2P.
+
+AX.25: HDLC flags, bit stuffing, CRC-16 FCS, LSB first, NRZI (a 0 bit
+changes the tone). IL2P as Dire Wolf sends it: 0x55 preamble, sync word
+F15E48, a type 0 (transparent) header carrying the payload length, then
+the AX.25 frame without FCS in blocks of up to 239 bytes with 16
+Reed-Solomon parity bytes each (maximum FEC); header and blocks are
+scrambled, bits go MSB first and straight to the tones, without NRZI.
+
+Transmissions start with txdelay of preamble and end with txtail of flags
+(AX.25) or preamble (IL2P), like Dire Wolf's TXDELAY and TXTAIL; a frame
+gap of more than zero keys down in between.
+"""
+VERSION = '0.01'
+
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from erasure import EXP, LOG, gf_inv, gf_mul
+
+BAUD = 1200
+MARK = 1200
+SPACE = 2200
+DEFAULT_RATE = 44100
+DEFAULT_TXDELAY = 0.3
+DEFAULT_TXTAIL = 0.1
+FRAMINGS = ('ax25', 'il2p')
+# decode_wav chunks; the overlap is longer than the longest frame (1023
+# bytes with IL2P parity, or bit stuffed AX.25, about 8 s at 1200 baud)
+CHUNK_SECONDS = 60.0
+CHUNK_OVERLAP = 10.0
+
+AX25_FLAG = 0x7E
+IL2P_PREAMBLE = 0x55
+IL2P_SYNC = 0xF15E48
+IL2P_HEADER_SIZE = 13
+IL2P_HEADER_PARITY = 2
+IL2P_BLOCK = 239
+IL2P_BLOCK_PARITY = 16
+IL2P_MAX_PAYLOAD = 1023
+# IL2P scrambler, x^9 + x^4 + 1, and its starting states
+IL2P_TX_LFSR = 0x00F
+IL2P_RX_LFSR = 0x1F0
+
+
+def fcs(data: bytes) -> int:
+    """AX.25 frame check sequence, CRC-16/X.25"""
+    crc = 0xFFFF
+    for b in data:
+        crc ^= b
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x8408 if crc & 1 else crc >> 1
+    return crc ^ 0xFFFF
+
+
+def _bits(data: bytes, order: str) -> np.ndarray:
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder=order)
+
+
+def _ones_run(bits: np.ndarray) -> np.ndarray:
+    """Length of the run of 1 bits each bit ends (0 for a 0 bit)"""
+    idx = np.arange(1, len(bits) + 1)
+    last_zero = np.maximum.accumulate(np.where(bits == 0, idx, 0))
+    return idx - last_zero
+
+
+# --- AX.25 ---
+
+def ax25_bits(frame: bytes) -> np.ndarray:
+    """Data bits of an AX.25 frame (without FCS) between flags: FCS added, bit stuffed"""
+    crc = fcs(frame)
+    bits = _bits(frame + bytes([crc & 0xFF, crc >> 8]), 'little')
+    run = _ones_run(bits)
+    return np.insert(bits, np.flatnonzero((run > 0) & (run % 5 == 0)) + 1, 0)
+
+
+def nrzi(bits: np.ndarray, level: int = 1) -> tuple[np.ndarray, int]:
+    """(tones, 1 for mark, of data bits sent NRZI from level, last level)"""
+    tones = (level + np.cumsum(bits == 0)) % 2
+    return tones.astype(np.uint8), int(tones[-1]) if len(tones) else level
+
+
+def ax25_frames(bits: np.ndarray) -> list[tuple[int, bytes]]:
+    """(bit index, frame) of the AX.25 frames (FCS checked and removed) in NRZI-decoded data bits"""
+    if len(bits) < 8:
+        return []
+    window = np.lib.stride_tricks.sliding_window_view(bits, 8) @ (1 << np.arange(8))
+    flags = np.flatnonzero(window == AX25_FLAG)
+    frames = []
+    for start, end in zip(flags[:-1], flags[1:]):
+        body = bits[start + 8:end]
+        if len(body) < 8 * 18:
+            continue
+        run = _ones_run(body)
+        if run.max() > 5:
+            continue
+        # Drop the 0 stuffed after every five 1s
+        keep = np.ones(len(body), dtype=bool)
+        keep[1:] = ~((body[1:] == 0) & (run[:-1] == 5))
+        body = body[keep]
+        if len(body) % 8:
+            continue
+        data = np.packbits(body, bitorder='little').tobytes()
+        if fcs(data[:-2]) == int.from_bytes(data[-2:], 'little'):
+            frames.append((int(start), data[:-2]))
+    return frames
+
+
+# --- IL2P ---
+
+def _scramble(data: bytes) -> bytes:
+    state = IL2P_TX_LFSR
+    out = []
+    for bit in _bits(data, 'big').tolist() + [0] * 5:
+        out.append(((state >> 4) ^ state) & 1)
+        state = ((((bit ^ state) & 1) << 9) | (state ^ ((state & 1) << 4))) >> 1
+    # The first five bits out are the scrambler filling up
+    return np.packbits(np.array(out[5:], dtype=np.uint8)).tobytes()
+
+
+def _descramble(data: bytes) -> bytes:
+    state = IL2P_RX_LFSR
+    out = []
+    for bit in _bits(data, 'big').tolist():
+        out.append((bit ^ state) & 1)
+        state = ((state >> 1) | (bit << 8)) ^ (bit << 3)
+    return np.packbits(np.array(out, dtype=np.uint8)).tobytes()
+
+
+_GENERATORS = {}
+
+
+def _generator(nroots: int) -> list[int]:
+    """Reed-Solomon generator polynomial with roots α^0 … α^(nroots-1), highest degree first"""
+    if nroots not in _GENERATORS:
+        g = [1]
+        for i in range(nroots):
+            g = [a ^ gf_mul(b, EXP[i]) for a, b in zip(g + [0], [0] + g)]
+        _GENERATORS[nroots] = g
+    return _GENERATORS[nroots]
+
+
+def rs_encode(data: bytes, nroots: int) -> bytes:
+    """data followed by its nroots Reed-Solomon parity bytes"""
+    gen = _generator(nroots)
+    rem = [0] * nroots
+    for b in data:
+        fb = b ^ rem[0]
+        rem = rem[1:] + [0]
+        if fb:
+            lf = LOG[fb]
+            rem = [r ^ EXP[lf + LOG[g]] if g else r for r, g in zip(rem, gen[1:])]
+    return data + bytes(rem)
+
+
+def _syndromes(block: bytes, nroots: int) -> list[int]:
+    out = []
+    for i in range(nroots):
+        s = 0
+        for b in block:
+            s = gf_mul(s, EXP[i]) ^ b
+        out.append(s)
+    return out
+
+
+def _eval(poly: list[int], x: int) -> int:
+    """poly (lowest degree first) at x"""
+    v = 0
+    for c in reversed(poly):
+        v = gf_mul(v, x) ^ c
+    return v
+
+
+def rs_correct(block: bytes, nroots: int) -> bytes | None:
+    """
+    A Reed-Solomon block (data and parity, at most 255 bytes) with up to
+    nroots/2 wrong bytes put right; None if it has more errors than that
+    """
+    synd = _syndromes(block, nroots)
+    if not any(synd):
+        return block
+    # Berlekamp-Massey: error locator, lowest degree first
+    locator, prev, errors, shift, last = [1], [1], 0, 1, 1
+    for k in range(nroots):
+        d = synd[k]
+        for i in range(1, min(errors, len(locator) - 1) + 1):
+            d ^= gf_mul(locator[i], synd[k - i])
+        if not d:
+            shift += 1
+            continue
+        scaled = [0] * shift + [gf_mul(gf_mul(d, gf_inv(last)), c) for c in prev]
+        size = max(len(locator), len(scaled))
+        new = [(locator[i] if i < len(locator) else 0) ^ (scaled[i] if i < len(scaled) else 0) for i in range(size)]
+        if 2 * errors <= k:
+            prev, errors, last, shift = locator, k + 1 - errors, d, 1
+        else:
+            shift += 1
+        locator = new
+    if 2 * errors > nroots:
+        return None
+    # Chien search over the byte positions of this (shortened) block; the
+    # last byte is x^0
+    n = len(block)
+    powers = [p for p in range(n) if not _eval(locator, EXP[(255 - p) % 255])]
+    if len(powers) != errors:
+        return None
+    evaluator = [0] * nroots
+    for i, s in enumerate(synd):
+        for j, c in enumerate(locator[:nroots - i]):
+            evaluator[i + j] ^= gf_mul(s, c)
+    # Formal derivative: only the odd powers survive in GF(2^8)
+    derivative = [0 if i % 2 else c for i, c in enumerate(locator[1:])]
+    fixed = bytearray(block)
+    for p in powers:
+        # Forney, first consecutive root 0
+        x_inv = EXP[(255 - p) % 255]
+        denominator = _eval(derivative, x_inv)
+        if not denominator:
+            return None
+        fixed[n - 1 - p] ^= gf_mul(EXP[p], gf_mul(_eval(evaluator, x_inv), gf_inv(denominator)))
+    fixed = bytes(fixed)
+    return fixed if not any(_syndromes(fixed, nroots)) else None
+
+
+def _block_sizes(length: int) -> list[int]:
+    count = -(-length // IL2P_BLOCK)
+    small = length // count
+    large = length - count * small
+    return [small + 1] * large + [small] * (count - large)
+
+
+def il2p_encode(frame: bytes) -> bytes:
+    """IL2P encoding of an AX.25 frame (without FCS), sync word to last parity byte"""
+    if len(frame) > IL2P_MAX_PAYLOAD:
+        raise ValueError(f"IL2P carries at most {IL2P_MAX_PAYLOAD} bytes per frame, not {len(frame)}")
+    header = bytearray(IL2P_HEADER_SIZE)
+    header[0] |= 0x80                       # maximum FEC, type 0 header
+    for i in range(10):                     # payload byte count, bit 7 of bytes 2-11
+        if len(frame) >> (9 - i) & 1:
+            header[2 + i] |= 0x80
+    out = [IL2P_SYNC.to_bytes(3, 'big'), rs_encode(_scramble(bytes(header)), IL2P_HEADER_PARITY)]
+    pos = 0
+    for size in _block_sizes(len(frame)) if frame else []:
+        out.append(rs_encode(_scramble(frame[pos:pos + size]), IL2P_BLOCK_PARITY))
+        pos += size
+    return b''.join(out)
+
+
+def il2p_frames(bits: np.ndarray) -> list[tuple[int, bytes]]:
+    """
+    (bit index, AX.25 frame without FCS) of the IL2P frames in raw bits,
+    either polarity, Reed-Solomon corrected
+    """
+    if len(bits) < 24:
+        return []
+    window = np.lib.stride_tricks.sliding_window_view(bits, 24) @ (1 << np.arange(23, -1, -1))
+    frames = []
+    for start in np.flatnonzero((window == IL2P_SYNC) | (window == IL2P_SYNC ^ 0xFFFFFF)):
+        raw = bits[start + 24:] ^ (window[start] != IL2P_SYNC)
+        data = np.packbits(raw[:len(raw) - len(raw) % 8]).tobytes()
+        block = data[:IL2P_HEADER_SIZE + IL2P_HEADER_PARITY]
+        if len(block) < IL2P_HEADER_SIZE + IL2P_HEADER_PARITY:
+            continue
+        fixed = rs_correct(block, IL2P_HEADER_PARITY)
+        if fixed is None:
+            continue
+        header = _descramble(fixed[:IL2P_HEADER_SIZE])
+        if header[1] & 0x80 or not header[0] & 0x80:
+            # Only the type 0, maximum FEC headers write_wav makes
+            continue
+        length = sum(((header[2 + i] >> 7) & 1) << (9 - i) for i in range(10))
+        pos = len(block)
+        payload = []
+        for size in _block_sizes(length) if length else []:
+            block = data[pos:pos + size + IL2P_BLOCK_PARITY]
+            fixed = rs_correct(block, IL2P_BLOCK_PARITY) if len(block) == size + IL2P_BLOCK_PARITY else None
+            if fixed is None:
+                break
+            payload.append(_descramble(fixed[:size]))
+            pos += len(block)
+        else:
+            frames.append((int(start), b''.join(payload)))
+    return frames
+
+
+# --- Audio ---
+
+def modulate(tones: np.ndarray, rate: int = DEFAULT_RATE, amplitude: float = 0.5) -> np.ndarray:
+    """Phase-continuous AFSK, int16 samples, for tones (1 mark, 0 space) at BAUD"""
+    edges = np.rint(np.arange(len(tones) + 1) * (rate / BAUD)).astype(np.int64)
+    step = np.where(tones == 1, 2 * np.pi * MARK / rate, 2 * np.pi * SPACE / rate)
+    phase = np.cumsum(np.repeat(step, np.diff(edges)))
+    return (np.sin(phase) * amplitude * 32767).astype(np.int16)
+
+
+def transmission_tones(frames: list[bytes], framing: str = 'il2p', txdelay: float = DEFAULT_TXDELAY,
+                       txtail: float = DEFAULT_TXTAIL) -> np.ndarray:
+    """Tones of one key-up sending frames (AX.25 without FCS) back to back"""
+    pad = lambda seconds: max(1, int(seconds * BAUD / 8))
+    if framing == 'ax25':
+        flag = _bits(bytes([AX25_FLAG]), 'little')
+        parts = [np.tile(flag, pad(txdelay))]
+        for frame in frames:
+            parts += [ax25_bits(frame), flag]
+        parts.append(np.tile(flag, pad(txtail)))
+        tones, _ = nrzi(np.concatenate(parts))
+        return tones
+    if framing == 'il2p':
+        parts = [_bits(bytes([IL2P_PREAMBLE]) * pad(txdelay), 'big')]
+        for frame in frames:
+            parts.append(_bits(il2p_encode(frame), 'big'))
+        parts.append(_bits(bytes([IL2P_PREAMBLE]) * pad(txtail), 'big'))
+        return np.concatenate(parts)
+    raise ValueError(f"unknown framing {framing!r}")
+
+
+def write_wav(path: str, frames: list[bytes], framing: str = 'il2p', rate: int = DEFAULT_RATE,
+              gap: float = 0.0, txdelay: float = DEFAULT_TXDELAY, txtail: float = DEFAULT_TXTAIL) -> float:
+    """
+    Render frames (AX.25 without FCS) to a mono 16-bit WAV, in one
+    transmission or, with gap seconds of silence between frames, one per
+    frame. Returns the length of the audio in seconds.
+    """
+    transmissions = [frames] if gap <= 0 else [[f] for f in frames]
+    silence = np.zeros(int(gap * rate), dtype=np.int16)
+    samples = 0
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        for i, batch in enumerate(transmissions):
+            audio = modulate(transmission_tones(batch, framing, txdelay, txtail), rate)
+            if i:
+                audio = np.concatenate([silence, audio])
+            w.writeframes(audio.tobytes())
+            samples += len(audio)
+    return samples / rate
+
+
+def read_wav(path: str, start: int = 0, count: int | None = None) -> tuple[np.ndarray, int]:
+    """(samples as float, first channel only, sample rate) of a 8/16/24/32-bit PCM WAV, or count of them from start"""
+    with wave.open(path, "rb") as w:
+        rate, width, channels = w.getframerate(), w.getsampwidth(), w.getnchannels()
+        w.setpos(min(start, w.getnframes()))
+        data = w.readframes(w.getnframes() if count is None else count)
+    if width == 1:
+        samples = np.frombuffer(data, dtype=np.uint8).astype(np.float64) - 128
+    elif width == 2:
+        samples = np.frombuffer(data, dtype='<i2').astype(np.float64)
+    elif width == 3:
+        # Little-endian 24-bit: shifted into the top of an int32 for the sign
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = (raw[:, 0] << 8 | raw[:, 1] << 16 | raw[:, 2] << 24).astype(np.float64) / 65536
+    elif width == 4:
+        samples = np.frombuffer(data, dtype='<i4').astype(np.float64) / 65536
+    else:
+        raise ValueError(f"{path}: {8 * width}-bit WAV, only 8, 16, 24 and 32 bits are supported")
+    return samples[::channels], rate
+
+
+def demodulate(samples: np.ndarray, rate: int, gain: float = 0.3) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (tones, 1 mark and 0 space, and the sample index each was read at)
+    heard in samples. Mark and space energy over one bit time decides each
+    sample; a bit clock read at the middle of every bit is pulled by gain
+    of its error towards each tone change.
+    """
+    n = max(1, int(round(rate / BAUD)))
+    t = np.arange(len(samples)) / rate
+    kernel = np.ones(n) / n
+    power = []
+    for f in (MARK, SPACE):
+        mixed = samples * np.exp(-2j * np.pi * f * t)
+        power.append(np.abs(np.convolve(mixed, kernel, mode='same')))
+    tone = (power[0] > power[1]).astype(np.uint8)
+    period = rate / BAUD
+    instants = [np.zeros(0)]
+    clock = period / 2
+    # Only the tone changes go through Python, the bits between them in one step
+    for edge in np.flatnonzero(np.diff(tone)).tolist() + [len(tone)]:
+        edge += 1
+        if clock < edge:
+            k = int(np.ceil((edge - clock) / period))
+            instants.append(clock + np.arange(k) * period)
+            clock += k * period
+        # Half a bit after a change is the middle of the next bit
+        clock += gain * ((edge - clock) % period - period / 2)
+    positions = np.concatenate(instants).astype(np.int64)
+    positions = positions[positions < len(tone)]
+    return tone[positions], positions
+
+
+def decode(samples: np.ndarray, rate: int, framings=FRAMINGS) -> list[tuple[int, bytes]]:
+    """(sample index, AX.25 frame without FCS) of the frames heard in audio samples, in order"""
+    tones, positions = demodulate(samples, rate)
+    frames = []
+    for framing in framings:
+        if framing == 'ax25':
+            # NRZI: no change of tone is a 1
+            found = ax25_frames((tones[1:] == tones[:-1]).astype(np.uint8))
+        elif framing == 'il2p':
+            found = il2p_frames(tones)
+        else:
+            raise ValueError(f"unknown framing {framing!r}")
+        frames += [(int(positions[i]), frame) for i, frame in found]
+    return sorted(frames)
+
+
+def _decode_chunk(job) -> list[tuple[int, bytes]]:
+    path, start, count, own_from, own_to, framings = job
+    samples, rate = read_wav(path, start, count)
+    return [(start + pos, frame) for pos, frame in decode(samples, rate, framings)
+            if own_from <= start + pos < own_to]
+
+
+def decode_wav(path: str, framings=FRAMINGS, workers: int | None = None,
+               chunk: float = CHUNK_SECONDS, overlap: float = CHUNK_OVERLAP):
+    """
+    Yield (seconds into the recording, frame) for a WAV file of any length.
+    It is cut into chunks of chunk seconds, each read with overlap seconds
+    more on both sides so frames across a cut are whole in one of them,
+    and demodulated on a pool of workers processes (default: one per CPU);
+    a frame belongs to the chunk it starts in.
+    """
+    with wave.open(path, "rb") as w:
+        rate, total = w.getframerate(), w.getnframes()
+    step = max(1, int(chunk * rate))
+    extra = int(overlap * rate)
+    jobs = [(path, max(0, s - extra), step + 2 * extra, s, s + step, tuple(framings)) for s in range(0, total, step)]
+    pool = ProcessPoolExecutor(workers) if len(jobs) > 1 and workers != 1 else None
+    try:
+        for frames in (pool.map if pool else map)(_decode_chunk, jobs):
+            for pos, frame in frames:
+                yield pos / rate, frame
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+
+def wav_seconds(path: str) -> float:
+    with wave.open(path, "rb") as w:
+        return w.getnframes() / w.getframerate()
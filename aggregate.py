@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Several SSDV packets in one frame.
+
+Every frame costs its AX.25 header, the IL2P sync word, header and parity
+and the gap between frames, whatever its payload. With --aggregate MTU
+tx.py packs consecutive SSDV packets and repair frames into one frame of
+up to MTU bytes (AX.25 header not counted) and rx.py splits it again. A
+lost frame now loses all the packets in it, so this pays off on a clean
+link; repair frames make up for some of it.
+
+Aggregated frame (big-endian):
+  offset  0    : sync           0x55
+  offset  1    : type           0x69, so receivers without this module
+                                reject it as an invalid SSDV packet
+  offset  2    : packet length  of the SSDV packets in it
+  offset  4    : items          SSDV packets (packet length bytes) and
+                                repair frames (packet length + 11 bytes),
+                                back to back; each carries its own CRC
+"""
+VERSION = '0.01'
+
+import struct
+
+import erasure
+
+AGGREGATE_SYNC = 0x55
+AGGREGATE_TYPE = 0x69
+AGGREGATE_HEADER = struct.Struct(">BBH")
+# IL2P carries at most 1023 bytes per frame, the 16-byte AX.25 header included
+MAX_MTU = 1023 - 16
+
+
+def item_length(item_type: int, packet_length: int) -> int:
+    """Length of an item by its type byte: a repair frame or an SSDV packet"""
+    if item_type == erasure.REPAIR_TYPE:
+        return packet_length + erasure.REPAIR_OVERHEAD
+    return packet_length
+
+
+def pack(frames: list[bytes], packet_length: int, mtu: int) -> list[bytes]:
+    """
+    Frame payloads carrying frames (SSDV packets and repair frames of
+    packet_length, in the order given) in as few frames of up to mtu bytes
+    as keeps that order. A frame with room for only one item goes out as is.
+    """
+    out = []
+    batch = []
+    size = AGGREGATE_HEADER.size
+    for frame in frames:
+        if batch and size + len(frame) > mtu:
+            out.append(_join(batch, packet_length))
+            batch, size = [], AGGREGATE_HEADER.size
+        batch.append(frame)
+        size += len(frame)
+    if batch:
+        out.append(_join(batch, packet_length))
+    return out
+
+
+def _join(batch: list[bytes], packet_length: int) -> bytes:
+    if len(batch) == 1:
+        return batch[0]
+    return AGGREGATE_HEADER.pack(AGGREGATE_SYNC, AGGREGATE_TYPE, packet_length) + b''.join(batch)
+
+
+def is_aggregate(frame: bytes) -> bool:
+    return len(frame) > AGGREGATE_HEADER.size and frame[0] == AGGREGATE_SYNC and frame[1] == AGGREGATE_TYPE
+
+
+def split(frame: bytes) -> list[bytes] | None:
+    """Items of an aggregated frame, None if it is not one or its items do not add up"""
+    if not is_aggregate(frame):
+        return None
+    _, _, packet_length = AGGREGATE_HEADER.unpack_from(frame)
+    if packet_length == 0:
+        return None
+    items = []
+    pos = AGGREGATE_HEADER.size
+    while pos < len(frame):
+        end = pos + item_length(frame[pos + 1] if pos + 1 < len(frame) else 0, packet_length)
+        if frame[pos] != AGGREGATE_SYNC or end > len(frame):
+            return None
+        items.append(frame[pos:end])
+        pos = end
+    return items
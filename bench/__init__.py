@@ -0,0 +1,15 @@
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Microbenchmarks for the ssdv2sat receive and transmit paths.
+
+Run from the project root, e.g.:
+    python -m bench.kiss_deframe
+    python -m bench.rx_pipeline
+    python -m bench.tx_pipeline
+
+bench.kissgen writes synthetic KISS captures (also for rx.py --replay) and
+bench.kiss_server stands in for Dire Wolf's KISS TCP port.
+"""
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+AFSK synthesis round trip: render frames to WAV, decode them back.
+
+The frames of a random image (bench.kissgen, framed as tx.py frames them)
+are rendered with afsk.write_wav in each framing, with optional white
+noise, and decoded with afsk.decode. Reports how much faster than real
+time rendering and decoding run and how many frames come back intact;
+exits with status 1 if any frame is lost without noise.
+
+Given a WAV (e.g. from tx.py --synth) it decodes that instead and can
+write the frames as a KISS capture for `rx.py --replay`.
+
+Usage:
+    python -m bench.afsk_roundtrip
+    python -m bench.afsk_roundtrip --noise 0.3 --framing il2p
+    python -m bench.afsk_roundtrip --wav audio/x.wav --framing il2p --kiss pass.kiss
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import afsk
+from bench.kissgen import image_packets
+from tx import FEND, ax25_address, kiss_escape
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AFSK WAV synthesis and decode round trip")
+    parser.add_argument("--framing", nargs="+", choices=afsk.FRAMINGS, default=list(afsk.FRAMINGS),
+                        help="framings to try (default: ax25 il2p)")
+    parser.add_argument("-l", "--length", type=int, default=128, help="SSDV packet length (default: 128)")
+    parser.add_argument("--rate", type=int, default=afsk.DEFAULT_RATE, help=f"sample rate (default: {afsk.DEFAULT_RATE})")
+    parser.add_argument("--noise", type=float, default=0.0, help="white noise, relative to the signal amplitude (default: 0)")
+    parser.add_argument("--wav", help="decode this WAV instead of rendering one")
+    parser.add_argument("--kiss", help="with --wav, write the decoded frames here as a KISS capture")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    args = parser.parse_args()
+
+    if args.wav:
+        samples, rate = afsk.read_wav(args.wav)
+        for framing in args.framing:
+            t0 = time.perf_counter()
+            frames = [frame for _, frame in afsk.decode(samples, rate, (framing,))]
+            elapsed = time.perf_counter() - t0
+            print(f"{framing}: {len(frames)} frames from {len(samples) / rate:.1f} s of audio in {elapsed:.2f} s"
+                  f" ({len(samples) / rate / elapsed:.0f}× real time)")
+            if args.kiss and frames:
+                with open(args.kiss, "wb") as f:
+                    f.write(b''.join(FEND + b'\x00' + kiss_escape(frame) + FEND for frame in frames))
+                print(f"→ {args.kiss}")
+        return
+
+    rng = random.Random(args.seed)
+    packets = image_packets(rng, "BENCH", args.length)
+    header = ax25_address("ABC" + hex(len(packets))[2:], last=True) + ax25_address("BENCH") + b'\x03\xf0'
+    frames = [header + p for p in packets]
+    noise = np.random.default_rng(args.seed)
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pass.wav")
+        for framing in args.framing:
+            t0 = time.perf_counter()
+            seconds = afsk.write_wav(path, frames, framing, args.rate)
+            t1 = time.perf_counter()
+            samples, rate = afsk.read_wav(path)
+            if args.noise:
+                samples = samples + noise.normal(0, args.noise * 0.5 * 32767, len(samples))
+            t2 = time.perf_counter()
+            got = [frame for _, frame in afsk.decode(samples, rate, (framing,))]
+            t3 = time.perf_counter()
+            intact = len(set(got) & set(frames))
+            print(f"{framing}: {len(frames)} frames, {seconds:.1f} s of audio;"
+                  f" render {seconds / (t1 - t0):.0f}× real time, decode {seconds / (t3 - t2):.0f}× real time;"
+                  f" {intact}/{len(frames)} frames decoded intact")
+            failed |= not args.noise and intact != len(frames)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Aggregated framing: SSDV payload bits per second against one packet per frame.
+
+The packets of a random image (bench.kissgen) are packed with
+aggregate.pack at each MTU, for each packet length, and timed on air with
+img2ssdv.frame_airtime (the same model tx.py paces with: per-frame AX.25
+and IL2P overhead, plus IL2P parity for every extra Reed-Solomon block).
+Reports the SSDV bits per second each framing gets out of the channel and
+the gain over one packet per frame (MTU 0). With --ber every bit on air is
+flipped independently with that probability and a frame with any error
+is lost, with all its packets, which is where large frames lose out; the
+goodput column counts only packets that arrive. Also times pack and
+aggregate.split.
+
+Usage:
+    python -m bench.aggregation
+    python -m bench.aggregation --length 64 128 --mtu 0 512 1007 --baud 9600 --ber 1e-4
+"""
+import argparse
+import random
+import time
+
+import aggregate
+import img2ssdv
+from bench.kissgen import image_packets
+
+
+def measure(packets: list[bytes], length: int, mtu: int, baud: int, ber: float) -> tuple[float, float, int]:
+    """(SSDV bits/s, goodput bits/s at ber, frames) for one framing"""
+    frames = aggregate.pack(packets, length, mtu) if mtu else packets
+    airtime = goodput = 0.0
+    for frame in frames:
+        seconds = img2ssdv.frame_airtime(len(frame), baud)
+        airtime += seconds
+        items = len(aggregate.split(frame)) if aggregate.is_aggregate(frame) else 1
+        goodput += items * length * 8 * (1 - ber) ** (seconds * baud)
+    return len(packets) * length * 8 / airtime, goodput / airtime, len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregated framing benchmark")
+    parser.add_argument("--length", nargs="+", type=int, default=[64, 128, 256], help="SSDV packet lengths (default: 64 128 256)")
+    parser.add_argument("--mtu", nargs="+", type=int, default=[0, 512, 768, aggregate.MAX_MTU],
+                        help=f"aggregation MTUs, 0 is one packet per frame (default: 0 512 768 {aggregate.MAX_MTU})")
+    parser.add_argument("--baud", type=int, default=img2ssdv.DEFAULT_BAUD, help=f"modem bit rate (default: {img2ssdv.DEFAULT_BAUD})")
+    parser.add_argument("--ber", type=float, default=1e-5, help="bit error rate for the goodput column (default: 1e-5)")
+    parser.add_argument("--size", nargs=2, type=int, default=[320, 240], metavar=("WIDTH", "HEIGHT"),
+                        help="image size (default: 320 240)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{args.size[0]}×{args.size[1]} image at {args.baud} baud, goodput at BER {args.ber:g}\n")
+    print(f"{'length':>6} {'MTU':>5} {'frames':>7} {'SSDV bit/s':>11} {'gain':>6} {'goodput':>9} {'gain':>6}")
+    for length in args.length:
+        packets = image_packets(rng, "BENCH", length, 20, tuple(args.size))
+        base = None
+        for mtu in args.mtu:
+            if mtu and 2 * length > mtu - aggregate.AGGREGATE_HEADER.size:
+                continue
+            rate, goodput, frames = measure(packets, length, mtu, args.baud, args.ber)
+            base = base or (rate, goodput)
+            print(f"{length:6d} {mtu or '-':>5} {frames:7d} {rate:11.1f} {rate / base[0] - 1:+6.0%}"
+                  f" {goodput:9.1f} {goodput / base[1] - 1:+6.0%}")
+
+    packets = image_packets(rng, "BENCH", 128, 20, tuple(args.size))
+    repeat = 200
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        frames = aggregate.pack(packets, 128, aggregate.MAX_MTU)
+    t1 = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            aggregate.split(frame)
+    t2 = time.perf_counter()
+    n = repeat * len(packets)
+    print(f"\npack: {(t1 - t0) / n * 1e6:.2f} µs/packet, split: {(t2 - t1) / n * 1e6:.2f} µs/packet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Erasure-coded repair frames: coding speed and images recovered under loss.
+
+The packets of a random image (bench.kissgen) get erasure.repair_frames
+at several --repair settings, and every frame is dropped independently
+with each loss rate. What arrives goes through an erasure.Repairer the
+way rx.py uses it. Reports encode and rebuild speed, and per loss rate
+and setting the share of images received whole and of packets delivered,
+with the airtime the repair frames cost.
+
+Usage:
+    python -m bench.erasure_codes
+    python -m bench.erasure_codes --loss 0.05 0.2 --repair 0 2 4 8 --trials 200
+"""
+import argparse
+import random
+import time
+
+import erasure
+from bench.kissgen import image_packets
+
+
+def deliver(packets, repairs, rng, loss) -> tuple[int, int, float]:
+    """(packets the receiver ends up with, how many were rebuilt, seconds spent rebuilding) for one pass"""
+    have = {i: p for i, p in enumerate(packets) if rng.random() >= loss}
+    repairer = erasure.Repairer()
+    firsts = {repairer.add(erasure.parse_repair(f)) for f in repairs if rng.random() >= loss}
+    t0 = time.perf_counter()
+    for first in firsts:
+        for p in repairer.solve(first, have.__contains__, have.__getitem__):
+            have[(p[7] << 8) | p[8]] = p
+    return len(have), repairer.recovered, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Erasure-coded repair frame benchmark")
+    parser.add_argument("-l", "--length", type=int, default=128, help="SSDV packet length (default: 128)")
+    parser.add_argument("--size", nargs=2, type=int, default=[320, 240], metavar=("WIDTH", "HEIGHT"),
+                        help="image size (default: 320 240)")
+    parser.add_argument("--group", type=int, default=erasure.DEFAULT_GROUP, help=f"packets per group (default: {erasure.DEFAULT_GROUP})")
+    parser.add_argument("--repair", nargs="+", type=int, default=[0, 2, 4, 8], help="repair frames per group (default: 0 2 4 8)")
+    parser.add_argument("--loss", nargs="+", type=float, default=[0.01, 0.05, 0.1, 0.2, 0.3],
+                        help="frame loss rates (default: 0.01 0.05 0.1 0.2 0.3)")
+    parser.add_argument("--trials", type=int, default=100, help="passes per loss rate and setting (default: 100)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    packets = image_packets(rng, "BENCH", args.length, 20, tuple(args.size))
+    n = len(packets)
+    print(f"{args.size[0]}×{args.size[1]}, {n} packets of {args.length} bytes, groups of {args.group}\n")
+
+    coded = {}
+    for m in args.repair:
+        t0 = time.perf_counter()
+        coded[m] = erasure.repair_frames(packets, m, args.group)
+        if m:
+            elapsed = time.perf_counter() - t0
+            print(f"encode {m:2d}/{args.group}: {len(coded[m]) * args.length / elapsed / 1e6:6.2f} MB/s of repair data"
+                  f" ({elapsed * 1000:.1f} ms, {len(coded[m]) / n:.0%} more airtime)")
+
+    rebuilt = rebuild_time = 0
+    print(f"\n{'loss':>6}" + "".join(f"{f'{m}/{args.group} whole':>14}{'packets':>9}" for m in args.repair))
+    for loss in args.loss:
+        row = f"{loss:6.0%}"
+        for m in args.repair:
+            whole = got = 0
+            for _ in range(args.trials):
+                count, recovered, elapsed = deliver(packets, coded[m], rng, loss)
+                whole += count == n
+                got += count
+                rebuilt += recovered
+                rebuild_time += elapsed
+            row += f"{whole / args.trials:14.0%}{got / (args.trials * n):9.1%}"
+        print(row)
+    if rebuilt:
+        print(f"\nrebuild: {rebuild_time / rebuilt * 1e6:.1f} µs per lost packet rebuilt ({rebuilt} rebuilt)")
+
+
+if __name__ == "__main__":
+    main()
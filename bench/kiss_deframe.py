@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+KISS deframing throughput: rx.KissDeframer against the old per-byte loop.
+
+Usage:
+    python -m bench.kiss_deframe
+    python -m bench.kiss_deframe --frames 20000 --length 256 --chunk 1024
+"""
+import argparse
+import os
+import time
+
+from rx import KissDeframer
+
+FEND = b'\xC0'
+FESC = b'\xDB'
+TFEND = b'\xDC'
+TFESC = b'\xDD'
+
+
+def kiss_escape(data):
+    data = data.replace(FESC, FESC + TFESC)
+    data = data.replace(FEND, FESC + TFEND)
+    return data
+
+
+def legacy_unescape(data: bytes) -> bytes:
+    """Byte by byte unescape, as rx.py did before KissDeframer"""
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        if data[i] == 0xDB and i + 1 < len(data):
+            if data[i + 1] == 0xDC:
+                out.append(0xC0)
+            elif data[i + 1] == 0xDD:
+                out.append(0xDB)
+            else:
+                out.append(0xDB)
+                out.append(data[i + 1])
+            i += 2
+        else:
+            out.append(data[i])
+            i += 1
+    return bytes(out)
+
+
+def legacy_deframe(chunks):
+    """The old rx.main receive loop, minus the SSDV handling"""
+    frames = []
+    packet_buf = bytearray()
+    in_frame = False
+    for chunk in chunks:
+        for byte in chunk:
+            if byte == 0xC0:
+                if in_frame:
+                    if len(packet_buf) >= 1:
+                        frames.append(bytes(packet_buf[:1]) + legacy_unescape(packet_buf[1:]))
+                    packet_buf = bytearray()
+                    in_frame = False
+                else:
+                    in_frame = True
+                    packet_buf = bytearray()
+            elif in_frame:
+                packet_buf.append(byte)
+    return frames
+
+
+def deframer_deframe(chunks):
+    deframer = KissDeframer()
+    frames = []
+    for chunk in chunks:
+        frames.extend(deframer.feed(chunk))
+    return frames
+
+
+def make_stream(n_frames, length):
+    """KISS stream of n_frames data frames with random (escape-heavy) payloads"""
+    out = bytearray()
+    frames = []
+    for i in range(n_frames):
+        payload = os.urandom(16 + length)
+        frames.append(b'\x00' + payload)
+        out += FEND + b'\x00' + kiss_escape(payload) + FEND
+    return bytes(out), frames
+
+
+def run(name, fn, chunks, expected, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        frames = fn(chunks)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    if frames != expected:
+        raise SystemExit(f"{name}: output does not match the input frames")
+    print(f"{name:<16}: {len(expected) / best:12,.0f} frames/s  ({best * 1000:8.1f} ms)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KISS deframer microbenchmark")
+    parser.add_argument("--frames", type=int, default=5000, help="frames per run (default: 5000)")
+    parser.add_argument("--length", type=int, default=128, help="SSDV bytes per frame (default: 128)")
+    parser.add_argument("--chunk", type=int, default=1024, help="recv() chunk size (default: 1024)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per method, best is kept (default: 3)")
+    args = parser.parse_args()
+
+    stream, expected = make_stream(args.frames, args.length)
+    chunks = [stream[i:i + args.chunk] for i in range(0, len(stream), args.chunk)]
+    print(f"{args.frames} frames, {len(stream)} bytes on the wire, {args.chunk}-byte chunks\n")
+
+    legacy = run("per-byte loop", legacy_deframe, chunks, expected, args.repeat)
+    fast = run("KissDeframer", deframer_deframe, chunks, expected, args.repeat)
+    print(f"\nspeed-up: {legacy / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
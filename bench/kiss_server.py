@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Local stand-in for Dire Wolf's KISS TCP port.
+
+Every client that connects is sent the same list of KISS frames (as fast
+as possible, or at --rate frames/s) and the connection is then closed, the
+way rx.py sees a pass end. Frames a client sends, as tx.py does, are
+deframed and counted with their arrival time instead of being keyed up.
+
+Usage:
+    python -m bench.kiss_server pass.kiss --port 8001 --rate 20
+    python -m bench.kiss_server --port 8001          (sink for tx.py)
+"""
+import argparse
+import socket
+import threading
+import time
+
+from rx import KissDeframer, KISS_FEND
+
+
+class KissServer:
+    """KISS TCP server on a thread; port=0 picks a free port"""
+
+    def __init__(self, frames=(), host: str = "127.0.0.1", port: int = 0, rate: float | None = None,
+                 close_when_sent: bool = True):
+        self.frames = list(frames)
+        self.rate = rate
+        self.close_when_sent = close_when_sent
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.sock.listen(4)
+        self.host, self.port = self.sock.getsockname()
+        self.lock = threading.Lock()
+        # (arrival time, frame) of everything clients sent
+        self.received = []
+        self.clients = 0
+        self.thread = threading.Thread(target=self._accept, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.sock.close()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.clients += 1
+            threading.Thread(target=self._client, args=(conn,), daemon=True).start()
+
+    def _client(self, conn):
+        if self.frames:
+            reader = threading.Thread(target=self._read, args=(conn,), daemon=True)
+            reader.start()
+            try:
+                self._send(conn)
+            except OSError:
+                pass
+            if self.close_when_sent:
+                # close() alone would not end a connection the reader
+                # thread is still blocked on
+                try:
+                    conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                conn.close()
+                return
+            reader.join()
+        else:
+            self._read(conn)
+
+    def _send(self, conn):
+        if not self.rate:
+            conn.sendall(b''.join(self.frames))
+            return
+        start = time.monotonic()
+        for i, frame in enumerate(self.frames):
+            delay = start + i / self.rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            conn.sendall(frame)
+
+    def _read(self, conn):
+        deframer = KissDeframer()
+        while True:
+            try:
+                chunk = conn.recv(65536)
+            except OSError:
+                break
+            if not chunk:
+                break
+            t = time.monotonic()
+            frames = deframer.feed(chunk)
+            if frames:
+                with self.lock:
+                    self.received += [(t, f) for f in frames]
+        conn.close()
+
+
+def read_capture(path: str) -> list[bytes]:
+    """KISS frames of a capture file, still escaped and FEND-delimited"""
+    with open(path, "rb") as f:
+        data = f.read()
+    return [KISS_FEND + part + KISS_FEND for part in data.split(KISS_FEND) if part]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in Dire Wolf KISS TCP server")
+    parser.add_argument("capture", nargs="?", help="KISS capture to send to each client (e.g. from bench.kissgen)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8001, help="TCP port (default: 8001)")
+    parser.add_argument("--rate", type=float, help="frames per second to send (default: as fast as possible)")
+    args = parser.parse_args()
+
+    frames = read_capture(args.capture) if args.capture else []
+    server = KissServer(frames, args.host, args.port, args.rate).start()
+    print(f"KISS server on {server.host}:{server.port}, {len(frames)} frames per client. Ctrl-C to stop.")
+    count = 0
+    try:
+        while True:
+            time.sleep(1)
+            with server.lock:
+                n = len(server.received)
+            if n != count:
+                print(f"received {n} frames ({n - count} frames/s)")
+                count = n
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Synthetic KISS/SSDV traffic, framed the way tx.py sends it.
+
+Each image is a smooth random picture (upscaled colour noise plus a little
+grain, so it compresses like a photo), encoded with img2ssdv.jpeg_encode
+and ssdvcodec.encode. Every SSDV packet becomes one KISS data frame with
+tx.py's AX.25 header: a random 3-character file ID plus the packet count in
+hex as destination, the callsign as source.
+
+With --corrupt a fraction of the packets get one byte past the sync word
+changed, as a bit error the modem's FEC missed would; rx.py should reject
+them on their CRC.
+
+With --escape-heavy the packets are instead filled with 0xC0/0xDB bytes,
+so nearly every byte needs KISS escaping. They keep valid SSDV headers and
+CRCs, so rx.py still stores and decodes them (into noise).
+
+The stream can be written to a file for `rx.py --replay`, or served with
+bench.kiss_server.
+
+Usage:
+    python -m bench.kissgen pass.kiss --images 5 --length 128 --loss 0.1
+    python -m bench.kissgen heavy.kiss --escape-heavy
+    python -m bench.kissgen noisy.kiss --corrupt 0.05
+"""
+import argparse
+import random
+import zlib
+
+from PIL import Image
+
+import img2ssdv
+import ssdvcodec
+from tx import ALPHANUM, FEND, ax25_address, kiss_escape
+
+
+def make_image(rng: random.Random, width: int = 320, height: int = 240) -> Image.Image:
+    """Random photo-like RGB image"""
+    cw, ch = max(1, width // 24), max(1, height // 24)
+    coarse = Image.frombytes("RGB", (cw, ch), rng.randbytes(3 * cw * ch))
+    im = coarse.resize((width, height), Image.BICUBIC)
+    grain = Image.frombytes("RGB", (width, height), rng.randbytes(3 * width * height))
+    return Image.blend(im, grain, 0.08)
+
+
+def image_packets(rng: random.Random, callsign: str, length: int, quality: int = 20,
+                  size: tuple = (320, 240)) -> list[bytes]:
+    """SSDV packets of one random image, as img2ssdv.py makes them"""
+    jpeg = img2ssdv.jpeg_encode(make_image(rng, *size), quality)
+    return img2ssdv.ssdv_encode(jpeg, callsign, quality, length)
+
+
+def escape_heavy_packets(rng: random.Random, callsign: str, length: int, count: int = 60) -> list[bytes]:
+    """Valid-looking SSDV packets whose data is mostly KISS special bytes"""
+    packets = []
+    size = ssdvcodec.payload_size(length, ssdvcodec.SSDV_TYPE_NOFEC)
+    for packet_id in range(count):
+        eoi = packet_id == count - 1
+        header = (bytes([ssdvcodec.SSDV_SYNC, ssdvcodec.SSDV_TYPE_NOFEC]) + ssdvcodec.encode_callsign(callsign).to_bytes(4, 'big') +
+                  bytes([0]) + packet_id.to_bytes(2, 'big') + bytes([320 // 16, 240 // 16, (4 << 3) | (eoi << 2) | 0,
+                                                                       0xFF, 0xFF, 0xFF]))
+        data = bytes(rng.choice((0xC0, 0xDB, 0xC0, 0xDB, rng.getrandbits(8))) for _ in range(size))
+        body = header + data
+        packets.append(body + zlib.crc32(body[1:]).to_bytes(4, 'big'))
+    return packets
+
+
+def corrupt_packet(rng: random.Random, packet: bytes) -> bytes:
+    """packet with one byte after the sync word changed"""
+    i = rng.randrange(1, len(packet))
+    return packet[:i] + bytes([packet[i] ^ rng.randrange(1, 256)]) + packet[i + 1:]
+
+
+def kiss_frames(packets: list[bytes], callsign: str, file_id: str) -> list[bytes]:
+    """KISS data frames for the packets of one image, like tx.py"""
+    src = ax25_address(callsign)
+    dest = ax25_address(file_id + hex(len(packets))[2:], last=True)
+    return [FEND + b'\x00' + kiss_escape(dest + src + b'\x03\xf0' + p) + FEND for p in packets]
+
+
+def make_stream(images: int = 3, length: int = 128, loss: float = 0.0, seed: int = 1,
+                escape_heavy: bool = False, callsign: str = "BENCH", quality: int = 20,
+                size: tuple = (320, 240), corrupt: float = 0.0) -> tuple[list[bytes], int]:
+    """
+    KISS frames of a pass of images sent one after the other, with a
+    fraction loss of them dropped and a fraction corrupt of the packets
+    damaged; returns (frames, packets before loss)
+    """
+    rng = random.Random(seed)
+    frames = []
+    sent = 0
+    for _ in range(images):
+        file_id = ''.join(rng.choice(ALPHANUM) for _ in range(3))
+        if escape_heavy:
+            packets = escape_heavy_packets(rng, callsign, length)
+        else:
+            packets = image_packets(rng, callsign, length, quality, size)
+        sent += len(packets)
+        if corrupt:
+            packets = [corrupt_packet(rng, p) if rng.random() < corrupt else p for p in packets]
+        frames += [f for f in kiss_frames(packets, callsign, file_id) if rng.random() >= loss]
+    return frames, sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic KISS capture of SSDV images")
+    parser.add_argument("output", help="KISS capture file to write")
+    parser.add_argument("--images", type=int, default=3, help="images in the pass (default: 3)")
+    parser.add_argument("-l", "--length", type=int, default=128, help="SSDV packet length (default: 128)")
+    parser.add_argument("--loss", type=float, default=0.0, help="fraction of frames to drop (default: 0)")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="fraction of packets with a damaged byte (default: 0)")
+    parser.add_argument("--escape-heavy", action="store_true", help="fill packets with 0xC0/0xDB instead of image data")
+    parser.add_argument("--quality", type=int, default=20, help="JPEG quality 1-95 (default: 20)")
+    parser.add_argument("--size", nargs=2, type=int, default=[320, 240], metavar=("WIDTH", "HEIGHT"),
+                        help="image size (default: 320 240)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    args = parser.parse_args()
+
+    frames, sent = make_stream(args.images, args.length, args.loss, args.seed, args.escape_heavy,
+                               quality=args.quality, size=tuple(args.size), corrupt=args.corrupt)
+    stream = b''.join(frames)
+    with open(args.output, "wb") as f:
+        f.write(stream)
+    print(f"{len(frames)} of {sent} frames, {len(stream)} bytes"
+          f" ({len(stream) / max(1, len(frames)):.1f} bytes/frame on the wire) → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
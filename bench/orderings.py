@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Packet orderings under short passes: what a pass that ends early leaves.
+
+A test card (smooth gradients, shapes and edges, so a blank MCU that
+keeps its neighbour's colour is as close as it is on a photo) is
+encoded, its packets put in each tx.order_packets order, cut off after a
+fraction of the pass and thinned by random loss (the same packets are
+lost in every order), then decoded with ssdvcodec the way rx.py does,
+fed in arrival order. Reports for each partial image its PSNR against
+the complete one, the PSNR of its thumbnail (one pixel per THUMB×THUMB
+block: how much of the whole picture can be made out), the share of MCUs
+it has data for, and the cost of rx.py's incremental decode (feed plus
+get_jpeg after every packet) for that arrival order.
+
+Every order sends about the same MCUs per packet; what stride and bitrev
+are for is spreading them over the image. The exit status is 1 if either
+has a lower thumbnail PSNR than sequential at any cut short of the pass.
+
+Usage:
+    python -m bench.orderings
+    python -m bench.orderings --size 640 480 --loss 0.1 --cut 0.3 0.6
+"""
+import argparse
+import io
+import random
+import sys
+import time
+
+from PIL import Image, ImageDraw
+
+import img2ssdv
+import ssdvcodec
+import tx
+
+THUMB = 32
+
+
+def test_card(width: int = 320, height: int = 240) -> Image.Image:
+    """Gradients with shapes and hard edges on them"""
+    ramp_x = Image.linear_gradient("L").rotate(90).resize((width, height))
+    ramp_y = Image.linear_gradient("L").resize((width, height))
+    im = Image.merge("RGB", (ramp_x, ramp_y, Image.new("L", (width, height), 96)))
+    draw = ImageDraw.Draw(im)
+    u = min(width, height)
+    draw.ellipse((width * 0.1, height * 0.15, width * 0.1 + u * 0.5, height * 0.15 + u * 0.5), fill=(230, 40, 40))
+    draw.rectangle((width * 0.6, height * 0.1, width * 0.9, height * 0.45), fill=(30, 60, 200))
+    draw.polygon([(width * 0.55, height * 0.9), (width * 0.75, height * 0.55), (width * 0.95, height * 0.9)],
+                 fill=(250, 220, 40))
+    for i in range(8):
+        shade = 255 * (i % 2)
+        draw.rectangle((width * i / 8, height * 0.8, width * (i + 1) / 8, height * 0.95), fill=(shade,) * 3)
+    draw.line((0, height - 1, width - 1, 0), fill=(255, 255, 255), width=max(1, u // 60))
+    return im
+
+
+def decode_image(packets: list[bytes], length: int) -> tuple[Image.Image | None, float, float]:
+    """(image decoded from packets as they arrive, share of MCUs decoded, seconds spent decoding)"""
+    t0 = time.perf_counter()
+    dec = ssdvcodec.Decoder(length)
+    jpeg = b""
+    for packet in packets:
+        dec.feed(packet)
+        jpeg = dec.get_jpeg()
+    elapsed = time.perf_counter() - t0
+    if not jpeg:
+        return None, 0.0, elapsed
+    coverage = dec.mcus_decoded() / max(1, dec.mcu_count)
+    with Image.open(io.BytesIO(jpeg)) as im:
+        return im.convert("RGB"), coverage, elapsed
+
+
+def thumbnail(im: Image.Image) -> Image.Image:
+    return im.resize((max(1, im.width // THUMB), max(1, im.height // THUMB)), Image.BOX)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare tx.py packet orderings on passes cut short")
+    parser.add_argument("-l", "--length", type=int, default=128, help="SSDV packet length (default: 128)")
+    parser.add_argument("--quality", type=int, default=50, help="JPEG quality 1-95 (default: 50)")
+    parser.add_argument("--size", nargs=2, type=int, default=[320, 240], metavar=("WIDTH", "HEIGHT"),
+                        help="image size (default: 320 240)")
+    parser.add_argument("--cut", nargs="+", type=float, default=[0.25, 0.5, 0.75],
+                        help="fractions of the pass that get sent (default: 0.25 0.5 0.75)")
+    parser.add_argument("--loss", type=float, default=0.0, help="fraction of packets lost (default: 0)")
+    parser.add_argument("--stride", type=int, default=tx.DEFAULT_STRIDE, help=f"--order stride step (default: {tx.DEFAULT_STRIDE})")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jpeg = img2ssdv.jpeg_encode(test_card(*args.size), args.quality)
+    packets = img2ssdv.ssdv_encode(jpeg, "BENCH", args.quality, args.length)
+    full, _, _ = decode_image(packets, args.length)
+    full_thumb = thumbnail(full)
+    lost = {p for p in packets if rng.random() < args.loss}
+    print(f"{args.size[0]}×{args.size[1]} test card, {len(packets)} packets of {args.length} bytes, {args.loss:.0%} loss\n")
+    print(f"{'':<12}" + "".join(f"{f'{c:.0%} sent':>26}" for c in args.cut))
+    print(f"{'order':<12}" + f"{'PSNR':>9}{'thumb':>9}{'MCU':>8}" * len(args.cut) + f"{'decode':>16}")
+
+    thumbs = {}
+    for order in tx.ORDERINGS:
+        sent = tx.order_packets(packets, order, args.stride)
+        received = [p for p in sent if p not in lost]
+        scores = []
+        for cut in args.cut:
+            part = set(sent[:int(len(sent) * cut)])
+            im, coverage, _ = decode_image([p for p in received if p in part], args.length)
+            if im:
+                scores.append((img2ssdv.psnr(im, full), img2ssdv.psnr(thumbnail(im), full_thumb), coverage))
+            else:
+                scores.append((0.0, 0.0, 0.0))
+        thumbs[order] = [thumb for _, thumb, _ in scores]
+        _, _, elapsed = decode_image(received, args.length)
+        print(f"{order:<12}" + "".join(f"{db:6.1f} dB{thumb:6.1f} dB{cov:8.0%}" for db, thumb, cov in scores)
+              + f"{elapsed / max(1, len(received)) * 1000:11.2f} ms/pkt")
+
+    behind = [f"{order} at {cut:.0%}" for order in ("stride", "bitrev")
+              for cut, db, seq in zip(args.cut, thumbs[order], thumbs['sequential']) if cut < 1 and db < seq]
+    if behind:
+        print(f"\nBehind sequential: {', '.join(behind)}")
+        sys.exit(1)
+    print("\nstride and bitrev beat sequential at every cut")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+End-to-end receiver benchmark: bench.kiss_server → rx.Receiver → JPEGs.
+
+A synthetic pass from bench.kissgen is served over a local KISS TCP port
+and received by rx.py's own asyncio feed, packet store, journal and
+decode scheduler, into a temporary output directory. Reports frames/s,
+bytes written to disk per packet and packet-to-JPEG latency: the time from
+a packet being handled to a JPEG that includes it being written. With
+--corrupt, damaged packets should show up as rejected frames, not as disk
+writes or decodes.
+
+Usage:
+    python -m bench.rx_pipeline
+    python -m bench.rx_pipeline --images 10 --length 256 --loss 0.2 --rate 200
+    python -m bench.rx_pipeline --escape-heavy --ssdv-tool
+    python -m bench.rx_pipeline --corrupt 0.1
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import tempfile
+import time
+
+import rx
+from bench.kiss_server import KissServer
+from bench.kissgen import make_stream
+
+
+def run(frames, args) -> dict:
+    server = KissServer(frames, rate=args.rate).start()
+    rx_args = argparse.Namespace(ssdv_tool=args.ssdv_tool, decoders=args.decoders, idle_timeout=600,
+                                 max_memory=64, no_journal=args.no_journal, verbose=False, simple=False)
+    with tempfile.TemporaryDirectory() as output_dir, open(os.devnull, "w") as devnull:
+        # Progress lines would measure the terminal, not the pipeline
+        with contextlib.redirect_stdout(devnull):
+            receiver = rx.Receiver(rx_args, output_dir)
+            t0 = time.perf_counter()
+            asyncio.run(rx.receive(receiver, [(server.host, server.port)], reconnect=False))
+            ingest = time.perf_counter() - t0
+            receiver.close()
+            total = time.perf_counter() - t0
+        written = sum(os.path.getsize(os.path.join(root, name))
+                      for root, _, names in os.walk(output_dir) for name in names if not name.endswith(".jpg"))
+    server.stop()
+
+    stats = receiver.decoder.stats.values()
+    runs = sum(st['runs'] for st in stats)
+    return {
+        'frames': len(frames),
+        'packets': receiver.total_valid,
+        'ingest': ingest,
+        'total': total,
+        'written': written,
+        'decodes': runs,
+        'latency_avg': sum(st['total'] for st in stats) / max(1, runs),
+        'latency_max': max((st['max'] for st in stats), default=0.0),
+        'first': sorted(st['first'] for st in stats if st['first'] is not None),
+        'rejected': dict(receiver.rejected),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="rx.py end-to-end benchmark against a stand-in KISS server")
+    parser.add_argument("--images", type=int, default=5, help="images in the pass (default: 5)")
+    parser.add_argument("-l", "--length", type=int, default=128, help="SSDV packet length (default: 128)")
+    parser.add_argument("--loss", type=float, default=0.0, help="fraction of frames to drop (default: 0)")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="fraction of packets with a damaged byte (default: 0)")
+    parser.add_argument("--escape-heavy", action="store_true", help="packets full of 0xC0/0xDB")
+    parser.add_argument("--rate", type=float, help="frames per second sent by the server (default: as fast as possible)")
+    parser.add_argument("--decoders", type=int, default=2, help="rx --decoders (default: 2)")
+    parser.add_argument("--ssdv-tool", action="store_true", help="decode with the ssdv program")
+    parser.add_argument("--no-journal", action="store_true", help="run rx without its journal")
+    parser.add_argument("--repeat", type=int, default=3, help="runs, best throughput is kept (default: 3)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    args = parser.parse_args()
+
+    frames, sent = make_stream(args.images, args.length, args.loss, args.seed, args.escape_heavy, corrupt=args.corrupt)
+    wire = sum(len(f) for f in frames)
+    print(f"{args.images} images, {len(frames)} of {sent} frames, {wire} bytes on the wire\n")
+
+    best = min((run(frames, args) for _ in range(args.repeat)), key=lambda r: r['ingest'])
+    print(f"ingest      : {best['frames'] / best['ingest']:10,.0f} frames/s  ({best['ingest'] * 1000:.1f} ms,"
+          f" {best['total'] * 1000:.1f} ms until the last JPEG)")
+    print(f"disk        : {best['written'] / max(1, best['packets']):10.1f} bytes written per packet (.bin, .map, journal)")
+    print(f"decodes     : {best['decodes']:10d} for {best['packets']} packets")
+    if best['rejected']:
+        print(f"rejected    : {sum(best['rejected'].values()):10d} frames ("
+              + ", ".join(f"{n} {reason}" for reason, n in sorted(best['rejected'].items())) + ")")
+    print(f"packet→JPEG : avg {best['latency_avg'] * 1000:.1f} ms / max {best['latency_max'] * 1000:.1f} ms")
+    if best['first']:
+        print(f"first JPEG  : median {best['first'][len(best['first']) // 2] * 1000:.1f} ms after the first packet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Receive-side SSDV decoding: ssdvcodec.Decoder against `ssdv -d`.
+
+Replays an SSDV .bin the way rx.py sees it, one packet at a time (in
+random order with --shuffle, dropping some with --loss), and decodes the
+image after every packet. With the ssdv tool on the PATH each JPEG is also
+compared byte for byte with what the tool makes of the same packets.
+
+Usage:
+    python -m bench.ssdv_decode image.bin --length 128
+    python -m bench.ssdv_decode image.bin --length 128 --shuffle --loss 0.2 --tool ssdv
+"""
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+
+import ssdvcodec
+
+
+def tool_decode(tool, packet_length, packets, workdir):
+    """Run the ssdv tool over packets in ID order, return the JPEG"""
+    src = os.path.join(workdir, "in.bin")
+    dst = os.path.join(workdir, "out.jpg")
+    with open(src, "wb") as f:
+        for packet in sorted(packets, key=lambda p: (p[7] << 8) | p[8]):
+            f.write(packet)
+    if os.path.exists(dst):
+        os.remove(dst)
+    subprocess.run([tool, "-d", "-l", str(packet_length), src, dst],
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    with open(dst, "rb") as f:
+        return f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SSDV decoder benchmark and parity check")
+    parser.add_argument("input", help="SSDV .bin file (e.g. made by img2ssdv.py)")
+    parser.add_argument("-l", "--length", type=int, default=128, help="SSDV packet length (default: 128)")
+    parser.add_argument("--shuffle", action="store_true", help="feed packets in random order")
+    parser.add_argument("--loss", type=float, default=0.0, help="fraction of packets to drop (default: 0)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    parser.add_argument("--tool", default="ssdv", help="ssdv program to compare with (default: ssdv)")
+    args = parser.parse_args()
+
+    with open(args.input, "rb") as f:
+        packets = ssdvcodec.split_packets(f.read(), args.length)
+    rng = random.Random(args.seed)
+    packets = [p for p in packets if rng.random() >= args.loss]
+    if args.shuffle:
+        rng.shuffle(packets)
+    print(f"{len(packets)} packets of {args.length} bytes\n")
+
+    dec = ssdvcodec.Decoder(args.length)
+    jpegs = []
+    t0 = time.perf_counter()
+    for packet in packets:
+        dec.feed(packet)
+        jpegs.append(dec.get_jpeg())
+    native = time.perf_counter() - t0
+    print(f"{'ssdvcodec':<10}: {native * 1000:9.1f} ms  ({native / len(packets) * 1000:.2f} ms/packet)")
+
+    tool = shutil.which(args.tool)
+    if tool is None:
+        print(f"{args.tool} not found, skipping the comparison (python -m bench.ssdv_parity checks against stored ssdv -d output)")
+        return
+
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        t0 = time.perf_counter()
+        for i, jpeg in enumerate(jpegs):
+            if tool_decode(tool, args.length, packets[:i + 1], workdir) != jpeg:
+                mismatches += 1
+        external = time.perf_counter() - t0
+    print(f"{'ssdv -d':<10}: {external * 1000:9.1f} ms  ({external / len(packets) * 1000:.2f} ms/packet)")
+    print(f"\nspeed-up: {external / native:.1f}x, {mismatches} of {len(jpegs)} JPEGs differ")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+ssdvcodec against stored `ssdv -d` output, no ssdv program needed.
+
+bench/ssdv_corpus holds SSDV images encoded by the ssdv tool (cN.bin),
+what is known about them (cN.json: packet length, source image and
+encoder settings, and the packets kept in each loss pattern) and, for
+every loss pattern, the JPEG `ssdv -d` made of the kept packets
+(cN_PATTERN.jpg). The references come from the bundled ssdv.exe.
+
+Every pattern is decoded with ssdvcodec.decode in packet order and
+shuffled, and with a Decoder fed one packet at a time the way rx.py feeds
+it. Any JPEG that is not byte for byte the reference is a failure and the
+exit status is 1. An empty reference is a pattern ssdv -d wrote no image
+for (its first packet starts no MCU, where ssdvcodec skips ahead to the
+first one that does); those are listed but not compared.
+
+With --tool the ssdv program is also run over every pattern and checked
+against the references; --update writes its output as the new references.
+
+Usage:
+    python -m bench.ssdv_parity
+    python -m bench.ssdv_parity --tool ssdv --update
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+import ssdvcodec
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ssdv_corpus")
+SHUFFLES = 3
+
+
+def load_cases(directory: str = CORPUS_DIR) -> list[tuple[str, dict, list[bytes]]]:
+    """(name, metadata, packets) of every image in the corpus"""
+    cases = []
+    for name in sorted(n[:-5] for n in os.listdir(directory) if n.endswith(".json")):
+        with open(os.path.join(directory, name + ".json")) as f:
+            meta = json.load(f)
+        with open(os.path.join(directory, name + ".bin"), "rb") as f:
+            packets = ssdvcodec.split_packets(f.read(), meta['length'])
+        cases.append((name, meta, packets))
+    return cases
+
+
+def native_decodes(packets: list[bytes], length: int, seed: int) -> list[tuple[str, bytes]]:
+    """(how, JPEG) of ssdvcodec over the kept packets, in order, shuffled and fed one by one"""
+    out = [("in order", ssdvcodec.decode(packets, length))]
+    rng = random.Random(seed)
+    for i in range(SHUFFLES):
+        shuffled = list(packets)
+        rng.shuffle(shuffled)
+        out.append((f"shuffle {i + 1}", ssdvcodec.decode(shuffled, length)))
+    dec = ssdvcodec.Decoder(length)
+    for packet in shuffled:
+        dec.feed(packet)
+    out.append(("incremental", dec.get_jpeg()))
+    return out
+
+
+def tool_decode(tool: str, packets: list[bytes], length: int, workdir: str) -> bytes:
+    src = os.path.join(workdir, "in.bin")
+    dst = os.path.join(workdir, "out.jpg")
+    with open(src, "wb") as f:
+        f.write(b"".join(packets))
+    if os.path.exists(dst):
+        os.remove(dst)
+    subprocess.run([tool, "-d", "-l", str(length), src, dst], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    with open(dst, "rb") as f:
+        return f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ssdvcodec parity with stored ssdv -d output")
+    parser.add_argument("--corpus", default=CORPUS_DIR, help="corpus directory (default: bench/ssdv_corpus)")
+    parser.add_argument("--tool", help="also run this ssdv program over the corpus")
+    parser.add_argument("--update", action="store_true", help="with --tool, store its output as the references")
+    args = parser.parse_args()
+    if args.update and not args.tool:
+        parser.error("--update needs --tool")
+
+    failures = checked = skipped = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        for n, (name, meta, packets) in enumerate(load_cases(args.corpus)):
+            length = meta['length']
+            src = meta['source']
+            print(f"{name}: {src['size'][0]}×{src['size'][1]}, subsampling {src['subsampling']},"
+                  f" quality {src['ssdv_quality']}, {len(packets)} packets of {length} bytes")
+            for pattern, keep in meta['variants'].items():
+                kept = [packets[i] for i in keep]
+                ref_path = os.path.join(args.corpus, f"{name}_{pattern}.jpg")
+                if args.tool:
+                    jpeg = tool_decode(args.tool, kept, length, workdir)
+                    if args.update:
+                        with open(ref_path, "wb") as f:
+                            f.write(jpeg)
+                with open(ref_path, "rb") as f:
+                    reference = f.read()
+                if not reference:
+                    skipped += 1
+                    print(f"  {pattern:<9} {len(kept):4d} packets  no image from ssdv -d, not compared")
+                    continue
+                results = native_decodes(kept, length, n)
+                if args.tool:
+                    results.append((args.tool, jpeg))
+                bad = [how for how, jpeg in results if jpeg != reference]
+                checked += len(results)
+                failures += len(bad)
+                print(f"  {pattern:<9} {len(kept):4d} packets  {'ok' if not bad else 'MISMATCH: ' + ', '.join(bad)}")
+
+    print(f"\n{checked - failures} of {checked} decodes match ssdv -d byte for byte"
+          + (f", {skipped} patterns without a reference" if skipped else ""))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
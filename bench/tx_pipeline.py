@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+End-to-end transmitter benchmark: image file → SSDV → KISS → TCP.
+
+Random source images (bench.kissgen.make_image) go through img2ssdv's
+resize/JPEG/SSDV steps and are then framed and sent to bench.kiss_server
+with tx.py's ax25_address/kiss_escape, the way tx.main does without its
+frame delay. Reports encode time per image, framing frames/s, bytes on the
+wire per packet and the latency from picking an image up to its last frame
+arriving at the server. The encode is also timed through tx.img2ssdv with
+its EncodeCache, cold and warm, and with --subprocess the way tx.py used to
+run it, as a separate img2ssdv.py process.
+
+Usage:
+    python -m bench.tx_pipeline
+    python -m bench.tx_pipeline --images 5 --length 256 --subprocess
+"""
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import img2ssdv
+import tx
+from bench.kiss_server import KissServer
+from bench.kissgen import make_image
+
+
+def encode(path: str, args) -> list[bytes]:
+    """img2ssdv.py's pipeline, in-process"""
+    im = img2ssdv.prepare_image(path, args.max_size)
+    jpeg = img2ssdv.jpeg_encode(im, args.quality)
+    return img2ssdv.ssdv_encode(jpeg, "BENCH", args.quality, args.length)
+
+
+def legacy_img2ssdv(packet_length, output_dir, input_filename, callsign, quality, max_size, filesuffix):
+    """The img2ssdv.py subprocess tx.py used to run for every transmission"""
+    max_w, max_h = max_size
+    command = [sys.executable, "img2ssdv.py", "--length", str(packet_length), "--dir", output_dir,
+               "--callsign", callsign, input_filename, "--quality", str(quality),
+               "--max-size", str(max_w), str(max_h), "--suffix", filesuffix]
+    subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def frame(packets: list[bytes], file_id: str) -> list[bytes]:
+    """tx.main's framing loop"""
+    src_addr = tx.ax25_address("BENCH")
+    dest_addr = tx.ax25_address(file_id + hex(len(packets))[2:], last=True)
+    return [tx.FEND + b'\x00' + tx.kiss_escape(dest_addr + src_addr + b'\x03\xf0' + p) + tx.FEND for p in packets]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tx.py end-to-end benchmark against a stand-in KISS server")
+    parser.add_argument("--images", type=int, default=5, help="images to send (default: 5)")
+    parser.add_argument("-l", "--length", type=int, default=128, help="SSDV packet length (default: 128)")
+    parser.add_argument("--quality", type=int, default=20, help="JPEG quality 1-95 (default: 20)")
+    parser.add_argument("--max-size", nargs=2, type=int, default=[320, 320], metavar=("WIDTH", "HEIGHT"),
+                        help="img2ssdv --max-size (default: 320 320)")
+    parser.add_argument("--subprocess", action="store_true", help="also time the img2ssdv.py process tx.py used to run")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    server = KissServer().start()
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = []
+        for i in range(args.images):
+            paths.append(os.path.join(workdir, f"src{i}.png"))
+            make_image(rng, 1024, 768).save(paths[-1])
+
+        encode_time = frame_time = 0.0
+        latencies = []
+        packets = wire = 0
+        sock = socket.create_connection((server.host, server.port))
+        for i, path in enumerate(paths):
+            t0 = time.monotonic()
+            ssdv = encode(path, args)
+            t1 = time.monotonic()
+            frames = frame(ssdv, f"B{i:02d}")
+            t2 = time.monotonic()
+            for f in frames:
+                sock.sendall(f)
+            encode_time += t1 - t0
+            frame_time += t2 - t1
+            packets += len(ssdv)
+            wire += sum(len(f) for f in frames)
+            # Wait for the server to have the whole image
+            while len(server.received) < packets:
+                time.sleep(0.0005)
+            latencies.append(server.received[-1][0] - t0)
+        sock.close()
+
+        cache = img2ssdv.EncodeCache(os.path.join(workdir, "cache"))
+        cached_time = [0.0, 0.0]
+        for run in range(2):
+            for i, path in enumerate(paths):
+                t0 = time.monotonic()
+                tx.img2ssdv(args.length, workdir, path, "BENCH", "", args.quality, args.max_size, f"c{i}", cache)
+                cached_time[run] += time.monotonic() - t0
+
+        subprocess_time = 0.0
+        if args.subprocess:
+            for i, path in enumerate(paths):
+                t0 = time.monotonic()
+                legacy_img2ssdv(args.length, workdir, path, "BENCH", args.quality, args.max_size, f"sub{i}")
+                subprocess_time += time.monotonic() - t0
+    server.stop()
+
+    n = args.images
+    print(f"{n} images, {packets} packets of {args.length} bytes\n")
+    print(f"encode      : {encode_time / n * 1000:10.1f} ms/image in-process")
+    print(f"              {cached_time[0] / n * 1000:10.1f} ms/image tx.img2ssdv, cache miss")
+    print(f"              {cached_time[1] / n * 1000:10.1f} ms/image tx.img2ssdv, cache hit")
+    if args.subprocess:
+        print(f"              {subprocess_time / n * 1000:10.1f} ms/image as an img2ssdv.py subprocess")
+    print(f"framing     : {packets / max(frame_time, 1e-9):10,.0f} frames/s")
+    print(f"wire        : {wire / packets:10.1f} bytes per packet (AX.25 header + KISS escaping)")
+    print(f"image→sent  : avg {sum(latencies) / n * 1000:.1f} ms / max {max(latencies) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Erasure-coded repair frames for SSDV packets.
+
+An image's packets, in packet ID order, are cut into groups of up to
+`group` packets. For each group tx.py can send `repairs` extra frames,
+each a GF(256) combination of all the packets of the group (a systematic
+Reed-Solomon code with a Cauchy matrix): any `group` of the group's data
+packets and repair frames give back the whole group. rx.py keeps the
+repair frames it hears and rebuilds the missing packets, CRC and all, as
+soon as enough of a group is in.
+
+Repair frame (big-endian), sent in place of an SSDV packet:
+  offset  0    : sync         0x55
+  offset  1    : type         0x68, so receivers without this module
+                              reject it as an invalid SSDV packet
+  offset  2    : image ID     as in the SSDV header
+  offset  3    : packet ID    of the first packet of the group
+  offset  5    : group size   packets in this group
+  offset  6    : index        of this repair frame in the group
+  offset  7    : data         packet length bytes
+  offset  7+L  : crc32        of bytes 1 to 7+L
+"""
+VERSION = '0.02'
+
+import struct
+import zlib
+
+REPAIR_SYNC = 0x55
+REPAIR_TYPE = 0x68
+REPAIR_HEADER = struct.Struct(">BBBHBB")
+REPAIR_OVERHEAD = REPAIR_HEADER.size + 4
+DEFAULT_GROUP = 16
+
+# GF(256) with the Reed-Solomon polynomial x^8 + x^4 + x^3 + x^2 + 1
+EXP = [0] * 512
+LOG = [0] * 256
+_x = 1
+for _i in range(255):
+    EXP[_i] = _x
+    LOG[_x] = _i
+    _x <<= 1
+    if _x & 0x100:
+        _x ^= 0x11D
+for _i in range(255, 512):
+    EXP[_i] = EXP[_i - 255]
+
+
+def gf_mul(a: int, b: int) -> int:
+    if a == 0 or b == 0:
+        return 0
+    return EXP[LOG[a] + LOG[b]]
+
+
+def gf_inv(a: int) -> int:
+    return EXP[255 - LOG[a]]
+
+
+# Multiply-by-c as bytes.translate tables: a whole packet at C speed
+MUL_TABLES = [bytes(gf_mul(c, x) for x in range(256)) for c in range(256)]
+
+
+def coefficient(index: int, packet: int) -> int:
+    """Cauchy matrix entry of repair frame index for packet (both from 0); any square part is invertible"""
+    return gf_inv((255 - index) ^ packet)
+
+
+def _combine(rows, length: int) -> bytes:
+    """XOR of c·data over (c, data) pairs"""
+    acc = 0
+    for c, data in rows:
+        if c:
+            acc ^= int.from_bytes(data.translate(MUL_TABLES[c]), 'big')
+    return acc.to_bytes(length, 'big')
+
+
+def encode(packets: list[bytes], repairs: int) -> list[bytes]:
+    """repairs coded blocks for one group of equally long packets"""
+    if len(packets) + repairs > 256:
+        raise ValueError("a group and its repair frames cannot be more than 256 frames")
+    length = len(packets[0])
+    return [_combine([(coefficient(j, i), p) for i, p in enumerate(packets)], length) for j in range(repairs)]
+
+
+def _invert(matrix: list[list[int]]) -> list[list[int]]:
+    """Inverse of a square GF(256) matrix by Gauss-Jordan elimination"""
+    n = len(matrix)
+    m = [row[:] + [int(i == j) for j in range(n)] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = next(r for r in range(col, n) if m[r][col])
+        m[col], m[pivot] = m[pivot], m[col]
+        inv = gf_inv(m[col][col])
+        m[col] = [gf_mul(inv, v) for v in m[col]]
+        for r in range(n):
+            if r != col and m[r][col]:
+                f = m[r][col]
+                m[r] = [v ^ gf_mul(f, w) for v, w in zip(m[r], m[col])]
+    return [row[n:] for row in m]
+
+
+def decode(size: int, data: dict, repair: dict) -> dict | None:
+    """
+    Missing packets of a group of size packets, from the ones received
+    (data: position in group → packet) and repair frames (index → block);
+    None if there are not enough of them yet
+    """
+    missing = [i for i in range(size) if i not in data]
+    if not missing:
+        return {}
+    if len(missing) > len(repair):
+        return None
+    length = len(next(iter(repair.values())))
+    rows = sorted(repair)[:len(missing)]
+    # Take out what the packets we have contribute, leaving the missing ones'
+    syndromes = [_combine([(1, repair[j])] + [(coefficient(j, i), p) for i, p in data.items()], length)
+                 for j in rows]
+    inverse = _invert([[coefficient(j, i) for i in missing] for j in rows])
+    return {i: _combine(zip(inverse[n], syndromes), length) for n, i in enumerate(missing)}
+
+
+def repair_frames(packets: list[bytes], repairs: int, group: int = DEFAULT_GROUP) -> list[bytes]:
+    """
+    Repair frames for the SSDV packets of one image (any order). Sent
+    index by index over all groups, so a burst of loss does not take every
+    repair frame of one group.
+    """
+    packets = sorted(packets, key=lambda p: (p[7] << 8) | p[8])
+    per_group = []
+    for start in range(0, len(packets), group):
+        members = packets[start:start + group]
+        first = (members[0][7] << 8) | members[0][8]
+        per_group.append([(first, len(members), j, block) for j, block in enumerate(encode(members, repairs))])
+    frames = []
+    for j in range(repairs):
+        for blocks in per_group:
+            first, size, index, block = blocks[j]
+            body = REPAIR_HEADER.pack(REPAIR_SYNC, REPAIR_TYPE, packets[0][6], first, size, index) + block
+            frames.append(body + zlib.crc32(body[1:]).to_bytes(4, 'big'))
+    return frames
+
+
+def group_ids(frame: bytes) -> range:
+    """Packet IDs of the group a repair frame is for"""
+    _, _, _, first, size, _ = REPAIR_HEADER.unpack_from(frame)
+    return range(first, first + size)
+
+
+def is_repair(frame: bytes) -> bool:
+    return len(frame) > REPAIR_OVERHEAD and frame[0] == REPAIR_SYNC and frame[1] == REPAIR_TYPE
+
+
+def parse_repair(frame: bytes) -> dict | None:
+    """Fields of a repair frame, None if it is not one or its CRC is wrong"""
+    if not is_repair(frame) or zlib.crc32(frame[1:-4]) != int.from_bytes(frame[-4:], 'big'):
+        return None
+    _, _, image_id, first, size, index = REPAIR_HEADER.unpack_from(frame)
+    return {'image_id': image_id, 'first': first, 'size': size, 'index': index,
+            'data': frame[REPAIR_HEADER.size:-4], 'packet_length': len(frame) - REPAIR_OVERHEAD}
+
+
+class Repairer:
+    """
+    Repair frames heard for one image, rebuilding packets as groups become
+    solvable. have(packet_id) and read(packet_id) look up received packets.
+    """
+
+    def __init__(self):
+        # first packet ID → (group size, {index: block})
+        self.groups = {}
+        self.recovered = 0
+
+    def add(self, repair: dict) -> int:
+        """Keep a parsed repair frame, return the first packet ID of its group"""
+        size, blocks = self.groups.setdefault(repair['first'], (repair['size'], {}))
+        blocks.setdefault(repair['index'], repair['data'])
+        return repair['first']
+
+    def group_of(self, packet_id: int) -> int | None:
+        """First packet ID of the group with repair frames that packet_id belongs to"""
+        for first, (size, _) in self.groups.items():
+            if first <= packet_id < first + size:
+                return first
+        return None
+
+    def solve(self, first: int, have, read) -> list[bytes]:
+        """Rebuilt packets of the group starting at first, once there are enough frames; [] otherwise"""
+        size, blocks = self.groups[first]
+        present = [i for i in range(size) if have(first + i)]
+        if len(present) == size:
+            del self.groups[first]
+            return []
+        if size - len(present) > len(blocks):
+            return []
+        rebuilt = decode(size, {i: read(first + i) for i in present}, blocks)
+        del self.groups[first]
+        packets = [p for _, p in sorted(rebuilt.items())
+                   if zlib.crc32(p[1:-4]) == int.from_bytes(p[-4:], 'big')]
+        self.recovered += len(packets)
+        return packets
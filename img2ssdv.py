@@ -20,13 +20,54 @@ Features:
 Usage:
     python ssdv_jpeg.py input.png output.jpg
     python ssdv_jpeg.py photo.jpg ssdv.jpg --max-size 640 480 --quality 35
+
+Batch mode, for several files, directories or glob patterns: images are
+converted on a process pool (--jobs, default one per core), inputs whose
+outputs are up to date are skipped, and manifest.json in --dir lists the
+packet count and size of every image:
+    python img2ssdv.py frames/ "more/*.png" --dir upload --length 128
+
+Fit mode searches ssdv quality levels and sizes up to --max-size for the
+best looking image that fits a packet or airtime budget (at --baud, with
+tx.py's --delay between frames):
+    python img2ssdv.py photo.jpg --length 128 --fit-seconds 120
+
+Library use (no temporary files, no ssdv process):
+    im = prepare_image("photo.jpg", (320, 320), text="hello")
+    packets = ssdv_encode(jpeg_encode(im, 20), "ABCDEF", 20, 128)
+
+or all in one, with results kept in an on-disk cache:
+    jpeg, packets, hit = EncodeCache("cache").convert("photo.jpg", (320, 320), 20, 128, "ABCDEF")
 """
+import functools
+import glob
+import hashlib
+import io
+import json
+import math
 import os
 import argparse
 import sys
 import subprocess
-from PIL import Image, ImageDraw, ImageFont
+import time
+from PIL import Image, ImageChops, ImageDraw, ImageFont, ImageStat
 import configparser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import profiling
+import ssdvcodec
+
+DEFAULT_APP_SSDV = 'ssdv'
+MANIFEST_NAME = 'manifest.json'
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tif', '.tiff', '.webp')
+# Dire Wolf MODEM in direwolf.conf
+DEFAULT_BAUD = 1200
+# Bytes on air per frame besides the SSDV packet: tx.py's AX.25 addresses,
+# control and PID (16), IL2P sync word, header and parity (about 34)
+FRAME_OVERHEAD = 50
+# IL2P cuts longer payloads into Reed-Solomon blocks, each with its parity
+IL2P_BLOCK = 239
+IL2P_BLOCK_PARITY = 16
 
 def make_multiple_of_16(n: int) -> int:
     """Round down to nearest multiple of 16 (SSDV needs 16×16 MCU blocks)."""
@@ -88,27 +129,378 @@ def text_topleft(im, text):
 
     return im
 
-def ssdv_encoding(packet_length,input_filename,output_filename,callsign,quality):
+def prepare_image(input_filename, max_size, text=None) -> Image.Image:
+    """Open an image and make it SSDV ready: RGB, fitted in max_size, optional text"""
+    max_w, max_h = max_size
+    with profiling.span("img2ssdv.resize"):
+        with Image.open(input_filename) as im:
+            # Convert to RGB if necessary (SSDV expects color JPEG, even if source is grayscale)
+            if im.mode != "RGB":
+                im = im.convert("RGB")
+            im_resized = resize_to_fit_keep_aspect(im, max_w, max_h)
+        if text:
+            im_resized = text_topleft(im_resized, text)
+    return im_resized
+
+def jpeg_encode(im: Image.Image, quality: int) -> bytes:
+    """Save with SSDV-friendly settings into memory, return the JPEG bytes"""
+    buf = io.BytesIO()
+    with profiling.span("img2ssdv.save"):
+        im.save(
+            buf,
+            format="JPEG",
+            quality=quality,
+            subsampling=0,           # 0 → 4:2:0 chroma subsampling (standard for SSDV)
+            optimize=True,           # Optimize Huffman tables
+            progressive=False,       # Baseline JPEG only (no progressive)
+            exif=b"",                # Strip all EXIF
+            icc_profile=None,        # No color profile
+            # Pillow does not write XMP/IPTC/thumbnail unless explicitly added
+        )
+    return buf.getvalue()
+
+def ssdv_encode(jpeg: bytes, callsign, quality, packet_length, image_id=0) -> list[bytes]:
+    """
+    In-process SSDV encoding of JPEG bytes, same packets as ssdv_encoding.
+    quality is the JPEG quality 1-95, mapped to the ssdv level the same way.
+    """
+    with profiling.span("img2ssdv.encode"):
+        return ssdvcodec.encode(jpeg, callsign, image_id, packet_length, ssdvcodec.quality_from_jpeg(quality))
+
+def convert(input_filename, max_size, quality, packet_length, callsign, text=None) -> tuple[bytes, list[bytes]]:
+    """Image file → (SSDV-ready JPEG, SSDV packets), all in-process"""
+    im = prepare_image(input_filename, max_size, text)
+    jpeg = jpeg_encode(im, quality)
+    return jpeg, ssdv_encode(jpeg, callsign, quality, packet_length)
+
+def frame_airtime(packet_length, baud=DEFAULT_BAUD, delay=0.0) -> float:
+    """Seconds on air per SSDV packet (or frame of that many bytes) tx.py sends at baud, with --delay between frames"""
+    extra_blocks = max(0, -(-packet_length // IL2P_BLOCK) - 1)
+    return (packet_length + FRAME_OVERHEAD + extra_blocks * IL2P_BLOCK_PARITY) * 8 / baud + delay
+
+def packets_for_seconds(seconds, packet_length, baud=DEFAULT_BAUD, delay=0.0) -> int:
+    """How many SSDV packets tx.py can send in seconds of airtime"""
+    return int(seconds // frame_airtime(packet_length, baud, delay))
+
+@functools.lru_cache(maxsize=2)
+def _fit_source(input_filename, max_size, text) -> tuple[Image.Image, Image.Image]:
+    """(source as RGB, reference it is judged against: fitted in max_size at full quality), once per worker"""
+    with Image.open(input_filename) as im:
+        source = im.convert("RGB")
+    reference = resize_to_fit_keep_aspect(source, *max_size)
+    if text:
+        reference = text_topleft(reference, text)
+    return source, reference
+
+def psnr(a: Image.Image, b: Image.Image) -> float:
+    """Peak signal-to-noise ratio of two RGB images of the same size, in dB"""
+    rms = ImageStat.Stat(ImageChops.difference(a, b)).rms
+    mse = sum(r * r for r in rms) / len(rms)
+    return 10 * math.log10(255 * 255 / mse) if mse else math.inf
+
+def fit_level(input_filename, max_size, level, budget, packet_length, callsign, text=None) -> dict:
+    """
+    Largest image, at most max_size, that fits in budget packets at ssdv
+    quality level, with the JPEG quality that maps to that level; without
+    'packets' if not even 16 pixels fits. Runs in the fit workers.
+    """
+    quality = 10 + 12 * level
+    source, reference = _fit_source(input_filename, tuple(max_size), text)
+    max_w, max_h = max_size
+    steps = max(1, max(max_w, max_h) // 16)
+    best = None
+    evaluated = 0
+    # Packet count grows with size, so binary search the size
+    lo, hi = 1, steps
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        im = resize_to_fit_keep_aspect(source, max(16, max_w * mid // steps), max(16, max_h * mid // steps))
+        if text:
+            im = text_topleft(im, text)
+        jpeg = jpeg_encode(im, quality)
+        packets = ssdv_encode(jpeg, callsign, quality, packet_length)
+        evaluated += 1
+        if len(packets) <= budget:
+            best = (im.size, jpeg, packets)
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    if not best:
+        return {'level': level, 'evaluated': evaluated}
+    size, jpeg, packets = best
+    # Judge what the ground station will see, scaled up to the full size
+    with Image.open(io.BytesIO(ssdvcodec.decode(packets, packet_length))) as received:
+        score = psnr(received.convert("RGB").resize(reference.size, Image.Resampling.BICUBIC), reference)
+    return {'level': level, 'quality': quality, 'size': size, 'jpeg': jpeg, 'packets': packets,
+            'psnr': score, 'evaluated': evaluated}
+
+def fit(input_filename, max_size, budget, packet_length, callsign, text=None, jobs=None) -> dict | None:
+    """
+    Search ssdv quality levels and sizes up to max_size, in parallel, for
+    the best looking image (highest PSNR against the full size image) that
+    fits in budget packets. Returns fit_level()'s result for it plus the
+    search 'time' and total 'evaluated', or None if nothing fits.
+    """
+    t0 = time.monotonic()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(fit_level, input_filename, tuple(max_size), level, budget, packet_length, callsign, text)
+                   for level in range(8)]
+        results = [f.result() for f in futures]
+    fitting = [r for r in results if 'packets' in r]
+    if not fitting:
+        return None
+    # Ties go to the bigger picture
+    best = max(fitting, key=lambda r: (r['psnr'], r['size'][0] * r['size'][1]))
+    best.update(time=time.monotonic() - t0, evaluated=sum(r['evaluated'] for r in results))
+    return best
+
+def output_names(input_filename, suffix="") -> tuple[str, str]:
+    """(small JPEG, SSDV .bin) file names img2ssdv.py writes for an input"""
+    basename_noext = os.path.splitext(os.path.basename(input_filename))[0]
+    if suffix:
+        suffix = f"_{suffix}"
+    return f"{basename_noext}_small{suffix}.jpg", f"{basename_noext}_ssdv{suffix}.bin"
+
+def report(small_output_filename, ssdv_output_filename, packets, quality, packet_length) -> str:
+    """What img2ssdv.py prints about a conversion"""
+    width, height = packets[0][9] * 16, packets[0][10] * 16
+    return "\n".join([
+        f"\nJPEG Optimization → {small_output_filename}",
+        f"Resized to   : {width}×{height} (multiple of 16, aspect preserved)",
+        f"Quality      : {quality}",
+        f"Subsampling  : 4:2:0",
+        f"Progressive  : disabled",
+        f"Metadata     : fully stripped",
+        f"\nSSDV Encoding → {ssdv_output_filename}",
+        f"PacketLength : {packet_length} bytes",
+        f"Quality level: {ssdvcodec.quality_from_jpeg(quality)}\nWrote {len(packets)} packets",
+    ])
+
+class EncodeCache:
+    """
+    On-disk cache of convert() results.
+
+    Entries are keyed by a SHA-256 of the input file contents and every
+    setting that changes the output, so a re-send of the same image with the
+    same settings skips the resize and both encodes. Each entry is a
+    <key>.jpg and a <key>.bin; the least recently used entries are removed
+    once the directory holds more than max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 64 << 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, input_filename, max_size, quality, packet_length, callsign, text=None) -> str:
+        h = hashlib.sha256()
+        with open(input_filename, "rb") as f:
+            while chunk := f.read(1 << 20):
+                h.update(chunk)
+        # VERSION too, so a changed encoder does not serve stale packets
+        h.update(repr((tuple(max_size), quality, text or "", packet_length, callsign, VERSION)).encode())
+        return h.hexdigest()
+
+    def get(self, key: str, packet_length: int) -> tuple[bytes, list[bytes]] | None:
+        jpg, bin_ = (os.path.join(self.directory, key + ext) for ext in (".jpg", ".bin"))
+        try:
+            with open(jpg, "rb") as f:
+                jpeg = f.read()
+            with open(bin_, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not data or len(data) % packet_length:
+            return None
+        # Mark as recently used
+        for path in (jpg, bin_):
+            os.utime(path)
+        return jpeg, [data[i:i + packet_length] for i in range(0, len(data), packet_length)]
+
+    def put(self, key: str, jpeg: bytes, packets: list[bytes]):
+        for ext, data in ((".jpg", jpeg), (".bin", b"".join(packets))):
+            path = os.path.join(self.directory, key + ext)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        self.trim(keep=key)
+
+    def convert(self, input_filename, max_size, quality, packet_length, callsign, text=None) -> tuple[bytes, list[bytes], bool]:
+        """convert() through the cache, returns (jpeg, packets, cache hit)"""
+        key = self.key(input_filename, max_size, quality, packet_length, callsign, text)
+        cached = self.get(key, packet_length)
+        if cached:
+            return cached + (True,)
+        jpeg, packets = convert(input_filename, max_size, quality, packet_length, callsign, text)
+        self.put(key, jpeg, packets)
+        return jpeg, packets, False
+
+    def trim(self, keep: str | None = None):
+        """Remove least recently used entries (but not keep) until the cache fits max_bytes"""
+        entries = {}
+        total = 0
+        for name in os.listdir(self.directory):
+            key, ext = os.path.splitext(name)
+            if ext in (".jpg", ".bin"):
+                st = os.stat(os.path.join(self.directory, name))
+                mtime, size = entries.get(key, (0.0, 0))
+                entries[key] = (max(mtime, st.st_mtime), size + st.st_size)
+                total += st.st_size
+        for (mtime, size), key in sorted((v, k) for k, v in entries.items()):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            for ext in (".jpg", ".bin"):
+                try:
+                    os.remove(os.path.join(self.directory, key + ext))
+                except OSError:
+                    pass
+            total -= size
+
+def ssdv_encoding(packet_length,input_filename,output_filename,callsign,quality,app=None):
+  """Encode with the external ssdv program (app, default from config.ini), return its report"""
+  app = app or DEFAULT_APP_SSDV
   try:
     #auto adjust ssdv quality 	  
-    q = min(7, max(0, round((quality - 10) / 12)))  
-    command = [DEFAULT_APP_SSDV, "-e", "-n", "-q", str(q), "-l", str(packet_length), "-c", str(callsign), input_filename, output_filename]
-    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    stdout, stderr = process.communicate()
+    q = ssdvcodec.quality_from_jpeg(quality)
+    command = [app, "-e", "-n", "-q", str(q), "-l", str(packet_length), "-c", str(callsign), input_filename, output_filename]
+    with profiling.span("img2ssdv.ssdv_tool"):
+      process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+      stdout, stderr = process.communicate()
     return stderr.decode().strip()
   except FileNotFoundError:
-    return f"\nError: {DEFAULT_APP_SSDV} not found\n{output_filename} not created\nCheck config.ini"
+    return f"\nError: {app} not found\n{output_filename} not created\nCheck config.ini"
   except subprocess.CalledProcessError as e:
-    print(f"An error occurred while running {app_name}: {e}")
+    print(f"An error occurred while running {app}: {e}")
     return None
-    
+
+def convert_file(input_filename, output_dir, callsign, quality, max_size, packet_length, text=None, suffix="", ssdv_app=None) -> dict:
+    """
+    Convert one image into its _small.jpg and _ssdv.bin in output_dir, as
+    img2ssdv.py does; return its manifest entry. Runs in the batch workers.
+    """
+    st = os.stat(input_filename)
+    with open(input_filename, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    small_name, ssdv_name = output_names(input_filename, suffix)
+    im = prepare_image(input_filename, max_size, text)
+    jpeg = jpeg_encode(im, quality)
+    with open(os.path.join(output_dir, small_name), "wb") as f:
+        f.write(jpeg)
+
+    ssdv_path = os.path.join(output_dir, ssdv_name)
+    if ssdv_app:
+        ssdv_encoding(packet_length, os.path.join(output_dir, small_name), ssdv_path, callsign, quality, app=ssdv_app)
+        size = os.path.getsize(ssdv_path)
+    else:
+        packets = ssdv_encode(jpeg, callsign, quality, packet_length)
+        with open(ssdv_path, "wb") as f:
+            f.write(b"".join(packets))
+        size = len(packets) * packet_length
+    return {
+        'small': small_name, 'ssdv': ssdv_name, 'width': im.size[0], 'height': im.size[1],
+        'packets': size // packet_length, 'bytes': size, 'jpeg_bytes': len(jpeg),
+        'sha256': digest, 'mtime_ns': st.st_mtime_ns, 'size': st.st_size,
+    }
+
+def expand_inputs(patterns) -> list[str]:
+    """Files named by paths, directories (their images) and glob patterns, absolute and sorted"""
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found += [os.path.join(pattern, n) for n in os.listdir(pattern) if n.lower().endswith(IMAGE_EXTENSIONS)]
+        elif glob.has_magic(pattern):
+            # Windows shells do not expand wildcards, do it here
+            found += [p for p in glob.glob(pattern) if os.path.isfile(p)]
+        else:
+            found.append(pattern)
+    return sorted(set(os.path.abspath(p) for p in found))
+
+def up_to_date(entry: dict | None, settings: dict, input_filename, output_dir) -> bool:
+    """Whether a manifest entry still matches the input file, the settings and the files on disk"""
+    if not entry or entry.get('settings') != settings:
+        return False
+    if not all(os.path.exists(os.path.join(output_dir, entry[k])) for k in ('small', 'ssdv')):
+        return False
+    try:
+        st = os.stat(input_filename)
+        if entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            return True
+        # Touched or copied but maybe the same picture: compare contents
+        if entry['size'] != st.st_size:
+            return False
+        with open(input_filename, "rb") as f:
+            if hashlib.sha256(f.read()).hexdigest() != entry['sha256']:
+                return False
+    except OSError:
+        # Gone or unreadable: convert_file reports it as failed
+        return False
+    entry['mtime_ns'] = st.st_mtime_ns
+    return True
+
+def batch(args, inputs, ssdv_app=None):
+    """Convert many images on a process pool, keeping manifest.json in args.dir up to date"""
+    manifest_path = os.path.join(args.dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path) as f:
+            images = json.load(f)['images']
+    except (OSError, ValueError, KeyError):
+        images = {}
+
+    settings = {'max_size': list(args.max_size), 'quality': args.quality, 'length': args.length,
+                'callsign': args.callsign, 'text': args.text, 'suffix': args.suffix,
+                'encoder': 'ssdv' if ssdv_app else f'ssdvcodec-{VERSION}'}
+    todo = []
+    outputs = {}
+    skipped = 0
+    for path in inputs:
+        name = output_names(path, args.suffix)[1]
+        if name in outputs:
+            print(f"Skipped {path}: same output name as {outputs[name]}", file=sys.stderr)
+            continue
+        outputs[name] = path
+        if up_to_date(images.get(path), settings, path, args.dir):
+            skipped += 1
+        else:
+            todo.append(path)
+
+    print(f"{len(inputs)} images, {skipped} up to date, converting {len(todo)} with {args.jobs} workers")
+    failed = 0
+    with profiling.span("img2ssdv.batch", images=len(todo), jobs=args.jobs), ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(convert_file, path, args.dir, args.callsign, args.quality, args.max_size,
+                               args.length, args.text, args.suffix, ssdv_app): path for path in todo}
+        for i, future in enumerate(as_completed(futures), 1):
+            path = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                print(f"[{i}/{len(todo)}] {os.path.basename(path)}: Error: {e}", file=sys.stderr)
+                failed += 1
+                continue
+            entry['settings'] = settings
+            images[path] = entry
+            print(f"[{i}/{len(todo)}] {os.path.basename(path)} → {entry['ssdv']}: {entry['packets']} packets, {entry['bytes']} bytes")
+
+    # Only images that are still there
+    images = {p: e for p, e in images.items() if os.path.exists(p)}
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({'version': 1, 'images': images}, f, indent=1, sort_keys=True)
+    os.replace(tmp, manifest_path)
+
+    done = [images[p] for p in inputs if p in images]
+    print(f"\n{len(todo) - failed} converted, {skipped} up to date, {failed} failed;"
+          f" {sum(e['packets'] for e in done)} packets, {sum(e['bytes'] for e in done)} bytes in total → {manifest_path}")
+    return failed
+
 
 def main():
     parser = argparse.ArgumentParser(
          description="Convert image to SSDV-compatible JPEG",
          epilog="Example: ./img2ssdv.py image.jpg"
     )
-    parser.add_argument("input", help="Input image filename (JPG, PNG, etc.)")
+    parser.add_argument("input", nargs="+", help="Input image filename (JPG, PNG, etc.); several files, directories or globs for batch mode")
     parser.add_argument("--max-size", nargs=2, type=int, metavar=("WIDTH", "HEIGHT"),
                         default=[320, 320],
                         help="Max width and height in pixels (default: 320 320)")
@@ -124,19 +516,29 @@ def main():
                         help="output directory (default: .)") 
     parser.add_argument("--suffix", type=str, default="",
                         help="filename suffix") 
+    parser.add_argument("--ssdv-tool", action="store_true",
+                        help="encode with the external ssdv program instead of the built-in encoder")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="batch mode worker processes (default: one per CPU core)")
+    fit_group = parser.add_mutually_exclusive_group()
+    fit_group.add_argument("--fit-packets", type=int, metavar="N",
+                           help="pick quality and size (up to --max-size) for the best image of at most N packets")
+    fit_group.add_argument("--fit-seconds", type=float, metavar="S",
+                           help="same, for the packets that can be sent in S seconds of airtime")
+    parser.add_argument("--baud", type=int, default=DEFAULT_BAUD,
+                        help=f"modem bit rate for --fit-seconds (default: {DEFAULT_BAUD}, Dire Wolf MODEM)")
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="tx.py --delay between frames, for --fit-seconds (default: 0)")
+    profiling.add_arguments(parser)
     parser.add_argument("--version", action='version', version=f"ssdv2sat-%(prog)s v{VERSION} by hobisatelit <https://github.com/hobisatelit>", help="Show the version of the application")
     
     args = parser.parse_args()
+    profiling.start_from_args(args, "img2ssdv")
 
-    args.input = os.path.abspath(args.input)
-    basename = os.path.basename(args.input)
-    basename_noext = os.path.splitext(basename)[0]
-
-    if args.suffix:
-       args.suffix = f"_{args.suffix}"
-		
-    small_output_filename = f"{basename_noext}_small{args.suffix}.jpg"
-    ssdv_output_filename = f"{basename_noext}_ssdv{args.suffix}.bin"
+    batch_mode = len(args.input) > 1 or os.path.isdir(args.input[0]) or glob.has_magic(args.input[0])
+    if not batch_mode:
+        args.input = os.path.abspath(args.input[0])
+        small_output_filename, ssdv_output_filename = output_names(args.input, args.suffix)
 
     max_w, max_h = args.max_size
     if max_w < 16 or max_h < 16:
@@ -151,49 +553,80 @@ def main():
         print("Error: SSDV packet length must be between 64 and 256", file=sys.stderr)
         sys.exit(1)
 
+    fitting = args.fit_packets is not None or args.fit_seconds is not None
+    if fitting:
+        if batch_mode:
+            print("Error: --fit-packets/--fit-seconds take a single input image", file=sys.stderr)
+            sys.exit(1)
+        if args.ssdv_tool:
+            print("Error: --fit-packets/--fit-seconds use the built-in encoder, not --ssdv-tool", file=sys.stderr)
+            sys.exit(1)
+        if args.fit_seconds is not None:
+            budget = packets_for_seconds(args.fit_seconds, args.length, args.baud, args.delay)
+        else:
+            budget = args.fit_packets
+        if budget < 1:
+            print("Error: the budget does not fit a single packet", file=sys.stderr)
+            sys.exit(1)
+
     os.makedirs(args.dir, exist_ok=True)
 
+    if fitting:
+        try:
+            best = fit(args.input, args.max_size, budget, args.length, args.callsign, args.text, args.jobs)
+        except FileNotFoundError:
+            print(f"Error: Input file not found → {args.input}", file=sys.stderr)
+            sys.exit(1)
+        if not best:
+            print(f"Error: not even a 16×16 image fits in {budget} packets", file=sys.stderr)
+            sys.exit(1)
+        with open(os.path.join(args.dir, small_output_filename), "wb") as f:
+            f.write(best['jpeg'])
+        with open(os.path.join(args.dir, ssdv_output_filename), "wb") as f:
+            f.write(b"".join(best['packets']))
+        airtime = len(best['packets']) * frame_airtime(args.length, args.baud, args.delay)
+        print(report(small_output_filename, ssdv_output_filename, best['packets'], best['quality'], args.length))
+        print(f"\nFit          : {len(best['packets'])}/{budget} packets, ~{airtime:.0f} s at {args.baud} baud")
+        print(f"Picked       : {best['size'][0]}×{best['size'][1]}, quality {best['quality']} (level {best['level']}),"
+              f" PSNR {best['psnr']:.1f} dB")
+        print(f"Search       : {best['evaluated']} encodes in {best['time']:.2f} s")
+        return
+
+    if batch_mode:
+        inputs = expand_inputs(args.input)
+        if not inputs:
+            print("Error: no input images found", file=sys.stderr)
+            sys.exit(1)
+        if batch(args, inputs, DEFAULT_APP_SSDV if args.ssdv_tool else None):
+            sys.exit(1)
+        return
+
     try:
-        with Image.open(args.input) as im:
-            # Convert to RGB if necessary (SSDV expects color JPEG)
-            if im.mode not in ("RGB", "L"):
-                im = im.convert("RGB")
-            elif im.mode == "L":
-                im = im.convert("RGB")  # SSDV usually wants color, even if source is grayscale
+        im_resized = prepare_image(args.input, args.max_size, args.text)
 
-            # Resize
-            im_resized = resize_to_fit_keep_aspect(im, max_w, max_h)
-            
-            if args.text:
-                 im_resized = text_topleft(im_resized, args.text)
-
-            # Save with SSDV-friendly settings
-            im_resized.save(
-                os.path.join(args.dir, small_output_filename),
-                format="JPEG",
-                quality=args.quality,
-                subsampling=0,           # 0 → 4:2:0 chroma subsampling (standard for SSDV)
-                optimize=True,           # Optimize Huffman tables
-                progressive=False,       # Baseline JPEG only (no progressive)
-                exif=b"",                # Strip all EXIF
-                icc_profile=None,        # No color profile
-                # Pillow does not write XMP/IPTC/thumbnail unless explicitly added
-            )
-            
-                      
-            #ssdv auto encode
-            ssdv_process = ssdv_encoding(args.length,os.path.join(args.dir, small_output_filename),os.path.join(args.dir, ssdv_output_filename),args.callsign,args.quality)
+        # Save with SSDV-friendly settings
+        jpeg = jpeg_encode(im_resized, args.quality)
+        with open(os.path.join(args.dir, small_output_filename), "wb") as f:
+            f.write(jpeg)
 
+        #ssdv auto encode
+        if args.ssdv_tool:
+            ssdv_process = ssdv_encoding(args.length,os.path.join(args.dir, small_output_filename),os.path.join(args.dir, ssdv_output_filename),args.callsign,args.quality)
+        else:
+            packets = ssdv_encode(jpeg, args.callsign, args.quality, args.length)
+            with open(os.path.join(args.dir, ssdv_output_filename), "wb") as f:
+                f.write(b"".join(packets))
+            ssdv_process = f"Quality level: {ssdvcodec.quality_from_jpeg(args.quality)}\nWrote {len(packets)} packets"
 
-            print(f"\nJPEG Optimization → {small_output_filename}")
-            print(f"Resized to   : {im_resized.size[0]}×{im_resized.size[1]} (multiple of 16, aspect preserved)")
-            print(f"Quality      : {args.quality}")
-            print(f"Subsampling  : 4:2:0")
-            print(f"Progressive  : disabled")
-            print(f"Metadata     : fully stripped")
-            print(f"\nSSDV Encoding → {ssdv_output_filename}")
-            print(f"PacketLength : {args.length} bytes")
-            print(ssdv_process)
+        print(f"\nJPEG Optimization → {small_output_filename}")
+        print(f"Resized to   : {im_resized.size[0]}×{im_resized.size[1]} (multiple of 16, aspect preserved)")
+        print(f"Quality      : {args.quality}")
+        print(f"Subsampling  : 4:2:0")
+        print(f"Progressive  : disabled")
+        print(f"Metadata     : fully stripped")
+        print(f"\nSSDV Encoding → {ssdv_output_filename}")
+        print(f"PacketLength : {args.length} bytes")
+        print(ssdv_process)
 
     except FileNotFoundError:
         print(f"Error: Input file not found → {args.input}", file=sys.stderr)
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Append-only journal of received KISS payloads.
+
+rx.py writes every new packet here before it goes into its .bin, together
+with the time it was received and the image it belongs to. After a crash
+or restart only the records written since the last checkpoint have to be
+read back; everything before them is already in the .bin/.map files,
+which rx.py syncs to disk (before_checkpoint) ahead of every checkpoint.
+
+On disk, a directory of segment files plus an index:
+  journal-000001.log ...   records, appended to the last segment only
+  journal.idx              JSON: per segment its checkpointed size, record
+                           count and records per image; finished images
+
+Record (big-endian):
+  offset  0    : length       key + payload length
+  offset  4    : crc32        of everything after this field
+  offset  8    : time         receive time, float64 UNIX seconds
+  offset 16    : key length
+  offset 18    : key          image key, JSON
+  offset 18+k  : payload      raw KISS payload (AX.25 header + SSDV packet)
+
+A segment is rotated once it passes max_segment bytes. Closed segments
+whose images have all finished are deleted, and ones where finished images
+make up half or more of the records are rewritten without them.
+
+The same records can be fed back through rx.py with --replay.
+
+Usage:
+    python journal.py output/journal
+"""
+VERSION = '0.02'
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+
+INDEX_NAME = "journal.idx"
+SEGMENT_FORMAT = "journal-{:06d}.log"
+RECORD_HEADER = struct.Struct(">IIdH")
+
+
+def encode_record(key: str, payload: bytes, t: float) -> bytes:
+    """One journal record for payload of the image with (JSON) key"""
+    k = key.encode()
+    body = struct.pack(">dH", t, len(k)) + k + payload
+    return struct.pack(">II", len(k) + len(payload), zlib.crc32(body)) + body
+
+
+def read_records(f, offset: int = 0):
+    """
+    Yield (offset, end, t, key, payload) for the records of an open segment
+    from offset on, stopping at the end or at the first torn or corrupt record
+    """
+    f.seek(offset)
+    while True:
+        head = f.read(RECORD_HEADER.size)
+        if len(head) < RECORD_HEADER.size:
+            return
+        length, crc, t, klen = RECORD_HEADER.unpack(head)
+        if klen > length:
+            return
+        data = f.read(length)
+        if len(data) < length or zlib.crc32(head[8:] + data) != crc:
+            return
+        end = offset + RECORD_HEADER.size + length
+        yield offset, end, t, data[:klen].decode(), data[klen:]
+        offset = end
+
+
+class Journal:
+    """
+    Segmented append-only journal with a checkpointed index.
+
+    Keys are any JSON values (rx.py uses (callsign, image_id)); they come
+    back from recover() as tuples when they were lists.
+    """
+
+    def __init__(self, directory: str, max_segment: int = 16 << 20, before_checkpoint=None):
+        self.directory = directory
+        self.max_segment = max_segment
+        # Called before the index moves forward, to sync wherever the
+        # records were copied to (rx.py: the .bin/.map files)
+        self.before_checkpoint = before_checkpoint
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, INDEX_NAME)
+        # [{'name', 'size', 'records', 'keys': {key: records}}], last one is active
+        self.segments = []
+        self.finished = set()
+        self.tail = []
+        self.appended = 0
+        self.dirty = False
+
+        self._load()
+        self.file = open(self._path(self.segments[-1]), "ab", buffering=0)
+
+    def _path(self, seg: dict) -> str:
+        return os.path.join(self.directory, seg['name'])
+
+    def _load(self):
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+            self.segments = index['segments']
+            self.finished = set(index['finished'])
+        except (OSError, ValueError, KeyError):
+            # No index, or a damaged one: start from the segments themselves
+            names = sorted(n for n in os.listdir(self.directory) if n.startswith("journal-") and n.endswith(".log"))
+            self.segments = [{'name': n, 'size': 0, 'records': 0, 'keys': {}} for n in names]
+            self.finished = set()
+        self.segments = [seg for seg in self.segments if os.path.exists(self._path(seg))]
+        if not self.segments:
+            self.segments = [{'name': SEGMENT_FORMAT.format(1), 'size': 0, 'records': 0, 'keys': {}}]
+            open(self._path(self.segments[0]), "ab").close()
+
+        # Records after the checkpoint of each segment were written but
+        # never indexed; a torn record at the end of the log is cut off
+        for seg in self.segments:
+            path = self._path(seg)
+            with open(path, "rb") as f:
+                end = seg['size']
+                for offset, end, t, key, payload in read_records(f, seg['size']):
+                    seg['records'] += 1
+                    seg['keys'][key] = seg['keys'].get(key, 0) + 1
+                    self.finished.discard(key)
+                    self.tail.append((t, key, payload))
+            if os.path.getsize(path) > end:
+                with open(path, "r+b") as f:
+                    f.truncate(end)
+            seg['size'] = end
+
+    def recover(self):
+        """Yield (t, key, payload) of the records written after the last checkpoint, once"""
+        tail, self.tail = self.tail, []
+        for t, key, payload in tail:
+            yield t, _key(key), payload
+
+    def append(self, key, payload: bytes, t: float | None = None):
+        """Add a payload of image key, received at t (default: now)"""
+        k = json.dumps(key)
+        record = encode_record(k, payload, time.time() if t is None else t)
+        seg = self.segments[-1]
+        if seg['size'] and seg['size'] + len(record) > self.max_segment:
+            seg = self._rotate()
+        self.file.write(record)
+        seg['size'] += len(record)
+        seg['records'] += 1
+        seg['keys'][k] = seg['keys'].get(k, 0) + 1
+        # Packets of an image given up on may still turn up later
+        self.finished.discard(k)
+        self.appended += 1
+        self.dirty = True
+
+    def finish(self, key):
+        """Image key needs no more journaling, its records can go"""
+        self.finished.add(json.dumps(key))
+        self.compact()
+
+    def records(self):
+        """Yield (t, key, payload) of every record, oldest first"""
+        for seg in self.segments:
+            with open(self._path(seg), "rb") as f:
+                for offset, end, t, key, payload in read_records(f):
+                    if end > seg['size']:
+                        break
+                    yield t, _key(key), payload
+
+    def compact(self):
+        """Drop or rewrite closed segments holding records of finished images"""
+        changed = False
+        for seg in self.segments[:-1]:
+            done = sum(n for k, n in seg['keys'].items() if k in self.finished)
+            if done == seg['records']:
+                os.remove(self._path(seg))
+                seg['records'] = 0
+                changed = True
+            elif done * 2 >= seg['records']:
+                self._rewrite(seg)
+                changed = True
+        if changed:
+            self.segments = [seg for seg in self.segments[:-1] if seg['records']] + self.segments[-1:]
+            # Keys that appear in no segment any more need no finished mark
+            live = set().union(*(seg['keys'] for seg in self.segments))
+            self.finished &= live
+            self.checkpoint()
+
+    def _rewrite(self, seg: dict):
+        path = self._path(seg)
+        tmp = path + ".tmp"
+        keys = {}
+        size = 0
+        with open(path, "rb") as src, open(tmp, "wb") as dst:
+            for offset, end, t, key, payload in read_records(src):
+                if end > seg['size']:
+                    break
+                if key in self.finished:
+                    continue
+                dst.write(encode_record(key, payload, t))
+                size += end - offset
+                keys[key] = keys.get(key, 0) + 1
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp, path)
+        seg.update(size=size, records=sum(keys.values()), keys=keys)
+
+    def _rotate(self) -> dict:
+        self.file.close()
+        number = int(self.segments[-1]['name'][8:14]) + 1
+        seg = {'name': SEGMENT_FORMAT.format(number), 'size': 0, 'records': 0, 'keys': {}}
+        self.segments.append(seg)
+        self.file = open(self._path(seg), "ab", buffering=0)
+        self.compact()
+        self.checkpoint()
+        return seg
+
+    def checkpoint(self):
+        """Sync the active segment and write the index, atomically"""
+        if self.before_checkpoint:
+            self.before_checkpoint()
+        os.fsync(self.file.fileno())
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({'version': 1, 'segments': self.segments, 'finished': sorted(self.finished)}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+        self.dirty = False
+
+    def nbytes(self) -> int:
+        """Size of the journal on disk"""
+        return sum(seg['size'] for seg in self.segments)
+
+    def close(self):
+        self.checkpoint()
+        self.file.close()
+
+
+def replay(path: str):
+    """
+    Yield (t, key, payload) of every record in a journal directory, or in a
+    single segment file, oldest first; read-only, a torn tail just ends it
+    """
+    if os.path.isdir(path):
+        names = sorted(n for n in os.listdir(path) if n.startswith("journal-") and n.endswith(".log"))
+        paths = [os.path.join(path, n) for n in names]
+    else:
+        paths = [path]
+    for p in paths:
+        with open(p, "rb") as f:
+            for offset, end, t, key, payload in read_records(f):
+                yield t, _key(key), payload
+
+
+def is_journal(path: str) -> bool:
+    """
+    Whether replay() can read path: a directory with a journal in it, or a
+    file whose first record checks out (or an empty, just rotated, segment)
+    """
+    if os.path.isdir(path):
+        return any(n == INDEX_NAME or (n.startswith("journal-") and n.endswith(".log")) for n in os.listdir(path))
+    with open(path, "rb") as f:
+        return not f.read(1) or next(read_records(f), None) is not None
+
+
+def _key(key: str):
+    value = json.loads(key)
+    return tuple(value) if isinstance(value, list) else value
+
+
+def inspect(directory: str) -> tuple[list[dict], set]:
+    """
+    (segments, finished keys) of a journal directory, read-only, so it is
+    safe on the journal of a running rx.py: per segment its name, records,
+    size, records per image and how many of them came after the checkpoint
+    """
+    try:
+        with open(os.path.join(directory, INDEX_NAME)) as f:
+            index = json.load(f)
+        checkpointed = {seg['name']: seg['size'] for seg in index['segments']}
+        finished = set(index['finished'])
+    except (OSError, ValueError, KeyError, TypeError):
+        checkpointed, finished = {}, set()
+    segments = []
+    for name in sorted(n for n in os.listdir(directory) if n.startswith("journal-") and n.endswith(".log")):
+        seg = {'name': name, 'records': 0, 'size': 0, 'keys': {}, 'unindexed': 0}
+        with open(os.path.join(directory, name), "rb") as f:
+            for offset, end, t, key, payload in read_records(f):
+                seg['records'] += 1
+                seg['size'] = end
+                seg['keys'][key] = seg['keys'].get(key, 0) + 1
+                seg['unindexed'] += end > checkpointed.get(name, 0)
+        segments.append(seg)
+    return segments, finished
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the segments and images in an rx.py journal")
+    parser.add_argument("directory", help="journal directory (e.g. output/journal)")
+    parser.add_argument("--version", action='version', version=f"ssdv2sat-%(prog)s v{VERSION} by hobisatelit <https://github.com/hobisatelit>", help="Show the version of the application")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        print(f"Error: {args.directory} is not a journal directory", file=sys.stderr)
+        sys.exit(1)
+    try:
+        segments, finished = inspect(args.directory)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not segments:
+        print(f"No journal segments in {args.directory}")
+    for seg in segments:
+        print(f"{seg['name']}: {seg['records']} records, {seg['size']} bytes, {len(seg['keys'])} images"
+              + (f", {seg['unindexed']} after the last checkpoint" if seg['unindexed'] else ""))
+    images = {}
+    for seg in segments:
+        for k, n in seg['keys'].items():
+            images[k] = images.get(k, 0) + n
+    for k, n in sorted(images.items()):
+        print(f"  {k}: {n} records{' (finished)' if k in finished else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Live receiver metrics in the Prometheus text format, over local HTTP.
+
+rx.py --metrics [HOST:]PORT serves GET /metrics from a background thread.
+Nothing is computed per packet for it: the receiver only bumps the plain
+counters it keeps anyway (per station, per image, rejects by reason) and
+the decode threads fill the latency histograms. Everything else is worked
+out when the page is fetched, from copies of those dicts, so a scrape
+never blocks the KISS feeds.
+
+Per (callsign, image): packets, duplicates, packets/s while the image came
+in, time from its first packet to the first decodable JPEG and a decode
+latency histogram. In total: frames, packets and duplicates per station,
+rejected frames by reason, rebuilt packets, packets/s since the previous
+scrape, decoder backlog and histograms of decode latency and time to
+first JPEG.
+"""
+VERSION = '0.01'
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 9108
+# Seconds; decodes take milliseconds, a first JPEG can take most of a pass
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+class Histogram:
+    """Prometheus-style histogram; observe() is a bisect and two additions"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def copy(self) -> "Histogram":
+        h = Histogram(self.buckets)
+        h.counts, h.sum = list(self.counts), self.sum
+        return h
+
+    def lines(self, name: str, labels: str = "") -> list[str]:
+        sep = "," if labels else ""
+        out = []
+        total = 0
+        for le, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            out.append(f'{name}_bucket{{{labels}{sep}le="{le}"}} {total}')
+        suffix = f"{{{labels}}}" if labels else ""
+        out.append(f"{name}_sum{suffix} {self.sum:.6f}")
+        out.append(f"{name}_count{suffix} {total}")
+        return out
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _image_labels(key) -> str:
+    return f'callsign="{_label(key[0])}",image="{_label(key[1])}"'
+
+
+class Metrics:
+    """Renders the state of an rx.Receiver as Prometheus text"""
+
+    def __init__(self, receiver):
+        self.receiver = receiver
+        self.lock = threading.Lock()
+        # (time, packets) of the previous scrape, for packets/s
+        self.previous = (time.monotonic(), receiver.total_valid)
+
+    def render(self) -> str:
+        r = self.receiver
+        dec = r.decoder
+        # dict() copies run without letting the receiver thread in between
+        stations = {label: dict(st) for label, st in dict(r.stations).items()}
+        images = {key: dict(st) for key, st in dict(r.image_stats).items()}
+        rejected = dict(r.rejected)
+        with dec.lock:
+            decodes = {key: dict(st) for key, st in dec.stats.items()}
+            backlog = len(dec.running)
+            waiting = len(dec.pending)
+            latency = dec.latency.copy()
+            first_jpeg = dec.first_jpeg.copy()
+            per_image = {key: st['histogram'].copy() for key, st in dec.stats.items()}
+
+        now = time.monotonic()
+        with self.lock:
+            rate = 0.0
+            if now > self.previous[0]:
+                rate = (r.total_valid - self.previous[1]) / (now - self.previous[0])
+            self.previous = (now, r.total_valid)
+
+        out = []
+
+        def metric(name, kind, help_text, samples):
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(samples)
+
+        metric("ssdv_rx_frames_total", "counter", "KISS frames received, by station",
+               [f'ssdv_rx_frames_total{{station="{_label(s)}"}} {st["frames"]}' for s, st in stations.items()])
+        metric("ssdv_rx_packets_total", "counter", "New SSDV packets stored, by station",
+               [f'ssdv_rx_packets_total{{station="{_label(s)}"}} {st["packets"]}' for s, st in stations.items()])
+        metric("ssdv_rx_duplicates_total", "counter", "Packets dropped as already stored, by station",
+               [f'ssdv_rx_duplicates_total{{station="{_label(s)}"}} {st["duplicates"]}' for s, st in stations.items()])
+        metric("ssdv_rx_rejected_total", "counter", "Frames rejected, by reason",
+               [f'ssdv_rx_rejected_total{{reason="{_label(k)}"}} {v}' for k, v in sorted(rejected.items())])
+        metric("ssdv_rx_recovered_total", "counter", "Packets rebuilt from repair frames", [f"ssdv_rx_recovered_total {r.recovered}"])
+        metric("ssdv_rx_packets_per_second", "gauge", "New packets per second since the previous scrape",
+               [f"ssdv_rx_packets_per_second {rate:.3f}"])
+        metric("ssdv_rx_decode_backlog", "gauge", "Images with a decode running", [f"ssdv_rx_decode_backlog {backlog}"])
+        metric("ssdv_rx_decode_waiting", "gauge", "Images with a redecode waiting behind a running one",
+               [f"ssdv_rx_decode_waiting {waiting}"])
+        metric("ssdv_rx_open_images", "gauge", "Images held open", [f"ssdv_rx_open_images {len(r.images.open)}"])
+
+        metric("ssdv_rx_image_packets_total", "counter", "New packets stored, by image",
+               [f"ssdv_rx_image_packets_total{{{_image_labels(k)}}} {st['packets']}" for k, st in images.items()])
+        metric("ssdv_rx_image_duplicates_total", "counter", "Duplicate packets dropped, by image",
+               [f"ssdv_rx_image_duplicates_total{{{_image_labels(k)}}} {st['duplicates']}" for k, st in images.items()])
+        metric("ssdv_rx_image_packets_per_second", "gauge", "Packets per second from the first to the last packet of an image",
+               [f"ssdv_rx_image_packets_per_second{{{_image_labels(k)}}}"
+                f" {(st['packets'] - 1) / (st['last'] - st['first']) if st['packets'] > 1 and st['last'] > st['first'] else 0:.3f}"
+                for k, st in images.items()])
+        metric("ssdv_rx_image_first_jpeg_seconds", "gauge", "Seconds from the first packet of an image to its first decodable JPEG",
+               [f"ssdv_rx_image_first_jpeg_seconds{{{_image_labels(k)}}} {st['first']:.6f}"
+                for k, st in decodes.items() if st['first'] is not None])
+        metric("ssdv_rx_image_decode_failures_total", "counter", "Failed decodes, by image",
+               [f"ssdv_rx_image_decode_failures_total{{{_image_labels(k)}}} {st['failed']}" for k, st in decodes.items()])
+
+        metric("ssdv_rx_image_decode_seconds", "histogram", "Decode latency, from the request to the JPEG being written, by image",
+               [line for key, h in per_image.items() for line in h.lines("ssdv_rx_image_decode_seconds", _image_labels(key))])
+        metric("ssdv_rx_decode_seconds", "histogram", "Decode latency, from the request to the JPEG being written",
+               latency.lines("ssdv_rx_decode_seconds"))
+        metric("ssdv_rx_first_jpeg_seconds", "histogram", "Seconds from the first packet of an image to its first decodable JPEG",
+               first_jpeg.lines("ssdv_rx_first_jpeg_seconds"))
+        return "\n".join(out) + "\n"
+
+
+def parse_address(text: str) -> tuple[str, int]:
+    """PORT, HOST or HOST:PORT → (host, port), on localhost and DEFAULT_PORT unless given"""
+    if text.isdigit():
+        return "127.0.0.1", int(text)
+    host, sep, port = text.rpartition(":")
+    if not sep:
+        return text, DEFAULT_PORT
+    return host or "127.0.0.1", int(port)
+
+
+def serve(metrics: Metrics, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Serve metrics.render() at http://host:port/metrics from a daemon thread"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Named timing spans across img2ssdv.py, tx.py and rx.py.
+
+The code marks its stages with `with profiling.span("rx.parse"):`. Until
+start() is called that is a shared do-nothing object, so the spans stay
+in the hot paths for good. With --profile FILE each span is written to
+FILE as one JSON line when it ends:
+
+  {"span": "rx.parse", "t": 1790000000.123456, "ms": 0.012,
+   "process": "rx", "thread": "MainThread", ...fields}
+
+t is the wall clock time the span started, so the traces of tx.py and
+rx.py of one pass can be read side by side. --cprofile FILE also dumps
+cProfile stats of the main thread (pstats format, e.g. for snakeviz). On
+exit a table of per-stage latency percentiles is printed.
+
+Spans of worker processes (img2ssdv.py batch mode, WAV demodulation) are
+not traced; the span around the whole pool is.
+
+Stages:
+  img2ssdv.resize     open, resize and caption the input image (Pillow)
+  img2ssdv.save       JPEG encode (Pillow)
+  img2ssdv.encode     built-in SSDV encoder
+  img2ssdv.ssdv_tool  external ssdv program
+  img2ssdv.batch      a whole batch on the process pool
+  tx.connect          KISS connection check
+  tx.img2ssdv         image to SSDV packets, cache included
+  tx.synth            WAV rendering with --synth
+  tx.pace             waiting for a free slot in Dire Wolf's queue, per frame
+  tx.send             escape and send one frame
+  rx.deframe          KISS deframing of one read
+  rx.frame            one frame through the receiver, all of the below
+  rx.parse            SSDV packet checks
+  rx.journal          journal append
+  rx.write            packet into its .bin slot (and the native decoder)
+  rx.decode           writing out one JPEG, on a decode thread
+  rx.decode_latency   from the decode request to the JPEG written
+
+Usage:
+    python rx.py --replay pass.kiss --profile rx.jsonl --cprofile rx.prof
+    python profiling.py tx.jsonl rx.jsonl
+"""
+VERSION = '0.01'
+
+import argparse
+import atexit
+import json
+import math
+import sys
+import threading
+import time
+
+
+class Span:
+    """One timed stage; set() adds fields to its record"""
+    __slots__ = ('tracer', 'name', 'fields', 'start')
+
+    def __init__(self, tracer, name: str, fields: dict):
+        self.tracer = tracer
+        self.name = name
+        self.fields = fields
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.start, time.perf_counter() - self.start, self.fields)
+        return False
+
+
+class _NullSpan:
+    """What span() returns while nothing is traced"""
+    __slots__ = ()
+
+    def set(self, **fields):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Writes spans to a JSONL file and keeps their durations for summary()"""
+
+    def __init__(self, process: str, path: str | None = None, cprofile: str | None = None):
+        self.process = process
+        self.path = path
+        self.file = open(path, "w") if path else None
+        self.lock = threading.Lock()
+        # span name → durations in seconds
+        self.durations = {}
+        # perf_counter() + epoch is the wall clock time
+        self.epoch = time.time() - time.perf_counter()
+        self.cprofile = cprofile
+        self.profiler = None
+        if cprofile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def span(self, name: str, fields: dict) -> Span:
+        return Span(self, name, fields)
+
+    def add(self, name: str, start: float, duration: float, fields: dict | None = None):
+        """Record a span that started at perf_counter() start and lasted duration seconds"""
+        record = {'span': name, 't': round(self.epoch + start, 6), 'ms': round(duration * 1000, 3),
+                  'process': self.process, 'thread': threading.current_thread().name}
+        if fields:
+            record.update(fields)
+        line = json.dumps(record, default=str) + "\n"
+        with self.lock:
+            self.durations.setdefault(name, []).append(duration)
+            if self.file:
+                self.file.write(line)
+
+    def close(self):
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.cprofile)
+            self.profiler = None
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+
+
+_tracer = None
+
+
+def span(name: str, **fields) -> Span | _NullSpan:
+    """Context manager timing the stage name, a no-op unless start() was called"""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, fields)
+
+
+def record(name: str, seconds: float, **fields):
+    """Record a duration measured elsewhere, as a span that ended now"""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.add(name, time.perf_counter() - seconds, seconds, fields)
+
+
+def start(process: str, path: str | None = None, cprofile: str | None = None) -> Tracer:
+    """Trace spans of process (e.g. "rx") until exit, then print the summary"""
+    global _tracer
+    _tracer = Tracer(process, path, cprofile)
+    atexit.register(_finish)
+    return _tracer
+
+
+def stop() -> Tracer | None:
+    """Stop tracing, write the cProfile dump and close the trace"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer:
+        tracer.close()
+    return tracer
+
+
+def _finish():
+    tracer = stop()
+    if tracer is None:
+        return
+    print(f"\nProfile of {tracer.process}:")
+    print(summary(tracer.durations))
+    if tracer.path:
+        print(f"Trace   → {tracer.path}")
+    if tracer.cprofile:
+        print(f"cProfile → {tracer.cprofile}")
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """The --profile and --cprofile options of the entry points"""
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Write a JSONL trace of timing spans to FILE and print per-stage latency percentiles on exit")
+    parser.add_argument("--cprofile", metavar="FILE", help="Also dump cProfile stats of the main thread to FILE")
+
+
+def start_from_args(args, process: str):
+    if args.profile or args.cprofile:
+        start(process, args.profile, args.cprofile)
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def summary(durations: dict) -> str:
+    """Table of count, total and p50/p90/p99/max latency per span, in milliseconds"""
+    lines = [f"{'span':<20} {'count':>8} {'total s':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+    for name in sorted(durations):
+        values = sorted(durations[name])
+        if not values:
+            continue
+        lines.append(f"{name:<20} {len(values):8d} {sum(values):9.3f}"
+                     + "".join(f" {percentile(values, p) * 1000:9.3f}" for p in (50, 90, 99))
+                     + f" {values[-1] * 1000:9.3f}")
+    return "\n".join(lines)
+
+
+def read_trace(paths: list[str]) -> dict:
+    """Span name → durations in seconds, from JSONL traces"""
+    durations = {}
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    durations.setdefault(rec['span'], []).append(rec['ms'] / 1000)
+                except (ValueError, KeyError, TypeError):
+                    # A torn last line of a trace that was cut short
+                    continue
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency percentiles of --profile traces")
+    parser.add_argument("trace", nargs="+", help="JSONL traces written with --profile")
+    parser.add_argument("--version", action='version', version=f"ssdv2sat-%(prog)s v{VERSION} by hobisatelit <https://github.com/hobisatelit>", help="Show the version of the application")
+    args = parser.parse_args()
+    try:
+        durations = read_trace(args.trace)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(summary(durations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+What rx.py and tx.py both read and write: the missing-packet reports
+rx.py writes for tx.py --resend, and HOST:PORT station addresses.
+"""
+VERSION = '0.01'
+
+import argparse
+
+MISSING_TAG = "SSDV-MISSING"
+
+
+def format_ranges(ids) -> str:
+    """Sorted packet IDs as a range list: 0-3,17,40-45"""
+    ranges = []
+    for i in ids:
+        if ranges and ranges[-1][1] == i - 1:
+            ranges[-1][1] = i
+        else:
+            ranges.append([i, i])
+    return ",".join(f"{a}" if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def parse_ranges(text: str) -> list[tuple[int, int | None]]:
+    """Range list → [(first, last)]; last is None for an open-ended "N-" """
+    ranges = []
+    for part in text.split(","):
+        first, sep, last = part.partition("-")
+        ranges.append((int(first), int(last) if last else None if sep else int(first)))
+    return ranges
+
+
+def missing_report(key, store) -> str | None:
+    """
+    One-line report of the packets an image (an rx.PacketStore) lacks,
+    None once complete:
+      SSDV-MISSING <callsign> <image id> <packet length> <total|?> <check> <ranges|->
+    check is <packet id>:<CRC32> of the first packet received, so the
+    sender can tell it encoded the same image again; ranges end in "N-"
+    when the number of packets is not known.
+    """
+    if store.complete():
+        return None
+    received = store.packet_ids()
+    if store.total_frame:
+        total = store.total_frame
+    elif store.eoi_packet_id is not None:
+        total = store.eoi_packet_id + 1
+    else:
+        total = None
+    end = total if total is not None else (received[-1] + 1 if received else 0)
+    ranges = format_ranges([i for i in range(end) if i not in store])
+    if total is None:
+        ranges = ",".join(filter(None, [ranges, f"{end}-"]))
+    check = f"{received[0]}:{store.read(received[0])[-4:].hex()}" if received else "-"
+    return f"{MISSING_TAG} {key[0]} {key[1]} {store.packet_length} {total if total is not None else '?'} {check} {ranges or '-'}"
+
+
+def parse_missing_report(text: str) -> dict:
+    """Fields of a missing_report line; ValueError if it is not one"""
+    fields = text.split()
+    if len(fields) != 7 or fields[0] != MISSING_TAG:
+        raise ValueError(f"not a {MISSING_TAG} report")
+    _, callsign, image_id, length, total, check, ranges = fields
+    if check != "-":
+        pid, crc = check.split(":")
+        check = (int(pid), bytes.fromhex(crc))
+    else:
+        check = None
+    return {
+        'callsign': callsign, 'image_id': image_id, 'packet_length': int(length),
+        'total': None if total == "?" else int(total), 'check': check,
+        'ranges': [] if ranges == "-" else parse_ranges(ranges),
+    }
+
+
+def parse_station(text: str, default_port: int) -> tuple[str, int]:
+    """HOST or HOST:PORT → (host, port)"""
+    host, sep, port = text.rpartition(':')
+    if not sep:
+        return text, default_port
+    try:
+        return host, int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid station '{text}', expected HOST:PORT")
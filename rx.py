@@ -4,8 +4,9 @@
 # License: GPL-3.0-or-later
 # SSDV doc: https://ukhas.org.uk/doku.php?id=guides:ssdv
 
-# This script connects to a Dire Wolf KISS TCP server (port 8001 by default)
-# and extracts SSDV packets from IL2P payloads
+# This script connects to one or more Dire Wolf KISS TCP servers (port 8001
+# by default) and extracts SSDV packets from IL2P payloads. Packets heard by
+# several stations are kept once, from whichever station heard them first.
 #
 # Payload structure from Dire Wolf KISS:
 #   bytes 0–15:   AX25 header (used as image fingerprint / unique id)
@@ -23,17 +24,35 @@
 #   offset  6: image ID    1 byte
 #   offset 7–8: packet ID  2 bytes (big-endian)
 #   offset 9–255: image data (247 bytes)
+#
+# Frames of type 0x68 instead of 0x67 are erasure.py repair frames, from
+# which missing SSDV packets are rebuilt.
 VERSION = '0.02'
 
-import socket
+import asyncio
 import argparse
 import sys
 import os
 import subprocess
 import configparser
-from collections import defaultdict
+import threading
+import time
+import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import aggregate
+import erasure
+import journal
+import metrics
+import profiling
+import reports
+import ssdvcodec
 
 KISS_FEND = b'\xC0'
+KISS_FESC = b'\xDB'
+KISS_TFEND = b'\xDC'
+KISS_TFESC = b'\xDD'
 KISS_DATA_FRAME = 0x00
 
 # 16 byte il2p header + 64 byte minimum ssdv 
@@ -47,33 +66,506 @@ def show_progress(i, n, width=20):
     return output
 
 def ssdv_decoding(packet_length,input_filename,output_filename):
+  """Run ssdv to completion, return its exit code or None if it is missing"""
   try:
     command = ["ssdv", "-d", "-l", str(packet_length), input_filename, output_filename]
-    return subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
   except FileNotFoundError:
     return None
-  except subprocess.CalledProcessError as e:
-    print(f"An error occurred while running {app_name}: {e}")
+  except OSError as e:
+    print(f"An error occurred while running ssdv: {e}")
     return None
 
+class NativeDecoder:
+    """
+    In-process stand-in for ssdv_decoding.
+
+    Keeps an ssdvcodec.Decoder per .bin file that is fed every packet as it
+    arrives, so a decode only has to write out the JPEG instead of running
+    ssdv over the whole file again.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # input_filename → (ssdvcodec.Decoder, lock)
+        self.decoders = {}
+
+    def _get(self, input_filename: str, packet_length: int):
+        with self.lock:
+            if input_filename not in self.decoders:
+                self.decoders[input_filename] = (ssdvcodec.Decoder(packet_length), threading.Lock())
+            return self.decoders[input_filename]
+
+    def feed(self, input_filename: str, packet_length: int, packet: bytes) -> bool:
+        """Add a packet of the image stored in input_filename"""
+        dec, lock = self._get(input_filename, packet_length)
+        with lock:
+            return dec.feed(packet)
+
+    def current(self, input_filename: str):
+        """Decoder kept for input_filename, or None"""
+        with self.lock:
+            entry = self.decoders.get(input_filename)
+        return entry and entry[0]
+
+    def nbytes(self, input_filename: str) -> int:
+        """Memory held by the decoder of input_filename"""
+        with self.lock:
+            entry = self.decoders.get(input_filename)
+        if entry is None:
+            return 0
+        dec, lock = entry
+        with lock:
+            return dec.nbytes()
+
+    def drop(self, input_filename: str, dec=None):
+        """Free the decoder of input_filename (only if it is still dec, when given)"""
+        with self.lock:
+            entry = self.decoders.get(input_filename)
+            if entry is not None and (dec is None or entry[0] is dec):
+                del self.decoders[input_filename]
+
+    def __call__(self, packet_length, input_filename, output_filename):
+        with self.lock:
+            entry = self.decoders.get(input_filename)
+        if entry is None:
+            return 1
+        dec, lock = entry
+        with lock:
+            jpeg = dec.get_jpeg()
+        if not jpeg:
+            return 1
+        # Write next to the old image and swap, so viewers never see half a file
+        tmp = output_filename + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(jpeg)
+            os.replace(tmp, output_filename)
+        except OSError as e:
+            print(f"An error occurred while writing {output_filename}: {e}")
+            return 1
+        return 0
+
+class DecodeScheduler:
+    """
+    Bounded, coalescing runner for ssdv decodes.
+
+    Decodes run on a small thread pool and each worker waits for its ssdv
+    process, so finished decoders are reaped. At most one decode per image
+    is in flight: requests that arrive meanwhile are folded into a single
+    redecode of the latest .bin once the running one ends.
+    """
+
+    def __init__(self, workers: int = 2, decode=ssdv_decoding):
+        self.decode = decode
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ssdv")
+        self.lock = threading.Lock()
+        self.running = set()
+        self.pending = {}
+        # key → callables to run once its decodes are done
+        self.callbacks = {}
+        # key → {'runs', 'failed', 'coalesced', 'last', 'total', 'max'} in seconds,
+        # 'since' the first request and 'first' JPEG written that long after it,
+        # 'histogram' of decode latency
+        self.stats = {}
+        # Decode latency and time to first JPEG over all images
+        self.latency = metrics.Histogram()
+        self.first_jpeg = metrics.Histogram()
+
+    def submit(self, key, packet_length: int, input_filename: str, output_filename: str):
+        """Ask for a decode of key; cheap to call on every packet"""
+        job = (packet_length, input_filename, output_filename, time.monotonic())
+        with self.lock:
+            st = self._stat(key)
+            if st['since'] is None:
+                st['since'] = job[3]
+            if key in self.running:
+                if key in self.pending:
+                    # Keep the oldest request time so latency covers the wait
+                    job = job[:3] + (self.pending[key][3],)
+                    self._stat(key)['coalesced'] += 1
+                self.pending[key] = job
+                return
+            self.running.add(key)
+        self.pool.submit(self._run, key, job)
+
+    def _run(self, key, job):
+        while True:
+            packet_length, input_filename, output_filename, requested = job
+            with profiling.span("rx.decode", callsign=key[0], image=key[1]):
+                rc = self.decode(packet_length, input_filename, output_filename)
+            t1 = time.monotonic()
+            profiling.record("rx.decode_latency", t1 - requested, callsign=key[0], image=key[1])
+
+            with self.lock:
+                st = self._stat(key)
+                st['runs'] += 1
+                if rc != 0:
+                    st['failed'] += 1
+                elif st['first'] is None:
+                    st['first'] = t1 - st['since']
+                    self.first_jpeg.observe(st['first'])
+                st['histogram'].observe(t1 - requested)
+                self.latency.observe(t1 - requested)
+                st['last'] = t1 - requested
+                st['total'] += t1 - requested
+                st['max'] = max(st['max'], t1 - requested)
+
+                job = self.pending.pop(key, None)
+                if job is None:
+                    self.running.discard(key)
+                    callbacks = self.callbacks.pop(key, ())
+            if job is None:
+                for fn in callbacks:
+                    fn()
+                return
+
+            # Requeue the redecode behind other images instead of hogging
+            # this worker; during close() the pool takes no new work
+            try:
+                self.pool.submit(self._run, key, job)
+                return
+            except RuntimeError:
+                pass
+
+    def after(self, key, fn):
+        """Call fn once no decode of key is running or waiting"""
+        with self.lock:
+            if key in self.running:
+                self.callbacks.setdefault(key, []).append(fn)
+                return
+        fn()
+
+    def forget(self, key):
+        """Drop the stats of key once no decode of it is running or waiting"""
+        def drop():
+            with self.lock:
+                if key not in self.running:
+                    self.stats.pop(key, None)
+        self.after(key, drop)
+
+    def _stat(self, key) -> dict:
+        if key not in self.stats:
+            self.stats[key] = {'runs': 0, 'failed': 0, 'coalesced': 0, 'last': 0.0, 'total': 0.0, 'max': 0.0,
+                               'since': None, 'first': None, 'histogram': metrics.Histogram()}
+        return self.stats[key]
+
+    def backlog(self) -> int:
+        """Images with a decode running or waiting"""
+        with self.lock:
+            return len(self.running)
+
+    def close(self):
+        """Wait for running and pending decodes to finish"""
+        self.pool.shutdown(wait=True)
+
 def kiss_unescape(data: bytes) -> bytes:
     """Remove KISS escaping from frame content"""
-    out = bytearray()
-    i = 0
-    while i < len(data):
-        if data[i] == 0xDB and i + 1 < len(data):
-            if data[i + 1] == 0xDC:
-                out.append(0xC0)
-            elif data[i + 1] == 0xDD:
-                out.append(0xDB)
-            else:
-                out.append(0xDB)
-                out.append(data[i + 1])
-            i += 2
+    if KISS_FESC not in data:
+        return bytes(data)
+    # FESC TFEND first, so an escaped FESC followed by a literal TFEND
+    # (DB DD DC) is not folded into FEND
+    return bytes(data).replace(KISS_FESC + KISS_TFEND, KISS_FEND).replace(KISS_FESC + KISS_TFESC, KISS_FESC)
+
+class KissDeframer:
+    """
+    Streaming KISS deframer.
+
+    Feed it whole recv() chunks; it splits on FEND, unescapes each frame in
+    bulk and keeps any partial frame until the next chunk arrives. Returned
+    frames still start with the KISS command byte.
+    """
+
+    def __init__(self, max_frame_len: int = 4096):
+        self.max_frame_len = max_frame_len
+        self.buf = bytearray()
+        self.in_frame = False
+        self.dropped = 0
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Add a chunk of the byte stream, return the frames it completed"""
+        frames = []
+        parts = chunk.split(KISS_FEND)
+
+        if len(parts) == 1:
+            # No FEND in this chunk, everything belongs to the open frame
+            if self.in_frame:
+                self.buf += chunk
+                self._check_overflow()
+            return frames
+
+        # First part closes the frame left open by the previous chunk,
+        # bytes seen before the very first FEND are line noise
+        if self.in_frame:
+            self.buf += parts[0]
+            if self.buf:
+                frames.append(kiss_unescape(self.buf))
+        for part in parts[1:-1]:
+            # Back-to-back FENDs give empty parts, those are not frames
+            if part:
+                frames.append(kiss_unescape(part))
+
+        self.buf = bytearray(parts[-1])
+        self.in_frame = True
+        self._check_overflow()
+        return frames
+
+    def _check_overflow(self):
+        # A missing FEND would otherwise let the buffer grow forever
+        if len(self.buf) > self.max_frame_len:
+            self.buf = bytearray()
+            self.in_frame = False
+            self.dropped += 1
+
+class PacketStore:
+    """
+    Slot-indexed .bin writer for one image.
+
+    Every SSDV packet is written once, at offset packet_id * packet_length,
+    so the file stays in packet ID order without being rewritten. Slots that
+    have not arrived yet read back as zeros, which ssdv skips as invalid
+    packets. A companion .map bitmap records the filled slots so a restarted
+    receiver can pick the file up where it left off.
+    """
+
+    def __init__(self, path: str, packet_length: int):
+        self.path = path
+        self.map_path = path + ".map"
+        self.packet_length = packet_length
+        self.bytes_written = 0
+        # Written since the last sync()
+        self.dirty = False
+
+        resume = os.path.exists(path) and os.path.exists(self.map_path)
+        mode = "r+b" if resume else "w+b"
+        self.file = open(path, mode, buffering=0)
+        self.map_file = open(self.map_path, mode, buffering=0)
+        self.bitmap = bytearray(self.map_file.read()) if resume else bytearray()
+        self.count = sum(bin(b).count("1") for b in self.bitmap)
+
+        # Filled in by ImageStore
+        self.signature = None
+        self.total_frame = 0
+        self.eoi_packet_id = None
+        self.last_used = 0.0
+        self.nbytes = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, packet_id: int) -> bool:
+        i = packet_id >> 3
+        return i < len(self.bitmap) and bool(self.bitmap[i] & (1 << (packet_id & 7)))
+
+    def put(self, packet_id: int, data: bytes) -> bool:
+        """Write a packet into its slot, return False if it was already there"""
+        if packet_id in self:
+            return False
+
+        self._write_at(self.file, packet_id * self.packet_length, data)
+
+        i = packet_id >> 3
+        if i >= len(self.bitmap):
+            self.bitmap.extend(bytes(i + 1 - len(self.bitmap)))
+        self.bitmap[i] |= 1 << (packet_id & 7)
+        self._write_at(self.map_file, i, self.bitmap[i:i + 1])
+
+        self.count += 1
+        self.bytes_written += len(data) + 1
+        self.dirty = True
+        return True
+
+    def discard(self, packet_id: int):
+        """Mark a slot empty again, for a packet found corrupt on disk"""
+        if packet_id not in self:
+            return
+        i = packet_id >> 3
+        self.bitmap[i] &= ~(1 << (packet_id & 7))
+        self._write_at(self.map_file, i, self.bitmap[i:i + 1])
+        self.count -= 1
+        self.dirty = True
+
+    def read(self, packet_id: int) -> bytes:
+        """Packet stored in a slot"""
+        offset = packet_id * self.packet_length
+        if hasattr(os, "pread"):
+            return os.pread(self.file.fileno(), self.packet_length, offset)
+        self.file.seek(offset)
+        return self.file.read(self.packet_length)
+
+    def complete(self) -> bool:
+        """All packets are in: total_frame of them, or every one up to the EOI packet"""
+        if self.total_frame and self.count >= self.total_frame:
+            return True
+        return self.eoi_packet_id is not None and self.count > self.eoi_packet_id
+
+    def packet_ids(self) -> list[int]:
+        """Received packet IDs in ascending order"""
+        return [i * 8 + bit for i, b in enumerate(self.bitmap) if b for bit in range(8) if b & (1 << bit)]
+
+    def sync(self):
+        """Flush the .bin and .map to disk, before the journal lets go of their records"""
+        if self.dirty:
+            os.fsync(self.file.fileno())
+            os.fsync(self.map_file.fileno())
+            self.dirty = False
+
+    def close(self):
+        self.sync()
+        self.file.close()
+        self.map_file.close()
+
+    @staticmethod
+    def _write_at(f, offset: int, data: bytes):
+        # os.pwrite does not exist on Windows
+        if hasattr(os, "pwrite"):
+            os.pwrite(f.fileno(), data, offset)
         else:
-            out.append(data[i])
-            i += 1
-    return bytes(out)
+            f.seek(offset)
+            f.write(data)
+
+class ImageStore:
+    """
+    Memory-bounded set of the images being received.
+
+    Only images still coming in are kept open, as a PacketStore plus their
+    NativeDecoder state. An image is finalized once it is complete (see
+    PacketStore.complete): after its last decode the decoder is freed and
+    the files are closed. Partial images idle for more than ttl seconds
+    expire, and the least recently used ones while the open images hold more
+    than max_bytes are evicted, the same way; their .bin and .map stay on
+    disk, so packets that turn up later resume them. on_close(key, state,
+    store) is called for every image closed, before its files are, and
+    on_forget(key) once a closed image drops out of the last history ones.
+    """
+
+    def __init__(self, decoder: DecodeScheduler, native: NativeDecoder | None = None,
+                 ttl: float = 600.0, max_bytes: int = 64 << 20, history: int = 1024, on_close=None, on_forget=None):
+        self.decoder = decoder
+        self.native = native
+        self.on_close = on_close
+        self.on_forget = on_forget
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.history = history
+        # key → PacketStore, least recently used first
+        self.open = OrderedDict()
+        # key → {'state', 'fragments', 'bytes_written'} of the last closed images
+        self.closed = OrderedDict()
+        self.resident = 0
+        self.stats = {'finished': 0, 'expired': 0, 'evicted': 0, 'resumed': 0, 'discarded': 0}
+
+    def __contains__(self, key) -> bool:
+        return key in self.open
+
+    def __getitem__(self, key) -> PacketStore:
+        return self.open[key]
+
+    def state(self, key) -> str | None:
+        """'finished', 'expired' or 'evicted' for a recently closed image, else None"""
+        entry = self.closed.get(key)
+        return entry and entry['state']
+
+    def get(self, key, path: str, packet_length: int) -> PacketStore:
+        """Open image of key, opened (or resumed from disk) if needed"""
+        store = self.open.get(key)
+        if store is not None:
+            self.open.move_to_end(key)
+            store.last_used = time.monotonic()
+            return store
+
+        store = PacketStore(path, packet_length)
+        if self.native:
+            # Start over from the .bin, a decoder still waiting to be freed
+            # after eviction must not be shared with the reopened image
+            self.native.drop(path)
+        for packet_id in store.packet_ids():
+            packet = store.read(packet_id)
+            # Torn writes, or a .bin from a receiver that did not check
+            # CRCs: free the slot so the next good copy is stored
+            if ssdvcodec.packet_error(packet) or (store.signature and image_signature(packet) != store.signature):
+                store.discard(packet_id)
+                self.stats['discarded'] += 1
+                continue
+            store.signature = store.signature or image_signature(packet)
+            if packet[11] & 0x04:
+                store.eoi_packet_id = packet_id
+            if self.native:
+                self.native.feed(path, packet_length, packet)
+        closed = self.closed.pop(key, None)
+        if closed is not None:
+            store.bytes_written = closed['bytes_written']
+            self.stats['resumed'] += 1
+        store.last_used = time.monotonic()
+        self.open[key] = store
+        self._account(store)
+        return store
+
+    def put(self, store: PacketStore, packet_id: int, data: bytes) -> bool:
+        """Add a packet to an open image, False for a duplicate"""
+        if not store.put(packet_id, data):
+            return False
+        if store.signature is None:
+            store.signature = image_signature(data)
+        if data[11] & 0x04:
+            store.eoi_packet_id = packet_id
+        if self.native:
+            self.native.feed(store.path, store.packet_length, data)
+        self._account(store)
+        return True
+
+    def finish(self, key):
+        """Close a complete image once its decodes are done"""
+        self._close(key, 'finished')
+
+    def expire(self, now: float | None = None):
+        """Close images idle for longer than ttl, then trim to max_bytes"""
+        now = time.monotonic() if now is None else now
+        while self.open:
+            key, store = next(iter(self.open.items()))
+            if now - store.last_used < self.ttl:
+                break
+            self._close(key, 'expired')
+        # The most recent image stays, evicting it would only reload it
+        while self.resident > self.max_bytes and len(self.open) > 1:
+            self._close(next(iter(self.open)), 'evicted')
+
+    def sync(self):
+        """PacketStore.sync() every open image"""
+        for store in self.open.values():
+            store.sync()
+
+    def close(self):
+        for store in self.open.values():
+            store.close()
+
+    def summary(self) -> list:
+        """(key, fragments, bytes_written, state) of open and recently closed images"""
+        rows = [(key, len(store), store.bytes_written, 'open') for key, store in self.open.items()]
+        rows += [(key, c['fragments'], c['bytes_written'], c['state']) for key, c in self.closed.items()]
+        # Image IDs are ints from SSDV or strings from the AX.25 dest field
+        return sorted(rows, key=lambda row: (row[0][0], str(row[0][1])))
+
+    def _account(self, store: PacketStore):
+        nbytes = len(store.bitmap) + (self.native.nbytes(store.path) if self.native else 0)
+        self.resident += nbytes - store.nbytes
+        store.nbytes = nbytes
+
+    def _close(self, key, state: str):
+        store = self.open.pop(key)
+        self.resident -= store.nbytes
+        if self.native:
+            dec = self.native.current(store.path)
+            self.decoder.after(key, lambda: self.native.drop(store.path, dec))
+        self.closed[key] = {'state': state, 'fragments': len(store), 'bytes_written': store.bytes_written}
+        while len(self.closed) > self.history:
+            old, _ = self.closed.popitem(last=False)
+            if self.on_forget:
+                self.on_forget(old)
+        self.stats[state] += 1
+        if self.on_close:
+            self.on_close(key, state, store)
+        store.close()
 
 def bytes_to_hex_preview(b: bytes, max_chars: int = 96) -> str:
     """Convert bytes to space-separated hex string, truncated if long"""
@@ -82,9 +574,27 @@ def bytes_to_hex_preview(b: bytes, max_chars: int = 96) -> str:
         return hex_str[:max_chars] + '...'
     return hex_str
 
+def ssdv_packet_error(ssdv_bytes: bytes) -> str | None:
+    """
+    Reject reason for an SSDV packet: 'bad_sync' unless it is a no-FEC
+    packet, 'bad_crc' or 'bad_header' (see ssdvcodec.packet_error); None
+    if it can be stored
+    """
+    if ssdv_bytes[0] != 0x55 or ssdv_bytes[1] != 0x67:
+        return 'bad_sync'
+    error = ssdvcodec.packet_error(ssdv_bytes)
+    return error and 'bad_' + error
+
+def image_signature(ssdv_bytes: bytes) -> bytes:
+    """
+    Header fields every packet of one image shares: type, callsign, image
+    ID, size, quality and MCU mode (the flags without the EOI bit)
+    """
+    return ssdv_bytes[1:7] + ssdv_bytes[9:11] + bytes([ssdv_bytes[11] & ~0x04 & 0xFF])
+
 def parse_ssdv_packet(ssdv_bytes: bytes, verbose: bool = False) -> dict | None:
     """
-    Validate and parse the SSDV packet.
+    Parse an SSDV packet, after ssdv_packet_error has passed it.
     """
     if ssdv_bytes[0] != 0x55 or ssdv_bytes[1] != 0x67:
         if verbose:
@@ -99,147 +609,524 @@ def parse_ssdv_packet(ssdv_bytes: bytes, verbose: bool = False) -> dict | None:
         'image_data': ssdv_bytes[0:]  
     }
 
-def main(args):
-    print(f"Connecting to Dire Wolf KISS TCP at {args.host}:{args.port} ...")
+class Receiver:
+    """
+    Shared image store for every KISS feed.
+
+    All stations hand their frames to the same Receiver, which runs on the
+    asyncio loop thread. A packet is kept the first time its (callsign,
+    image_id, packet_id) shows up, from whichever station heard it first;
+    later copies are counted as duplicates and dropped.
+    """
+
+    def __init__(self, args, output_dir: str):
+        self.args = args
+        self.output_dir = output_dir
+        self.native = None if args.ssdv_tool else NativeDecoder()
+        self.decoder = DecodeScheduler(workers=args.decoders, decode=ssdv_decoding if args.ssdv_tool else self.native)
+        # (callsign, image_id) → PacketStore of {call}_{img}_{len}bs.bin
+        self.images = ImageStore(self.decoder, self.native, ttl=args.idle_timeout, max_bytes=args.max_memory << 20,
+                                 on_close=self.image_closed, on_forget=self.image_forgotten)
+        # The .bin/.map writes reach the disk before a checkpoint says they did
+        self.journal = None if args.no_journal else journal.Journal(os.path.join(output_dir, "journal"),
+                                                                    before_checkpoint=self.images.sync)
+        self.total_valid = 0
+        self.duplicates = 0
+        # station → {'connects', 'frames', 'packets', 'duplicates'}
+        self.stations = {}
+        # (callsign, image_id) → {'packets', 'duplicates', 'first', 'last'} packet times,
+        # of the images open or in the ImageStore history
+        self.image_stats = {}
+        # reason → frames rejected for it
+        self.rejected = {}
+        self.temp = ''
+        # (callsign, image_id) → erasure.Repairer of images with repair frames
+        self.repairs = {}
+        self.recovered = 0
+        # (callsign, image_id) → missing-packet report of partial images closed
+        self.missing = {}
+
+    def station(self, label: str) -> dict:
+        if label not in self.stations:
+            self.stations[label] = {'connects': 0, 'frames': 0, 'packets': 0, 'duplicates': 0}
+        return self.stations[label]
+
+    def image_stat(self, key) -> dict:
+        if key not in self.image_stats:
+            self.image_stats[key] = {'packets': 0, 'duplicates': 0, 'first': None, 'last': None}
+        return self.image_stats[key]
+
+    def reject(self, reason: str):
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+
+    def recover(self):
+        """Replay the journal records that may not have reached the .bin files"""
+        if self.journal is None:
+            return
+        n = 0
+        for t, key, payload in self.journal.recover():
+            self.handle_frame(bytes([KISS_DATA_FRAME]) + payload, "journal", log=False)
+            n += 1
+        if n:
+            print(f"\n→ Recovered {n} packets from the journal")
+
+    def image_closed(self, key, state: str, store: PacketStore):
+        # A finished image, or one whose pass is over, has its packets safe
+        # in the .bin; the journal can let go of them
+        if self.journal and state in ('finished', 'expired'):
+            store.sync()
+            self.journal.finish(key)
+        self.repairs.pop(key, None)
+        self.write_missing(key, store)
+
+    def image_forgotten(self, key):
+        # Per-image state lives as long as the ImageStore remembers the
+        # image, so a receiver that runs for months stays bounded
+        self.image_stats.pop(key, None)
+        self.missing.pop(key, None)
+        self.decoder.forget(key)
+
+    def write_missing(self, key, store: PacketStore) -> str | None:
+        """Write the missing-packet report of an image next to its .bin (or remove it once complete)"""
+        path = os.path.splitext(store.path)[0] + ".missing"
+        report = reports.missing_report(key, store)
+        if report is None:
+            self.missing.pop(key, None)
+        else:
+            self.missing[key] = report
+        try:
+            if report is None:
+                if os.path.exists(path):
+                    os.remove(path)
+            else:
+                with open(path, "w") as f:
+                    f.write(report + "\n")
+        except OSError as e:
+            print(f"An error occurred while writing {path}: {e}")
+        return report
+
+    def checkpoint(self):
+        if self.journal and self.journal.dirty:
+            self.journal.checkpoint()
+
+    def handle_frame(self, frame: bytes, label: str = "", log: bool = True, inner: bool = False):
+        """
+        Process one KISS frame (command byte included) heard by a station;
+        inner for the packets of an aggregated frame, already counted
+        """
+        args = self.args
+        st = self.station(label)
+        st['frames'] += not inner
+
+        # Low nibble is the command, high nibble the radio channel: with
+        # several channels in direwolf.conf data frames come from all of them
+        frame_type = frame[0] & 0x0F
+        payload = frame[1:]
+        if frame_type != KISS_DATA_FRAME:
+            self.reject('not_data')
+            return
+
+        if len(payload) < MIN_PACKET_LENGTH:
+            self.reject('short')
+            if args.verbose:
+                print(f"  → Wrong payload length: {len(payload)} (expected min {MIN_PACKET_LENGTH})")
+            return
+
+        ssdv_part = payload[16:]
+        ssdv_len = len(ssdv_part)
+
+        dest_field = payload[0:7]
+        src_field = payload[7:14]
+
+        file_id = ''.join(chr(c >> 1) for c in dest_field[:6]).strip()
+        src_call = ''.join(chr(c >> 1) for c in src_field[:6]).strip()
+
+        if erasure.is_repair(ssdv_part):
+            self.handle_repair(payload, file_id, src_call, label, log)
+            return
+        if aggregate.is_aggregate(ssdv_part):
+            items = aggregate.split(ssdv_part)
+            if items is None:
+                self.reject('bad_aggregate')
+                if args.verbose:
+                    print("  → Rejected (invalid aggregated frame)")
+                return
+            # Each packet on its own, as if it had come in a frame of its own
+            for item in items:
+                self.handle_frame(frame[:1] + payload[:16] + item, label, log, inner=True)
+            return
+
+        # CRC and header checked before anything is journaled, written or decoded
+        with profiling.span("rx.parse"):
+            error = ssdv_packet_error(ssdv_part)
+            parsed = None if error else parse_ssdv_packet(ssdv_part, verbose=args.verbose)
+        if not parsed:
+            self.reject(error or 'bad_sync')
+            if args.verbose:
+                print(f"  → Rejected (invalid SSDV: {error})")
+            return
+
+        parsed['callsign'] = src_call
+        total_frame_text = ""
+        if not parsed['image_id']:
+            parsed['image_id'] = file_id[0:3]
+            try:
+                total_frame = int(file_id[3:],16)
+                total_frame_text = f"/ {total_frame}"
+            except ValueError:
+                pass
+        else:
+            total_frame = 0
+
+        key = (parsed['callsign'], parsed['image_id'])
+        was_new = key not in self.images
+
+        fname_noext = f"{parsed['callsign']}_{parsed['image_id']}_{ssdv_len}bs"
+        fname = f"{fname_noext}.bin"
+
+        if self.images.state(key) == 'finished':
+            # Late copy of a packet of an image that is already complete
+            self.duplicates += 1
+            st['duplicates'] += 1
+            self.image_stat(key)['duplicates'] += 1
+            return
+        if not was_new and self.images[key].packet_length != ssdv_len:
+            self.reject('length_mismatch')
+            if args.verbose:
+                print(f"  → Rejected (packet length {ssdv_len}, image uses {self.images[key].packet_length})")
+            return
+
+        # Opened, or picked up from the .bin/.map of an earlier run or eviction
+        store = self.images.get(key, os.path.join(self.output_dir, fname), ssdv_len)
+        if store.signature is not None and store.signature != image_signature(ssdv_part):
+            # Same callsign and image ID, but another size, quality or MCU
+            # mode: a different image, or a corruption the CRC missed
+            self.reject('conflict')
+            if args.verbose:
+                print(f"  → Rejected (header does not match the other packets of {key[0]} image {key[1]})")
+            return
+        if total_frame:
+            store.total_frame = total_frame
+
+        # Journaled ahead of the .bin write, so a crash in between loses nothing
+        if log and self.journal and parsed['packet_id'] not in store:
+            with profiling.span("rx.journal"):
+                self.journal.append(key, payload)
+
+        # Written once into its packet ID slot; a copy from another station
+        # (or a repeat from the same one) finds the slot taken
+        image_st = self.image_stat(key)
+        with profiling.span("rx.write"):
+            stored = self.images.put(store, parsed['packet_id'], parsed['image_data'])
+        if not stored:
+            self.duplicates += 1
+            st['duplicates'] += 1
+            image_st['duplicates'] += 1
+            if args.verbose:
+                print(f"  → Duplicate packet {parsed['packet_id']} of {fname} from {label}")
+            return
+        st['packets'] += 1
+        image_st['packets'] += 1
+        image_st['last'] = time.monotonic()
+        if image_st['first'] is None:
+            image_st['first'] = image_st['last']
+
+        if was_new:
+            if not args.simple:
+               print(f"\n→ New from: {parsed['callsign']}, image: {parsed['image_id']} ({ssdv_len} byte/frags)")
+            else:
+               print(f"\n→ New from: {parsed['callsign']}, image: {parsed['image_id']} ({ssdv_len} byte/frags)", end="")
+
+        if args.verbose:
+            print(f"\nReceived SSDV candidate ({ssdv_len}) byte from {label}:")
+            print("" + bytes_to_hex_preview(ssdv_part, 1000))
 
+        self.total_valid += 1
+        if not args.simple:
+            print(f"\r{parsed['callsign']:<7} | Img {parsed['image_id']:<4} | Packet {parsed['packet_id']:5d}"
+                  f" | {(str(len(store)) + str(total_frame_text)):>7} frags | → {fname}")
+        else:
+            if self.temp != parsed['image_id']:
+                print()
+            if total_frame:
+                progress = show_progress(len(store), total_frame)
+            else:
+                progress = f"| {len(store):4d} frags"
+
+            print(f"\r{parsed['callsign']:<7} | Img {parsed['image_id']:<4} | Packet {parsed['packet_id']:5d} {progress}", end="")
+            self.temp = parsed['image_id']
+
+        self.decoder.submit(key, ssdv_len, os.path.join(self.output_dir, fname), os.path.join(self.output_dir, f"{fname_noext}.jpg"))
+
+        if store.complete():
+            self.images.finish(key)
+            print(f"\n→ Complete: {parsed['callsign']}, image: {parsed['image_id']} ({len(store)} frags) → {fname_noext}.jpg")
+        elif key in self.repairs:
+            first = self.repairs[key].group_of(parsed['packet_id'])
+            if first is not None:
+                self.repair(key, store, first, payload[:16])
+        self.images.expire()
+
+    def handle_repair(self, payload: bytes, file_id: str, src_call: str, label: str, log: bool):
+        """Keep a repair frame and rebuild what its group now allows"""
+        repair = erasure.parse_repair(payload[16:])
+        if not repair:
+            self.reject('bad_repair')
+            if self.args.verbose:
+                print("  → Rejected (invalid repair frame)")
+            return
+        key = (src_call, repair['image_id'] or file_id[0:3])
+        length = repair['packet_length']
+        if self.images.state(key) == 'finished':
+            return
+        if key in self.images and self.images[key].packet_length != length:
+            self.reject('length_mismatch')
+            if self.args.verbose:
+                print(f"  → Rejected (repair frame for packet length {length}, image uses {self.images[key].packet_length})")
+            return
+        store = self.images.get(key, os.path.join(self.output_dir, f"{key[0]}_{key[1]}_{length}bs.bin"), length)
+        if not repair['image_id']:
+            try:
+                store.total_frame = int(file_id[3:], 16)
+            except ValueError:
+                pass
+        if log and self.journal:
+            self.journal.append(key, payload)
+        first = self.repairs.setdefault(key, erasure.Repairer()).add(repair)
+        self.repair(key, store, first, payload[:16])
+
+    def repair(self, key, store: PacketStore, first: int, header: bytes):
+        """Feed the packets rebuilt for a group back in, as heard by a "repair" station"""
+        for packet in self.repairs[key].solve(first, store.__contains__, store.read):
+            self.recovered += 1
+            self.handle_frame(bytes([KISS_DATA_FRAME]) + header + packet, "repair", log=False)
+
+    def close(self):
+        """Finish outstanding decodes and print the summary"""
+        print(f"\nFinished. Processed {self.total_valid} valid SSDV packets ({self.duplicates} duplicates dropped).")
+        if self.recovered:
+            print(f"Rebuilt {self.recovered} lost packets from repair frames.")
+        if self.rejected:
+            print(f"Rejected {sum(self.rejected.values())} frames: "
+                  + ", ".join(f"{n} {reason}" for reason, n in sorted(self.rejected.items())) + ".")
+        if self.decoder.backlog():
+            print("Waiting for SSDV decoding to finish...")
+        self.decoder.close()
+        for key, store in self.images.open.items():
+            self.write_missing(key, store)
+        self.images.close()
+        if self.journal:
+            self.journal.close()
+
+        if len(self.stations) > 1:
+            print("\nStations:")
+            for label, st in sorted(self.stations.items()):
+                print(f"  {label:<21} →  {st['packets']} first, {st['duplicates']} duplicate, {st['frames']} frames, {st['connects']} connects")
+
+        if self.total_valid > 0:
+            st = self.images.stats
+            print(f"\nImages: {st['finished']} complete, {st['expired']} expired and {st['evicted']} evicted while partial,"
+                  f" {st['resumed']} resumed" + (f", {st['discarded']} corrupt stored packets discarded" if st['discarded'] else ""))
+            if self.journal:
+                print(f"Journal: {self.journal.appended} packets appended, {self.journal.nbytes()} bytes in {len(self.journal.segments)} segments")
+            print(f"\nFiles created in {os.path.basename(self.output_dir)}/:")
+            for (call, img), fragments, bytes_written, state in self.images.summary():
+                print(f"  {call}_{img}  →  {fragments} fragments, {bytes_written} bytes written ({state})")
+                st = self.decoder.stats.get((call, img))
+                if st and st['runs']:
+                    print(f"      {st['runs']} decodes ({st['coalesced']} coalesced, {st['failed']} failed),"
+                          f" latency last {st['last'] * 1000:.0f} ms / avg {st['total'] / st['runs'] * 1000:.0f} ms / max {st['max'] * 1000:.0f} ms")
+            if self.missing:
+                print("\nMissing packets, for tx.py --resend (also in the .missing files):")
+                for key, report in sorted(self.missing.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+                    print(f"  {report}")
+
+async def kiss_feed(receiver: Receiver, host: str, port: int, reconnect: bool = True, max_backoff: float = 30.0):
+    """
+    Read KISS frames from one Dire Wolf TCP port into the receiver.
+
+    Lost or refused connections are retried with exponential backoff, from
+    1 s up to max_backoff; the wait resets once a connection is made.
+    """
+    label = f"{host}:{port}"
+    st = receiver.station(label)
+    delay = 1.0
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError as e:
+            print(f"[{label}] Connection failed: {e}", file=sys.stderr)
+        else:
+            print(f"[{label}] Connected.")
+            st['connects'] += 1
+            delay = 1.0
+            # A fresh deframer, a half frame from the old connection is lost
+            deframer = KissDeframer()
+            try:
+                while True:
+                    chunk = await reader.read(1024)
+                    if not chunk:
+                        print(f"[{label}] Server closed connection.")
+                        break
+                    with profiling.span("rx.deframe", bytes=len(chunk)):
+                        frames = deframer.feed(chunk)
+                    for frame in frames:
+                        with profiling.span("rx.frame"):
+                            receiver.handle_frame(frame, label)
+            except OSError as e:
+                print(f"[{label}] Socket error: {e}", file=sys.stderr)
+            finally:
+                writer.close()
+
+        if not reconnect:
+            return
+        print(f"[{label}] Reconnecting in {delay:.0f} s ...")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_backoff)
+
+async def housekeeping(receiver: Receiver, interval: float = 10.0):
+    """Close idle images and checkpoint the journal, even while no packets arrive"""
+    while True:
+        await asyncio.sleep(interval)
+        receiver.images.expire()
+        receiver.checkpoint()
+
+async def receive(receiver: Receiver, stations: list, reconnect: bool = True):
+    """Run one kiss_feed per station until all of them have ended"""
+    sweeper = asyncio.create_task(housekeeping(receiver))
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.connect((args.host, args.port))
-        print("Connected.")
-    except Exception as e:
-        print(f"Connection failed: {e}", file=sys.stderr)
-        sys.exit(1)
+        await asyncio.gather(*(kiss_feed(receiver, host, port, reconnect) for host, port in stations))
+    finally:
+        sweeper.cancel()
+
+def is_wav(path: str) -> bool:
+    if os.path.isdir(path):
+        return False
+    with open(path, "rb") as f:
+        return f.read(4) == b'RIFF'
+
+def replay_frames(path: str, workers: int | None = None):
+    """
+    Yield (t, frame) from a recorded pass: a raw KISS capture (the TCP byte
+    stream, e.g. saved with nc), an audio recording of the pass (WAV,
+    demodulated with afsk.py on workers processes) or an rx.py journal
+    directory or segment. t is the receive time, seconds into the
+    recording for WAVs and None for KISS captures as they carry no timing.
+    """
+    if is_wav(path):
+        # NumPy is only needed here
+        import afsk
+        for t, frame in afsk.decode_wav(path, workers=workers):
+            yield t, bytes([KISS_DATA_FRAME]) + frame
+        return
+    if not os.path.isdir(path):
+        with open(path, "rb") as f:
+            if f.read(1) == KISS_FEND:
+                deframer = KissDeframer()
+                f.seek(0)
+                while chunk := f.read(1 << 16):
+                    with profiling.span("rx.deframe", bytes=len(chunk)):
+                        frames = deframer.feed(chunk)
+                    for frame in frames:
+                        yield None, frame
+                return
+    if not journal.is_journal(path):
+        raise ValueError("not a KISS capture, WAV recording or rx.py journal directory/segment")
+    for t, key, payload in journal.replay(path):
+        yield t, bytes([KISS_DATA_FRAME]) + payload
+
+def replay(receiver: Receiver, path: str, rate: float | None = None, workers: int | None = None) -> tuple[int, int]:
+    """
+    Feed a recorded pass through the receiver, as fast as possible or, with
+    rate, at rate times the recorded speed; return (frames, bytes)
+    """
+    frames = nbytes = 0
+    start = t0 = None
+    for t, frame in replay_frames(path, workers):
+        if rate and t is not None:
+            if t0 is None:
+                start, t0 = time.monotonic(), t
+            delay = start + (t - t0) / rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        with profiling.span("rx.frame"):
+            receiver.handle_frame(frame, "replay")
+        frames += 1
+        nbytes += len(frame)
+    if rate and t0 is None and frames:
+        print("\n(the KISS capture has no timestamps, --rate was ignored)")
+    return frames, nbytes
+
+def replay_stats(receiver: Receiver, frames: int, nbytes: int, ingest: float, total: float):
+    print(f"\nReplay: {frames} frames, {nbytes / 1024:.0f} kB in {ingest:.2f} s"
+          f" → {frames / max(ingest, 1e-9):.0f} frames/s, {nbytes / 1024 / max(ingest, 1e-9):.0f} kB/s"
+          f" ({total:.2f} s until the last decode)")
+    first = sorted(st['first'] for st in receiver.decoder.stats.values() if st['first'] is not None)
+    if first:
+        print(f"Time to first JPEG: min {first[0] * 1000:.0f} ms / median {first[len(first) // 2] * 1000:.0f} ms"
+              f" / max {first[-1] * 1000:.0f} ms over {len(first)} images")
+
+def main(args):
+    stations = args.station or [(args.host, args.port)]
+    if args.replay:
+        print(f"Replaying {args.replay} ...")
+        # The recording already is a journal of this pass
+        args.no_journal = True
+    else:
+        for host, port in stations:
+            print(f"Connecting to Dire Wolf KISS TCP at {host}:{port} ...")
 
     # output/ folder next to script
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_dir = os.path.join(script_dir, "output")
+    output_dir = args.output or os.path.join(script_dir, "output")
     os.makedirs(output_dir, exist_ok=True)
 
     print(f"Decode SSDV image fragments to: {output_dir}/")
     print(f"Expecting 16-byte AX25 (IL2P) for ID + min {MIN_PACKET_LENGTH - 16}-byte for SSDV")
 
-    # (callsign, image_id) → {packet_id: image_data (186 bytes)}
-    images = defaultdict(dict)
-    total_valid = 0
-
-    packet_buf = bytearray()
-    in_frame = False
-    
-    temp = ''
-
-    while True:
+    receiver = Receiver(args, output_dir)
+    if args.metrics:
+        host, port = args.metrics
         try:
-            chunk = sock.recv(1024)
+            metrics.serve(metrics.Metrics(receiver), host, port)
+            print(f"Metrics at http://{host}:{port}/metrics")
+        except OSError as e:
+            print(f"Cannot serve metrics on {host}:{port}: {e}", file=sys.stderr)
+    if args.replay:
+        t0 = time.monotonic()
+        frames = nbytes = 0
+        wav = done = failed = False
+        try:
+            wav = is_wav(args.replay)
+            frames, nbytes = replay(receiver, args.replay, args.rate, args.workers)
+            done = True
         except KeyboardInterrupt:
             print("\nInterrupted by user.")
-            break
-        except Exception as e:
-            print(f"Socket error: {e}", file=sys.stderr)
-            break
-
-        if not chunk:
-            print("Server closed connection.")
-            break
-
-        for byte in chunk:
-            if byte == 0xC0:
-                if in_frame:
-                    # Frame complete
-                    if len(packet_buf) >= 1:
-                        frame_type = packet_buf[0]
-                        payload = kiss_unescape(packet_buf[1:])
-
-                        if frame_type == KISS_DATA_FRAME:
-                            if len(payload) >= MIN_PACKET_LENGTH:
-                                ssdv_part = payload[16:]
-                                ssdv_len = len(ssdv_part)
-
-                                dest_field = payload[0:7]
-                                src_field = payload[7:14]
-                                
-                                file_id = ''.join(chr(c >> 1) for c in dest_field[:6]).strip()
-                                src_call = ''.join(chr(c >> 1) for c in src_field[:6]).strip()
-
-                                parsed = parse_ssdv_packet(ssdv_part, verbose=args.verbose)
-                                                                
-                                if parsed:
-                                    parsed['callsign'] = src_call
-                                    total_frame_text = ""
-                                    if not parsed['image_id']:
-                                        parsed['image_id'] = file_id[0:3]
-                                        try:
-                                            total_frame = int(file_id[3:],16)
-                                            total_frame_text = f"/ {total_frame}"
-                                        except ValueError:
-                                            pass 
-                                    else:
-                                        total_frame = 0 
-
-                                    key = (parsed['callsign'], parsed['image_id'])
-                                    was_new = len(images[key]) == 0
-
-                                    images[key][parsed['packet_id']] = parsed['image_data']
-                                    
-                                    fname_noext = f"{parsed['callsign']}_{parsed['image_id']}_{ssdv_len}bs"
-                                    fname = f"{fname_noext}.bin"
-                                    
-                                    path = os.path.join(output_dir, fname)
-
-                                    # Write in packet ID order
-                                    with open(path, "wb") as f:
-                                        for pid in sorted(images[key]):
-                                            f.write(images[key][pid])
-                                            
-                                    if was_new:
-                                        if not args.simple:
-                                           print(f"\n→ New from: {parsed['callsign']}, image: {parsed['image_id']} ({ssdv_len} byte/frags)")
-                                        else:
-                                           print(f"\n→ New from: {parsed['callsign']}, image: {parsed['image_id']} ({ssdv_len} byte/frags)", end="") 
- 
-                                    if args.verbose:
-                                        print(f"\nReceived SSDV candidate ({ssdv_len}) byte:")
-                                        print("" + bytes_to_hex_preview(ssdv_part, 1000))
-
-                                    total_valid += 1
-                                    if not args.simple:
-                                        print(f"\r{parsed['callsign']:<7} | Img {parsed['image_id']:<4} | Packet {parsed['packet_id']:5d}"
-                                              f" | {(str(len(images[key])) + str(total_frame_text)):>7} frags | → {fname}")
-                                    else:
-                                        if temp != parsed['image_id']:
-                                            print()
-                                        if total_frame:    
-                                            progress = show_progress(len(images[key]), total_frame)
-                                        else:
-                                            progress = f"| {len(images[key]):4d} frags"  
-                                
-                                        print(f"\r{parsed['callsign']:<7} | Img {parsed['image_id']:<4} | Packet {parsed['packet_id']:5d} {progress}", end="")           
-                                        temp = parsed['image_id']
-                                        
-                                    ssdv_process = ssdv_decoding(ssdv_len,os.path.join(output_dir, fname),os.path.join(output_dir, f"{fname_noext}.jpg"))
-
-                                else:
-                                    if args.verbose:
-                                        print("  → Rejected (invalid SSDV)")
-
-                            else:
-                                if args.verbose:
-                                    print(f"  → Wrong payload length: {len(payload)} (expected min {MIN_PACKET_LENGTH})")
-
-                    packet_buf = bytearray()
-                    in_frame = False
-                else:
-                    in_frame = True
-                    packet_buf = bytearray()
-            elif in_frame:
-                packet_buf.append(byte)
-    #print()
-    sock.close()
-    print(f"\nFinished. Processed {total_valid} valid SSDV packets.")
-
-    if total_valid > 0:
-        print("\nFiles created in output/:")
-        for (call, img), frags in sorted(images.items()):
-            print(f"  {call}_{img}  →  {len(frags)} fragments")
+        except (OSError, ValueError, wave.Error) as e:
+            print(f"Cannot replay {args.replay}: {e}", file=sys.stderr)
+            failed = True
+        except ImportError as e:
+            print(f"Cannot replay {args.replay}: WAV recordings need numpy (pip install numpy): {e}", file=sys.stderr)
+            failed = True
+        ingest = time.monotonic() - t0
+        receiver.close()
+        replay_stats(receiver, frames, nbytes, ingest, time.monotonic() - t0)
+        if wav and done and not args.rate:
+            import afsk
+            seconds = afsk.wav_seconds(args.replay)
+            workers = args.workers or os.cpu_count()
+            print(f"Demodulated {seconds:.1f} s of audio in {ingest:.2f} s → {seconds / max(ingest, 1e-9):.0f}× real time"
+                  f" on {workers} process{'es' if workers > 1 else ''}")
+        if failed:
+            sys.exit(1)
+        return
+
+    receiver.recover()
+    try:
+        asyncio.run(receive(receiver, stations, reconnect=not args.no_reconnect))
+    except KeyboardInterrupt:
+        print("\nInterrupted by user.")
+    receiver.close()
 
 if __name__ == "__main__":
     config = configparser.ConfigParser()
@@ -251,10 +1138,26 @@ if __name__ == "__main__":
     )
     parser.add_argument("--host", default="127.0.0.1", help="Dire Wolf host (default: 127.0.0.1)")
     parser.add_argument("--port", type=int, default=8001, help="Dire Wolf KISS TCP port (default: 8001)")
+    parser.add_argument("--station", action="append", metavar="HOST:PORT", type=lambda t: reports.parse_station(t, 8001),
+                        help="KISS TCP endpoint to receive from, repeat for several stations (default: --host/--port)")
+    parser.add_argument("--no-reconnect", action="store_true", help="Stop a feed when its connection fails or closes instead of retrying")
+    parser.add_argument("--replay", metavar="FILE", help="Process a recorded pass (KISS capture, WAV recording, or journal directory/segment) instead of receiving")
+    parser.add_argument("--rate", type=float, help="With --replay, play at this multiple of the recorded speed (default: as fast as possible)")
+    parser.add_argument("--workers", type=int, help="With a WAV --replay, processes demodulating it (default: one per CPU)")
+    parser.add_argument("--metrics", nargs="?", const=str(metrics.DEFAULT_PORT), type=metrics.parse_address, metavar="[HOST:]PORT",
+                        help=f"Serve live Prometheus metrics over HTTP (default: 127.0.0.1:{metrics.DEFAULT_PORT} when given without a value)")
+    profiling.add_arguments(parser)
+    parser.add_argument("-o", "--output", help="Directory for the .bin/.jpg files (default: output/ next to rx.py)")
     parser.add_argument("-v", "--verbose", action="store_true", help="Print hex of each received SSDV candidate + parsing details")
+    parser.add_argument("--decoders", type=int, default=2, help="Max ssdv decodes running at once (default: 2)")
+    parser.add_argument("--idle-timeout", type=float, default=600, help="Close partial images idle for this many seconds (default: 600)")
+    parser.add_argument("--max-memory", type=int, default=64, help="Memory cap for open images in MB, least recently used go first (default: 64)")
+    parser.add_argument("--no-journal", action="store_true", help="Do not keep the crash-safe packet journal in output/journal")
+    parser.add_argument("--ssdv-tool", action="store_true", help="Decode with the external ssdv program instead of the built-in decoder")
     parser.add_argument("-s", "--simple", action="store_true", help="Simple UIX with eye-catching progress bar for certain fragments")
     parser.add_argument("--version", action='version', version=f"ssdv2sat-%(prog)s v{VERSION} by hobisatelit <https://github.com/hobisatelit>", help="Show the version of the application")
     args = parser.parse_args()
+    profiling.start_from_args(args, "rx")
 
     try:
         main(args)
@@ -0,0 +1,1008 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+# SSDV doc: https://ukhas.org.uk/doku.php?id=guides:ssdv
+
+"""
+Pure-Python SSDV encoder and decoder.
+
+encode() turns a baseline JPEG into the same packets as `ssdv -e -n`.
+
+Decoder builds the same JPEG as `ssdv -d` for the same set of packets.
+Packets can be fed one at a time and in any order: each run of consecutive
+packets is decoded once into a segment, a new packet only extends or joins
+the segments next to it, and get_jpeg() stitches the segments together with
+the same filler MCUs ssdv uses for lost packets.
+
+SSDV packet (no-FEC type, as made by img2ssdv.py with ssdv -n):
+  offset  0    : sync         0x55
+  offset  1    : packet type  0x66 normal (with FEC) / 0x67 no-FEC
+  offset  2-5  : callsign     base-40 encoded
+  offset  6    : image ID
+  offset  7-8  : packet ID    big-endian
+  offset  9    : width / 16
+  offset 10    : height / 16
+  offset 11    : flags        quality ^ 4 (bits 3-5), EOI (bit 2), MCU mode (bits 0-1)
+  offset 12    : offset of the first MCU starting in this packet (0xFF: none)
+  offset 13-14 : index of that MCU (0xFFFF: none)
+  offset 15-   : entropy coded JPEG data, then CRC32 (+ 32 bytes FEC for type 0x66)
+
+Usage:
+    python ssdvcodec.py -e -l 128 -c ABCDEF -q 4 input.jpg output.bin
+    python ssdvcodec.py -d -l 128 input.bin output.jpg
+"""
+VERSION = '0.02'
+
+import argparse
+import sys
+import zlib
+
+SSDV_SYNC = 0x55
+SSDV_TYPE_NORMAL = 0x66
+SSDV_TYPE_NOFEC = 0x67
+SSDV_HEADER_SIZE = 15
+SSDV_CRC_SIZE = 4
+SSDV_FEC_SIZE = 32
+SSDV_NO_MCU = 0xFFFF
+
+# Quality level 0-7 → libjpeg style scale factor for the base tables below
+QUALITY_SCALE = (5000, 357, 172, 116, 100, 58, 28, 0)
+
+# Base quantisation tables used by ssdv (zigzag order), i.e. quality level 4
+DQT_Y = bytes([
+    16, 12, 12, 14, 12, 10, 16, 14, 14, 14, 18, 18, 16, 20, 24, 40,
+    26, 24, 22, 22, 24, 50, 36, 38, 30, 40, 58, 52, 62, 60, 58, 52,
+    56, 56, 64, 72, 92, 78, 64, 68, 88, 70, 56, 56, 80, 110, 82, 88,
+    96, 98, 104, 104, 104, 62, 78, 114, 122, 112, 100, 120, 92, 102, 104, 100,
+])
+DQT_C = bytes([18, 18, 18, 22, 22, 22, 48, 26, 26, 48, 100, 66, 56, 66] + [100] * 50)
+
+# Standard huffman tables (JPEG Annex K) as (code counts per length, symbols)
+DHT_DC_Y = (bytes([0, 1, 5, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0]), bytes(range(12)))
+DHT_DC_C = (bytes([0, 3, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0]), bytes(range(12)))
+DHT_AC_Y = (bytes([0, 2, 1, 3, 3, 2, 4, 3, 5, 5, 4, 4, 0, 0, 1, 0x7D]), bytes.fromhex(
+    "01020300041105122131410613516107227114328191a1082342b1c11552d1f0"
+    "2433627282090a161718191a25262728292a3435363738393a43444546474849"
+    "4a535455565758595a636465666768696a737475767778797a83848586878889"
+    "8a92939495969798999aa2a3a4a5a6a7a8a9aab2b3b4b5b6b7b8b9bac2c3c4c5"
+    "c6c7c8c9cad2d3d4d5d6d7d8d9dae1e2e3e4e5e6e7e8e9eaf1f2f3f4f5f6f7f8"
+    "f9fa"))
+DHT_AC_C = (bytes([0, 2, 1, 2, 4, 4, 3, 4, 7, 5, 4, 4, 0, 1, 2, 0x77]), bytes.fromhex(
+    "000102031104052131061241510761711322328108144291a1b1c109233352f0"
+    "156272d10a162434e125f11718191a262728292a35363738393a434445464748"
+    "494a535455565758595a636465666768696a737475767778797a828384858687"
+    "88898a92939495969798999aa2a3a4a5a6a7a8a9aab2b3b4b5b6b7b8b9bac2c3"
+    "c4c5c6c7c8c9cad2d3d4d5d6d7d8d9dae2e3e4e5e6e7e8e9eaf2f3f4f5f6f7f8"
+    "f9fa"))
+
+# MCU mode (flags bits 0-1) → (Y sampling factors byte, Y blocks per MCU)
+MCU_MODES = {0: (0x22, 4), 1: (0x12, 2), 2: (0x21, 2), 3: (0x11, 1)}
+
+JFIF_APP0 = bytes([0x4A, 0x46, 0x49, 0x46, 0x00, 0x01, 0x01, 0x01, 0x00, 0x48, 0x00, 0x48, 0x00, 0x00])
+JPEG_SOS = bytes([0x03, 0x01, 0x00, 0x02, 0x11, 0x03, 0x11, 0x00, 0x3F, 0x00])
+
+
+def encode_callsign(callsign: str) -> int:
+    """Base-40 encode up to 6 characters of a callsign"""
+    x = 0
+    for c in reversed(callsign[:6].upper()):
+        x *= 40
+        if 'A' <= c <= 'Z':
+            x += ord(c) - ord('A') + 14
+        elif '0' <= c <= '9':
+            x += ord(c) - ord('0') + 1
+    return x
+
+
+def decode_callsign(code: int) -> str:
+    """Inverse of encode_callsign"""
+    if code > 0xF423FFFF:
+        return ""
+    out = ""
+    while code:
+        s = code % 40
+        if s == 0:
+            out += "-"
+        elif s < 11:
+            out += chr(ord('0') + s - 1)
+        elif s < 14:
+            out += "-"
+        else:
+            out += chr(ord('A') + s - 14)
+        code //= 40
+    return out
+
+
+def quality_dqt(table: bytes, quality: int) -> bytes:
+    """Scale a base quantisation table to an ssdv quality level (0-7)"""
+    scale = QUALITY_SCALE[min(max(quality, 0), 7)]
+    return bytes(min(255, max(1, (v * scale + 50) // 100)) for v in table)
+
+
+def payload_size(packet_length: int, packet_type: int = SSDV_TYPE_NOFEC) -> int:
+    """Entropy coded bytes carried by one packet"""
+    size = packet_length - SSDV_HEADER_SIZE - SSDV_CRC_SIZE
+    if packet_type == SSDV_TYPE_NORMAL:
+        size -= SSDV_FEC_SIZE
+    return size
+
+
+def parse_header(packet: bytes) -> dict | None:
+    """Parse the 15-byte SSDV header, None if sync or type is wrong"""
+    if len(packet) < SSDV_HEADER_SIZE or packet[0] != SSDV_SYNC:
+        return None
+    if packet[1] not in (SSDV_TYPE_NORMAL, SSDV_TYPE_NOFEC):
+        return None
+    flags = packet[11]
+    return {
+        'type': packet[1],
+        'callsign': decode_callsign(int.from_bytes(packet[2:6], 'big')),
+        'image_id': packet[6],
+        'packet_id': (packet[7] << 8) | packet[8],
+        'width': packet[9] << 4,
+        'height': packet[10] << 4,
+        'quality': ((flags >> 3) & 7) ^ 4,
+        'eoi': bool(flags & 0x04),
+        'mcu_mode': flags & 0x03,
+        'mcu_offset': packet[12],
+        'mcu_id': (packet[13] << 8) | packet[14],
+    }
+
+
+def check_crc(packet: bytes, packet_type: int | None = None) -> bool:
+    """True if the CRC32 after the payload matches"""
+    if packet_type is None:
+        packet_type = packet[1]
+    end = SSDV_HEADER_SIZE + payload_size(len(packet), packet_type)
+    if end < SSDV_HEADER_SIZE:
+        return False
+    return zlib.crc32(packet[1:end]) == int.from_bytes(packet[end:end + SSDV_CRC_SIZE], 'big')
+
+
+def packet_error(packet: bytes) -> str | None:
+    """
+    Why packet is not a valid SSDV packet, None if it is: 'sync', 'type',
+    'crc', or 'header' for a zero image size or an MCU offset or index that
+    does not fit the packet or the image. Works on the raw bytes, without
+    parse_header, as rx.py checks every packet it hears.
+    """
+    if len(packet) < SSDV_HEADER_SIZE + SSDV_CRC_SIZE or packet[0] != SSDV_SYNC:
+        return 'sync'
+    packet_type = packet[1]
+    if packet_type != SSDV_TYPE_NOFEC and packet_type != SSDV_TYPE_NORMAL:
+        return 'type'
+    if not check_crc(packet, packet_type):
+        return 'crc'
+    width, height = packet[9], packet[10]
+    if not width or not height:
+        return 'header'
+    offset, mcu_id = packet[12], (packet[13] << 8) | packet[14]
+    if mcu_id == SSDV_NO_MCU:
+        return 'header' if offset != 0xFF else None
+    mcu_count = width * height * (4 // MCU_MODES[packet[11] & 0x03][1])
+    if offset >= payload_size(len(packet), packet_type) or mcu_id >= mcu_count:
+        return 'header'
+    return None
+
+
+def _huffman_codes(dht) -> dict:
+    """symbol → (code, length) for a DHT given as (counts, symbols)"""
+    bits, symbols = dht
+    codes = {}
+    code = 0
+    k = 0
+    for length in range(1, 17):
+        for _ in range(bits[length - 1]):
+            codes[symbols[k]] = (code, length)
+            code += 1
+            k += 1
+        code <<= 1
+    return codes
+
+
+def _huffman_lookup(codes: dict) -> list:
+    """16-bit peek → (length << 8) | symbol, 0 where no code matches"""
+    table = [0] * 65536
+    for symbol, (code, length) in codes.items():
+        shift = 16 - length
+        table[code << shift:(code + 1) << shift] = [(length << 8) | symbol] * (1 << shift)
+    return table
+
+
+# [component > 0] → codes / lookup tables
+DC_CODES = (_huffman_codes(DHT_DC_Y), _huffman_codes(DHT_DC_C))
+AC_CODES = (_huffman_codes(DHT_AC_Y), _huffman_codes(DHT_AC_C))
+_DC_LOOKUP = None
+_AC_LOOKUP = None
+
+
+def _lookups():
+    global _DC_LOOKUP, _AC_LOOKUP
+    if _DC_LOOKUP is None:
+        _DC_LOOKUP = tuple(_huffman_lookup(c) for c in DC_CODES)
+        _AC_LOOKUP = tuple(_huffman_lookup(c) for c in AC_CODES)
+    return _DC_LOOKUP, _AC_LOOKUP
+
+
+def encode_int(value: int) -> tuple[int, int]:
+    """JPEG magnitude coding: value → (bits, size)"""
+    if value == 0:
+        return 0, 0
+    size = abs(value).bit_length()
+    if value < 0:
+        value += (1 << size) - 1
+    return value, size
+
+
+def dc_code(component: int, diff: int) -> tuple[int, int]:
+    """Huffman code + magnitude bits for a DC difference, as (bits, length)"""
+    bits, size = encode_int(max(-2047, min(2047, diff)))
+    code, length = DC_CODES[component > 0][size]
+    return (code << size) | bits, length + size
+
+
+class BitWriter:
+    """MSB-first bit writer into a bytearray"""
+
+    def __init__(self):
+        self.out = bytearray()
+        self.acc = 0
+        self.n = 0
+
+    def write(self, bits: int, length: int):
+        if not length:
+            return
+        acc = (self.acc << length) | bits
+        n = self.n + length
+        rem = n & 7
+        if n >= 8:
+            self.out += (acc >> rem).to_bytes(n >> 3, 'big')
+            acc &= (1 << rem) - 1
+        self.acc = acc
+        self.n = rem
+
+    def pad(self):
+        """Fill up the last byte with 1 bits, as JPEG expects"""
+        if self.n:
+            self.write((1 << (8 - self.n)) - 1, 8 - self.n)
+
+
+def _bit_slice(buf, start: int, end: int) -> int:
+    """Bits [start, end) of buf as an integer"""
+    if end <= start:
+        return 0
+    chunk = int.from_bytes(buf[start >> 3:(end + 7) >> 3], 'big')
+    return (chunk >> ((8 - (end & 7)) & 7)) & ((1 << (end - start)) - 1)
+
+
+class _Segment:
+    """Decoder state for one run of consecutive packets"""
+
+    def __init__(self, dec, first: int):
+        self.dec = dec
+        self.first = first          # first packet ID in the run
+        self.last = first - 1       # last packet ID in the run
+        self.start_pid = None       # packet where decoding started (None: no MCU start seen)
+        self.start_mcu = None
+        self.buf = bytearray()      # entropy data fed since start_pid
+        self.pos = 0                # bits of buf consumed
+        self.copy_from = 0          # start of the bits not yet moved to parts
+        # Output: (bits, length) tuples and (None, component, dc) holes for the
+        # absolute DC values that need the previous segment to become a diff
+        self.parts = []
+        self.dc = [None, None, None]
+        self.mcu_id = 0
+        self.mcupart = 0
+        self.acpart = 0
+        self.reset_mcu = None       # MCU whose DC values are absolute
+        self.eoi = False
+
+    def start(self, pid: int, mcu_id: int, data: bytes):
+        """Begin decoding at the MCU that starts `data`"""
+        self.start_pid = pid
+        self.start_mcu = mcu_id
+        self.mcu_id = mcu_id
+        self.reset_mcu = mcu_id
+        self.append(data)
+
+    def feed(self, data: bytes, offset: int = 0xFF, mark: int = SSDV_NO_MCU):
+        """Append one packet's entropy bytes, `offset`/`mark` from its header"""
+        if mark != SSDV_NO_MCU and offset < len(data):
+            self.append(data[:offset])
+            self.restart(mark)
+            data = data[offset:]
+        self.append(data)
+
+    def append(self, data: bytes):
+        if not self.eoi:
+            self.buf += data
+            self._run()
+
+    def restart(self, mark: int):
+        """
+        Like ssdv, on reaching the MCU marked in a packet header drop the
+        padding bits left over and treat that MCU's DC values as absolute
+        """
+        if not self.eoi:
+            self._flush()
+            self.pos = self.copy_from = len(self.buf) << 3
+            self.reset_mcu = mark
+
+    def _flush(self):
+        if self.pos > self.copy_from:
+            self.parts.append((_bit_slice(self.buf, self.copy_from, self.pos), self.pos - self.copy_from))
+        self.copy_from = self.pos
+
+    def _run(self):
+        dc_lookup, ac_lookup = _lookups()
+        ycparts = self.dec.ycparts
+        mcu_count = self.dec.mcu_count
+        buf = self.buf
+        nbits = len(buf) << 3
+        pos = self.pos
+        mcu_id, mcupart, acpart = self.mcu_id, self.mcupart, self.acpart
+        dc = self.dc
+
+        while True:
+            comp = 0 if mcupart < ycparts else mcupart - ycparts + 1
+            i = pos >> 3
+            window = int.from_bytes(buf[i:i + 5], 'big')
+            if nbits - (i << 3) < 40:
+                window <<= 40 - (nbits - (i << 3))
+            shift = 40 - (pos & 7)
+
+            if acpart == 0:
+                entry = dc_lookup[comp > 0][(window >> (shift - 16)) & 0xFFFF]
+                length = entry >> 8
+                size = entry & 0xFF
+                if not length or size > 11:
+                    break
+                if pos + length + size > nbits:
+                    break
+                value = (window >> (shift - length - size)) & ((1 << size) - 1)
+                if size and value < (1 << (size - 1)):
+                    value -= (1 << size) - 1
+
+                if mcu_id == self.reset_mcu and (mcupart == 0 or mcupart >= ycparts):
+                    # Absolute DC at the first MCU of a packet, ssdv writes
+                    # it as a difference from the previous block
+                    self.pos = pos
+                    self._flush()
+                    if dc[comp] is None:
+                        self.parts.append((None, comp, value))
+                    else:
+                        self.parts.append(dc_code(comp, value - dc[comp]))
+                    dc[comp] = value
+                    pos += length + size
+                    self.copy_from = pos
+                else:
+                    if dc[comp] is not None:
+                        dc[comp] += value
+                    pos += length + size
+                acpart = 1
+            else:
+                entry = ac_lookup[comp > 0][(window >> (shift - 16)) & 0xFFFF]
+                length = entry >> 8
+                if not length:
+                    break
+                symbol = entry & 0xFF
+                if symbol == 0x00:
+                    # EOB
+                    if pos + length > nbits:
+                        break
+                    pos += length
+                    acpart = 64
+                elif symbol == 0xF0:
+                    # 16 zeros
+                    if pos + length > nbits:
+                        break
+                    pos += length
+                    acpart += 16
+                else:
+                    size = symbol & 0x0F
+                    if pos + length + size > nbits:
+                        break
+                    pos += length + size
+                    acpart += (symbol >> 4) + 1
+
+            if acpart >= 64:
+                acpart = 0
+                mcupart += 1
+                if mcupart == ycparts + 2:
+                    mcupart = 0
+                    mcu_id += 1
+                    if mcu_id >= mcu_count:
+                        self.eoi = True
+                        break
+
+        self.pos = pos
+        self.mcu_id, self.mcupart, self.acpart = mcu_id, mcupart, acpart
+        if self.eoi:
+            self._flush()
+
+    def at_mcu_start(self, mcu_id: int) -> bool:
+        """True if mcu_id is next and only padding bits are left"""
+        return (self.mcu_id == mcu_id and self.mcupart == 0 and self.acpart == 0
+                and self.pos > (len(self.buf) << 3) - 8)
+
+    def splice(self, other):
+        """Continue this segment with the decoded content of `other`"""
+        self._flush()
+        for part in other.parts:
+            if part[0] is None and self.dc[part[1]] is not None:
+                self.parts.append(dc_code(part[1], part[2] - self.dc[part[1]]))
+                self.dc[part[1]] = part[2]
+            else:
+                if part[0] is None:
+                    self.dc[part[1]] = part[2]
+                self.parts.append(part)
+        for c in range(3):
+            if other.dc[c] is not None:
+                self.dc[c] = other.dc[c]
+        self.buf = other.buf
+        self.pos = other.pos
+        self.copy_from = other.copy_from
+        self.mcu_id, self.mcupart, self.acpart = other.mcu_id, other.mcupart, other.acpart
+        self.reset_mcu = other.reset_mcu
+        self.eoi = other.eoi
+
+
+class Decoder:
+    """
+    Incremental SSDV → JPEG decoder for one image.
+
+    feed() takes packets in any order (duplicates and corrupt packets are
+    rejected), get_jpeg() returns the image as decoded so far.
+    """
+
+    def __init__(self, packet_length: int | None = None):
+        self.packet_length = packet_length
+        self.header = None
+        self.packets = {}           # packet_id → packet
+        self.starts = {}            # first packet ID → segment
+        self.ends = {}              # last packet ID → segment
+        self.eoi_packet_id = None
+        self.ycparts = 0
+        self.mcu_count = 0
+
+    def __len__(self):
+        return len(self.packets)
+
+    def nbytes(self) -> int:
+        """Rough memory held for the image: packets plus decoded runs, in bytes"""
+        n = len(self.packets) * (self.packet_length or 0)
+        for seg in self.starts.values():
+            n += len(seg.buf) + sum((part[1] >> 3) + 64 for part in seg.parts if part[0] is not None)
+        return n
+
+    def feed(self, packet: bytes) -> bool:
+        """Add one packet, False if it is invalid, foreign or a duplicate"""
+        if self.packet_length is None:
+            self.packet_length = len(packet)
+        if len(packet) != self.packet_length:
+            return False
+        h = parse_header(packet)
+        if h is None or not check_crc(packet, h['type']):
+            return False
+        if self.header is None:
+            if h['mcu_mode'] not in MCU_MODES or not h['width'] or not h['height']:
+                return False
+            self.header = h
+            self.ycparts = MCU_MODES[h['mcu_mode']][1]
+            self.mcu_count = (h['width'] >> 4) * (h['height'] >> 4) * (4 // self.ycparts)
+        elif any(h[k] != self.header[k] for k in ('type', 'callsign', 'image_id', 'width', 'height', 'quality', 'mcu_mode')):
+            return False
+
+        pid = h['packet_id']
+        if pid in self.packets:
+            return False
+        self.packets[pid] = packet
+        if h['eoi']:
+            self.eoi_packet_id = pid
+
+        left = self.ends.pop(pid - 1, None)
+        if left is None:
+            seg = _Segment(self, pid)
+            self.starts[pid] = seg
+        else:
+            seg = left
+        self._extend(seg, pid)
+        seg.last = pid
+
+        right = self.starts.pop(pid + 1, None)
+        if right is not None:
+            del self.ends[right.last]
+            seg = self._join(seg, right)
+        self.ends[seg.last] = seg
+        return True
+
+    def _payload(self, pid: int) -> tuple[bytes, int, int]:
+        """(entropy data, first MCU offset, first MCU index) of a packet"""
+        p = self.packets[pid]
+        size = payload_size(self.packet_length, p[1])
+        return p[SSDV_HEADER_SIZE:SSDV_HEADER_SIZE + size], p[12], (p[13] << 8) | p[14]
+
+    def _extend(self, seg: _Segment, pid: int):
+        data, offset, mark = self._payload(pid)
+        if seg.start_pid is not None:
+            seg.feed(data, offset, mark)
+        elif pid == 0:
+            seg.start(pid, 0, data)
+        elif mark != SSDV_NO_MCU and offset < len(data):
+            # ssdv ignores packets after a gap until one starts an MCU
+            seg.start(pid, mark, data[offset:])
+
+    def _join(self, seg: _Segment, right: _Segment) -> _Segment:
+        """Merge two runs that the packet just fed has made consecutive"""
+        if seg.start_pid is None:
+            # Nothing decoded on the left, the right run decodes as before
+            right.first = seg.first
+            self.starts[seg.first] = right
+            return right
+
+        for pid in range(right.first, right.last + 1):
+            if seg.eoi:
+                break
+            data, offset, mark = self._payload(pid)
+            if pid == right.start_pid:
+                # Decode up to where the right run starts, then reuse it
+                seg.append(data[:offset])
+                if seg.at_mcu_start(right.start_mcu):
+                    seg.splice(right)
+                    break
+                seg.restart(mark)
+                seg.append(data[offset:])
+            else:
+                seg.feed(data, offset, mark)
+        seg.last = right.last
+        return seg
+
+    def _headers(self) -> bytes:
+        h = self.header
+        out = bytearray(b'\xFF\xD8')
+
+        def marker(code, data):
+            out.extend(bytes([0xFF, code]) + (len(data) + 2).to_bytes(2, 'big') + data)
+
+        marker(0xE0, JFIF_APP0)
+        marker(0xDB, b'\x00' + quality_dqt(DQT_Y, h['quality']))
+        marker(0xDB, b'\x01' + quality_dqt(DQT_C, h['quality']))
+        marker(0xC0, bytes([8]) + h['height'].to_bytes(2, 'big') + h['width'].to_bytes(2, 'big') +
+               bytes([3, 1, MCU_MODES[h['mcu_mode']][0], 0, 2, 0x11, 1, 3, 0x11, 1]))
+        for tc, dht in ((0x00, DHT_DC_Y), (0x10, DHT_AC_Y), (0x01, DHT_DC_C), (0x11, DHT_AC_C)):
+            marker(0xC4, bytes([tc]) + dht[0] + dht[1])
+        marker(0xDA, JPEG_SOS)
+        return bytes(out)
+
+    def _fill_gap(self, w: BitWriter, state: list, next_mcu: int):
+        """Blank MCUs (DC unchanged, EOB) up to next_mcu, as ssdv does"""
+        mcu_id, mcupart, acpart = state
+        parts = self.ycparts + 2
+        dc0 = [DC_CODES[c][0] for c in (0, 1)]
+        eob = [AC_CODES[c][0x00] for c in (0, 1)]
+        if mcupart > 0 or acpart > 0:
+            if acpart > 0:
+                w.write(*eob[mcupart >= self.ycparts])
+                mcupart += 1
+            for mp in range(mcupart, parts):
+                c = mp >= self.ycparts
+                w.write(*dc0[c])
+                w.write(*eob[c])
+            mcu_id += 1
+        if mcu_id < next_mcu:
+            bits = length = 0
+            for mp in range(parts):
+                c = mp >= self.ycparts
+                for code, n in (dc0[c], eob[c]):
+                    bits = (bits << n) | code
+                    length += n
+            for _ in range(next_mcu - mcu_id):
+                w.write(bits, length)
+            mcu_id = next_mcu
+        state[:] = [mcu_id, 0, 0]
+
+    def mcus_decoded(self) -> int:
+        """MCUs get_jpeg() has data for, the rest are blank"""
+        done = 0
+        end = 0
+        for first in sorted(self.starts):
+            seg = self.starts[first]
+            if seg.start_pid is None or seg.start_mcu < end:
+                continue
+            done += seg.mcu_id - seg.start_mcu
+            end = seg.mcu_id
+        return done
+
+    def get_jpeg(self) -> bytes:
+        """JPEG of everything received so far, empty if nothing was"""
+        if self.header is None:
+            return b''
+        w = BitWriter()
+        adc = [0, 0, 0]
+        state = [0, 0, 0]
+        for first in sorted(self.starts):
+            seg = self.starts[first]
+            if seg.start_pid is None or seg.start_mcu < state[0]:
+                continue
+            self._fill_gap(w, state, seg.start_mcu)
+            for part in seg.parts:
+                if part[0] is None:
+                    w.write(*dc_code(part[1], part[2] - adc[part[1]]))
+                    adc[part[1]] = part[2]
+                else:
+                    w.write(*part)
+            # Symbols decoded since the segment's last flush
+            w.write(_bit_slice(seg.buf, seg.copy_from, seg.pos), seg.pos - seg.copy_from)
+            for c in range(3):
+                if seg.dc[c] is not None:
+                    adc[c] = seg.dc[c]
+            state = [seg.mcu_id, seg.mcupart, seg.acpart]
+        if state[0] < self.mcu_count:
+            self._fill_gap(w, state, self.mcu_count)
+        w.pad()
+        return self._headers() + bytes(w.out).replace(b'\xFF', b'\xFF\x00') + b'\xFF\xD9'
+
+
+def decode(packets, packet_length: int | None = None) -> bytes:
+    """Decode an iterable of SSDV packets into a JPEG"""
+    dec = Decoder(packet_length)
+    for packet in packets:
+        dec.feed(packet)
+    return dec.get_jpeg()
+
+
+def split_packets(data: bytes, packet_length: int) -> list[bytes]:
+    """Cut a .bin file into packets, skipping empty (never received) slots"""
+    packets = []
+    for i in range(0, len(data) - packet_length + 1, packet_length):
+        packet = data[i:i + packet_length]
+        if packet[0] == SSDV_SYNC:
+            packets.append(packet)
+    return packets
+
+
+def quality_from_jpeg(jpeg_quality: int) -> int:
+    """Map a JPEG quality (1-95) to the ssdv quality level img2ssdv.py has always used"""
+    return min(7, max(0, round((jpeg_quality - 10) / 12)))
+
+
+def _requantise(value: int, src: int, dst: int) -> int:
+    """Rescale a coefficient from one quantiser to another, rounding half away from zero"""
+    x = value * src
+    if x < 0:
+        return -((-x + (dst >> 1)) // dst)
+    return (x + (dst >> 1)) // dst
+
+
+def _parse_jpeg(jpeg: bytes) -> dict:
+    """Tables, frame and scan data of a baseline JPEG, ValueError if ssdv can't take it"""
+    if jpeg[:2] != b'\xFF\xD8':
+        raise ValueError("Not a JPEG image")
+    dqt = {}
+    dht = {}
+    frame = None
+    restart = 0
+    i = 2
+    while i + 4 <= len(jpeg):
+        if jpeg[i] != 0xFF:
+            raise ValueError(f"Bad JPEG marker at offset {i}")
+        marker = jpeg[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        length = int.from_bytes(jpeg[i + 2:i + 4], 'big')
+        seg = jpeg[i + 4:i + 2 + length]
+
+        if marker == 0xDB:
+            j = 0
+            while j < len(seg):
+                if seg[j] >> 4:
+                    raise ValueError("16-bit quantisation tables are not supported")
+                dqt[seg[j] & 0x0F] = seg[j + 1:j + 65]
+                j += 65
+        elif marker == 0xC4:
+            j = 0
+            while j < len(seg):
+                counts = seg[j + 1:j + 17]
+                n = sum(counts)
+                dht[seg[j]] = _huffman_lookup(_huffman_codes((counts, seg[j + 17:j + 17 + n])))
+                j += 17 + n
+        elif marker in (0xC0, 0xC1):
+            if seg[0] != 8 or seg[5] != 3:
+                raise ValueError("Only 8-bit, 3 component (YCbCr) JPEG images are supported")
+            frame = {
+                'height': int.from_bytes(seg[1:3], 'big'),
+                'width': int.from_bytes(seg[3:5], 'big'),
+                'components': [(seg[6 + 3 * c], seg[7 + 3 * c], seg[8 + 3 * c]) for c in range(3)],
+            }
+        elif 0xC2 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            raise ValueError("Only baseline JPEG images are supported (no progressive)")
+        elif marker == 0xDD:
+            restart = int.from_bytes(seg[0:2], 'big')
+        elif marker == 0xDA:
+            if frame is None:
+                raise ValueError("JPEG scan before frame header")
+            if seg[0] != 3:
+                raise ValueError("Only interleaved JPEG scans are supported")
+            frame['tables'] = [(seg[2 + 2 * c] >> 4, seg[2 + 2 * c] & 0x0F) for c in range(3)]
+            frame['dqt'] = dqt
+            frame['dht'] = dht
+            frame['restart'] = restart
+            frame['scan'] = jpeg[i + 2 + length:]
+            return frame
+        i += 2 + length
+    raise ValueError("No image data found in JPEG")
+
+
+def _scan_chunks(scan: bytes) -> list[bytes]:
+    """Split scan data at restart markers, drop the byte stuffing"""
+    chunks = []
+    start = 0
+    i = scan.find(b'\xFF')
+    while i != -1 and i + 1 < len(scan):
+        marker = scan[i + 1]
+        if marker == 0x00 or marker == 0xFF:
+            i = scan.find(b'\xFF', i + 2 if marker == 0x00 else i + 1)
+            continue
+        chunks.append(scan[start:i].replace(b'\xFF\x00', b'\xFF'))
+        if not 0xD0 <= marker <= 0xD7:
+            return chunks
+        start = i + 2
+        i = scan.find(b'\xFF', start)
+    chunks.append(scan[start:].replace(b'\xFF\x00', b'\xFF'))
+    return chunks
+
+
+class _PacketWriter:
+    """Packs the re-encoded JPEG bits into SSDV packet payloads"""
+
+    def __init__(self, payload_size: int):
+        self.size = payload_size
+        self.out = bytearray()
+        self.packet = 0             # packet being filled
+        self.marks = {}             # packet index → (offset, MCU index)
+        self.acc = 0
+        self.n = 0
+
+    def write(self, bits: int, length: int):
+        acc = (self.acc << length) | bits
+        n = self.n + length
+        if n >= 8:
+            rem = n & 7
+            self.out += (acc >> rem).to_bytes(n >> 3, 'big')
+            acc &= (1 << rem) - 1
+            n = rem
+        self.acc = acc
+        self.n = n
+
+    def sync(self):
+        """Pad to a byte boundary with 1 bits"""
+        if self.n:
+            self.write((1 << (8 - self.n)) - 1, 8 - self.n)
+
+    def next_symbol(self):
+        """
+        ssdv only moves on to a new packet between two source symbols,
+        so a packet filled by the last symbol of an MCU is still current
+        when the next MCU starts
+        """
+        if len(self.out) >= (self.packet + 1) * self.size:
+            self.packet += 1
+
+    def start_mcu(self, mcu_id: int) -> bool:
+        """
+        Called before each MCU. The first MCU starting in a packet is byte
+        aligned and marked in its header; returns True for such an MCU,
+        whose first DC values must then be written as absolute values.
+        """
+        if self.packet in self.marks:
+            return False
+        self.sync()
+        self.next_symbol()
+        self.marks[self.packet] = (len(self.out) - self.packet * self.size, mcu_id)
+        return True
+
+
+def iter_encode(jpeg: bytes, callsign: str, image_id: int = 0,
+                packet_length: int = 256, quality: int = 4):
+    """
+    Encode a baseline JPEG into no-FEC SSDV packets, like
+    `ssdv -e -n -q quality -l packet_length -c callsign -i image_id`.
+
+    The image must be a 3 component JPEG with a width and height that are
+    multiples of 16, as Pillow writes it. Yields the packets in order.
+    """
+    frame = _parse_jpeg(jpeg)
+    width, height = frame['width'], frame['height']
+    if width % 16 or height % 16 or not 16 <= width <= 4080 or not 16 <= height <= 4080:
+        raise ValueError(f"Image size {width}x{height} is not a multiple of 16 (max 4080)")
+    sampling = [c[1] for c in frame['components']]
+    modes = {v[0]: k for k, v in MCU_MODES.items()}
+    if sampling[0] not in modes or sampling[1] != 0x11 or sampling[2] != 0x11:
+        raise ValueError("Unsupported chroma subsampling for SSDV")
+    mode = modes[sampling[0]]
+    ycparts = MCU_MODES[mode][1]
+    mcu_count = (width >> 4) * (height >> 4) * (4 // ycparts)
+    if not 0 <= quality <= 7:
+        raise ValueError("SSDV quality must be between 0 and 7")
+    size = payload_size(packet_length)
+    if size < 1 or packet_length > 256:
+        raise ValueError("SSDV packet length must be at most 256 bytes")
+
+    try:
+        src_dqt = [frame['dqt'][frame['components'][c][2]] for c in range(3)]
+        dc_tables = [frame['dht'][t[0]] for t in frame['tables']]
+        ac_tables = [frame['dht'][0x10 | t[1]] for t in frame['tables']]
+    except KeyError:
+        raise ValueError("JPEG refers to a missing quantisation or huffman table") from None
+    dst_dqt = (quality_dqt(DQT_Y, quality), quality_dqt(DQT_C, quality))
+    # Per block: component, source / destination quantisers, output huffman codes
+    blocks = [0] * ycparts + [1, 2]
+    setup = [(c, src_dqt[c], dst_dqt[c > 0], dc_tables[c], ac_tables[c], AC_CODES[c > 0]) for c in blocks]
+
+    w = _PacketWriter(size)
+    chunks = _scan_chunks(frame['scan'])
+    interval = frame['restart'] or mcu_count
+    out_dc = [0, 0, 0]
+    mcu_id = 0
+    for chunk in chunks:
+        if mcu_id >= mcu_count:
+            break
+        buf = chunk
+        nbits = len(buf) << 3
+        pos = 0
+        src_dc = [0, 0, 0]
+        for _ in range(min(interval, mcu_count - mcu_id)):
+            reset = w.start_mcu(mcu_id)
+            for part, (c, sq, dq, dc_lookup, ac_lookup, ac_codes) in enumerate(setup):
+                w.next_symbol()
+                i = pos >> 3
+                window = int.from_bytes(buf[i:i + 5], 'big')
+                if nbits - (i << 3) < 40:
+                    window <<= 40 - (nbits - (i << 3))
+                shift = 40 - (pos & 7)
+                entry = dc_lookup[(window >> (shift - 16)) & 0xFFFF]
+                length = entry >> 8
+                s = entry & 0xFF
+                if not length or pos + length + s > nbits:
+                    raise ValueError(f"Corrupt JPEG data in MCU {mcu_id}")
+                value = (window >> (shift - length - s)) & ((1 << s) - 1)
+                if s and value < (1 << (s - 1)):
+                    value -= (1 << s) - 1
+                pos += length + s
+                src_dc[c] += value
+
+                dc = _requantise(src_dc[c], sq[0], dq[0])
+                if reset and (part == 0 or part >= ycparts):
+                    w.write(*dc_code(c, dc))
+                else:
+                    w.write(*dc_code(c, dc - out_dc[c]))
+                out_dc[c] = dc
+
+                k = 1
+                run = 0
+                while k < 64:
+                    w.next_symbol()
+                    i = pos >> 3
+                    window = int.from_bytes(buf[i:i + 5], 'big')
+                    if nbits - (i << 3) < 40:
+                        window <<= 40 - (nbits - (i << 3))
+                    shift = 40 - (pos & 7)
+                    entry = ac_lookup[(window >> (shift - 16)) & 0xFFFF]
+                    length = entry >> 8
+                    symbol = entry & 0xFF
+                    if not length:
+                        raise ValueError(f"Corrupt JPEG data in MCU {mcu_id}")
+                    s = symbol & 0x0F
+                    if not s:
+                        pos += length
+                        if symbol != 0xF0:
+                            break
+                        # ssdv copies a ZRL straight away; only zeros made
+                        # by requantising are held back for the next value
+                        w.write(*ac_codes[0xF0])
+                        k += 16
+                        continue
+                    value = (window >> (shift - length - s)) & ((1 << s) - 1)
+                    if value < (1 << (s - 1)):
+                        value -= (1 << s) - 1
+                    pos += length + s
+                    k += symbol >> 4
+                    run += symbol >> 4
+                    if k > 63:
+                        break
+                    value = _requantise(value, sq[k], dq[k])
+                    k += 1
+                    if not value:
+                        run += 1
+                        continue
+                    while run > 15:
+                        w.write(*ac_codes[0xF0])
+                        run -= 16
+                    bits, s = encode_int(value)
+                    code, length = ac_codes[(run << 4) | s]
+                    w.write((code << s) | bits, length + s)
+                    run = 0
+                if run or k < 64:
+                    w.write(*ac_codes[0x00])
+                if pos > nbits:
+                    raise ValueError(f"JPEG data ends in MCU {mcu_id}")
+            mcu_id += 1
+    if mcu_id < mcu_count:
+        raise ValueError("JPEG data ends early")
+    w.sync()
+
+    out = w.out
+    packets = max(1, -(-len(out) // size))
+    # The unused end of the last packet gets ssdv's filler sequence
+    x = 0
+    filler = bytearray()
+    for _ in range(packets * size - len(out)):
+        x = (x * 245 + 45) & 0xFF
+        filler.append(x)
+    out += filler
+
+    header = bytes([SSDV_SYNC, SSDV_TYPE_NOFEC]) + encode_callsign(callsign).to_bytes(4, 'big') + bytes([image_id & 0xFF])
+    for p in range(packets):
+        offset, mark = w.marks.get(p, (0xFF, SSDV_NO_MCU))
+        flags = ((quality ^ 4) << 3) | (0x04 if p == packets - 1 else 0) | mode
+        packet = (header + p.to_bytes(2, 'big') + bytes([width >> 4, height >> 4, flags, offset]) +
+                  mark.to_bytes(2, 'big') + out[p * size:(p + 1) * size])
+        yield packet + zlib.crc32(packet[1:]).to_bytes(4, 'big')
+
+
+def encode(jpeg: bytes, callsign: str, image_id: int = 0,
+           packet_length: int = 256, quality: int = 4) -> list[bytes]:
+    """Encode a baseline JPEG into a list of no-FEC SSDV packets"""
+    return list(iter_encode(jpeg, callsign, image_id, packet_length, quality))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SSDV encoder / decoder, same output as the ssdv program")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("-e", "--encode", action="store_true", help="encode a JPEG image into SSDV packets")
+    mode.add_argument("-d", "--decode", action="store_true", help="decode SSDV packets into a JPEG image")
+    parser.add_argument("-l", "--length", type=int, default=256, help="SSDV packet length (default: 256)")
+    parser.add_argument("-c", "--callsign", default="", help="callsign to encode with (max 6 characters)")
+    parser.add_argument("-i", "--id", type=int, default=0, help="image ID to encode with, 0-255 (default: 0)")
+    parser.add_argument("-q", "--quality", type=int, default=4, help="SSDV quality level 0-7 (default: 4)")
+    parser.add_argument("input", help="input file")
+    parser.add_argument("output", help="output file")
+    parser.add_argument("--version", action='version', version=f"ssdv2sat-%(prog)s v{VERSION} by hobisatelit <https://github.com/hobisatelit>", help="Show the version of the application")
+    args = parser.parse_args()
+
+    with open(args.input, "rb") as f:
+        data = f.read()
+
+    if args.encode:
+        try:
+            packets = encode(data, args.callsign, args.id, args.length, args.quality)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        with open(args.output, "wb") as f:
+            f.write(b"".join(packets))
+        print(f"Wrote {len(packets)} packets", file=sys.stderr)
+        return
+
+    dec = Decoder(args.length)
+    for packet in split_packets(data, args.length):
+        dec.feed(packet)
+    if dec.header is None:
+        print("No valid SSDV packets found", file=sys.stderr)
+        sys.exit(1)
+
+    h = dec.header
+    print(f"Callsign: {h['callsign']}", file=sys.stderr)
+    print(f"Image ID: {h['image_id']:02X}", file=sys.stderr)
+    print(f"Resolution: {h['width']}x{h['height']}", file=sys.stderr)
+    print(f"MCU blocks: {dec.mcu_count}", file=sys.stderr)
+    print(f"Quality level: {h['quality']}", file=sys.stderr)
+    print(f"Read {len(dec)} packets", file=sys.stderr)
+    with open(args.output, "wb") as f:
+        f.write(dec.get_jpeg())
+
+
+if __name__ == "__main__":
+    main()
@@ -15,9 +15,22 @@ import string
 import argparse
 import configparser
 
+import aggregate
+import erasure
+import img2ssdv as ssdv_image
+import profiling
+import reports
+import ssdvcodec
+
 DEFAULT_PACKET_LENGTH = 128
 DEFAULT_DELAY = 0
 DEFAULT_AUDIO_DIR = 'audio'
+DEFAULT_CACHE_DIR = 'cache'
+DEFAULT_CACHE_SIZE = 64
+DEFAULT_QUEUE = 3
+DEFAULT_STRIDE = 8
+SENT_LOCK = threading.Lock()
+ORDERINGS = ('sequential', 'stride', 'bitrev', 'roi')
 ####################################
 VERSION = '0.02'
 
@@ -58,31 +71,210 @@ def start_recording(output_filename):
     return None
     
     
-def img2ssdv(packet_length,output_dir,input_filename,callsign,text,quality,max_size,filesuffix):
-  try:
-    max_w, max_h = max_size
-    command = [
-    sys.executable,                                 # this gives full path to your python.exe (e.g. C:\Users\alpha\AppData\Local\Python\pythoncore-3.14-64\python.exe)
-    os.path.join(os.getcwd(), "img2ssdv.py"),
-    "--length", str(packet_length),
-    "--dir", str(output_dir),
-    "--callsign", str(callsign),
-    input_filename,
-    "--text", str(text),
-    "--quality", str(quality),
-    "--max-size", str(max_w), str(max_h),
-    "--suffix", filesuffix
-]
-    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    # waiting until app finish 
-    stdout, stderr = process.communicate()
-    return stdout.decode().strip()
-  except FileNotFoundError:
-    print(f"\nError: img2ssdv.py not found. SSDV image not created..")
-    return None
-  except subprocess.CalledProcessError as e:
-    print(f"An error occurred while running img2ssdv.py: {e}")
-    return None
+def img2ssdv(packet_length,output_dir,input_filename,callsign,text,quality,max_size,filesuffix,cache=None):
+  """
+  In-process img2ssdv.py: write its _small.jpg and _ssdv.bin into output_dir
+  and return (packets, report). With an EncodeCache a repeated image with
+  the same settings is not encoded again.
+  """
+  if cache:
+    jpeg, packets, hit = cache.convert(input_filename, max_size, quality, packet_length, callsign, text)
+  else:
+    jpeg, packets = ssdv_image.convert(input_filename, max_size, quality, packet_length, callsign, text)
+    hit = False
+  small_name, ssdv_name = ssdv_image.output_names(input_filename, filesuffix)
+  with open(os.path.join(output_dir, small_name), "wb") as f:
+    f.write(jpeg)
+  with open(os.path.join(output_dir, ssdv_name), "wb") as f:
+    f.write(b"".join(packets))
+  report = ssdv_image.report(small_name, ssdv_name, packets, quality, packet_length)
+  if hit:
+    report += " (from cache)"
+  return packets, report
+
+class Pacer:
+    """
+    Token bucket that keeps about `queue` frames waiting in Dire Wolf's
+    transmit queue: enough that the channel never idles between frames, few
+    enough that they are not all buffered up front. Each token is a free
+    queue slot and they come back at the rate the modem sends frames,
+    estimated from baud, the framing overhead and --delay. queue=0 does not
+    pace at all, only the delay.
+    """
+
+    def __init__(self, packet_length, baud=ssdv_image.DEFAULT_BAUD, queue=DEFAULT_QUEUE, delay=0.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.packet_length = packet_length
+        self.baud = baud
+        self.queue = queue
+        self.delay = delay
+        self.frame_time = ssdv_image.frame_airtime(packet_length, baud, delay)
+        self.clock = clock
+        self.sleep = sleep
+        self.start = None
+        # When the frames handed over so far should be off the air
+        self.on_air_until = None
+        self.frames = 0
+        self.payload_bytes = 0
+        # Airtime of the frames alone, without --delay or idle gaps
+        self.airtime = 0.0
+
+    def wait(self, length: int | None = None):
+        """Block until the next frame (of length bytes, default packet_length) can be handed to Dire Wolf"""
+        now = self.clock()
+        if self.start is None:
+            self.start = self.on_air_until = now
+        elif not self.queue:
+            self.sleep(self.delay)
+        else:
+            queued = (self.on_air_until - now) / self.frame_time
+            if queued > self.queue - 1:
+                self.sleep((queued - (self.queue - 1)) * self.frame_time)
+        # A drained queue means the channel went idle, nothing to catch up on
+        frame_time = self.frame_time if length is None else ssdv_image.frame_airtime(length, self.baud, self.delay)
+        self.on_air_until = max(self.on_air_until, self.clock()) + frame_time
+        self.frames += 1
+        self.payload_bytes += self.packet_length if length is None else length
+        self.airtime += frame_time - self.delay
+
+    def remaining(self) -> float:
+        """Estimated seconds until Dire Wolf has sent everything handed over"""
+        return max(0.0, self.on_air_until - self.clock()) if self.frames else 0.0
+
+    def report(self) -> str:
+        """Achieved SSDV throughput against the channel capacity"""
+        if not self.frames:
+            return "Nothing sent"
+        handed = self.clock() - self.start
+        on_air = max(self.on_air_until - self.start, 1e-9)
+        ssdv_bytes = self.payload_bytes
+        capacity = self.baud / 8
+        best = ssdv_bytes / self.airtime
+        return "\n".join([
+            f"Handed over       : {self.frames} frames in {handed:.1f} s, ~{on_air:.1f} s on air at {self.baud} baud",
+            f"SSDV throughput   : {ssdv_bytes / on_air:.1f} bytes/s, {ssdv_bytes / on_air / capacity:.0%} of the"
+            f" {capacity:.0f} bytes/s channel (at most {best:.1f} bytes/s after framing overhead)",
+        ])
+
+def packet_centres(packets: list[bytes]) -> list[tuple[float, float]]:
+    """(x, y) in pixels of the middle MCU each SSDV packet covers, for the packets of one image"""
+    h = ssdvcodec.parse_header(packets[0])
+    sampling = ssdvcodec.MCU_MODES[h['mcu_mode']][0]
+    mcu_w, mcu_h = 8 * (sampling >> 4), 8 * (sampling & 15)
+    per_row = max(1, h['width'] // mcu_w)
+    mcu_count = per_row * (h['height'] // mcu_h)
+    # First MCU that starts in each packet; one without carries on the previous one's
+    starts = []
+    for packet in packets:
+        mcu_id = (packet[13] << 8) | packet[14]
+        if mcu_id == ssdvcodec.SSDV_NO_MCU:
+            mcu_id = starts[-1] if starts else 0
+        starts.append(mcu_id)
+    starts.append(mcu_count)
+    centres = []
+    for first, end in zip(starts, starts[1:]):
+        mid = min((first + end) // 2, mcu_count - 1)
+        centres.append(((mid % per_row + 0.5) * mcu_w, (mid // per_row + 0.5) * mcu_h))
+    return centres
+
+def order_packets(packets: list[bytes], order: str = "sequential", stride: int = DEFAULT_STRIDE,
+                  roi: tuple[float, float] = (0.5, 0.5)) -> list[bytes]:
+    """
+    Transmit order for the SSDV packets of one image. Every packet carries
+    its own ID and MCU position, so rx.py puts the image together in any
+    order; what changes is what a pass cut short leaves behind:
+      sequential  file order, the top of the image first
+      stride      every stride-th packet, then the ones after those, ...:
+                  bands over the whole image that fill in
+      bitrev      bit-reversed packet IDs, spreading every prefix of the
+                  pass evenly over the image
+      roi         nearest first to roi, a point as fractions of width and
+                  height (default the centre)
+    """
+    n = len(packets)
+    if order == "stride":
+        idx = [i for start in range(stride) for i in range(start, n, stride)]
+    elif order == "bitrev":
+        bits = max(1, (n - 1).bit_length())
+        idx = [r for r in (int(format(i, f"0{bits}b")[::-1], 2) for i in range(1 << bits)) if r < n]
+    elif order == "roi" and n:
+        h = ssdvcodec.parse_header(packets[0])
+        x, y = roi[0] * h['width'], roi[1] * h['height']
+        centres = packet_centres(packets)
+        idx = sorted(range(n), key=lambda i: (centres[i][0] - x) ** 2 + (centres[i][1] - y) ** 2)
+    elif order in ORDERINGS:
+        idx = range(n)
+    else:
+        raise ValueError(f"unknown packet order {order!r}")
+    return [packets[i] for i in idx]
+
+def parse_channel(text: str, host: str, port: int) -> tuple[str, int, int]:
+    """CHANNEL, HOST:PORT or HOST:PORT/CHANNEL → (host, port, KISS channel)"""
+    if text.isdigit():
+        endpoint, channel = "", text
+    else:
+        endpoint, _, channel = text.partition("/")
+    try:
+        channel = int(channel or 0)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid channel '{text}'")
+    if not 0 <= channel <= 15:
+        raise argparse.ArgumentTypeError(f"invalid channel '{text}', KISS channels are 0-15")
+    if endpoint:
+        host, port = reports.parse_station(endpoint, port)
+    return host, port, channel
+
+def connect_kiss(host: str, port: int) -> socket.socket:
+    """Connect to a Dire Wolf KISS TCP port, or exit explaining why not"""
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(10)
+        sock.connect((host, port))
+        return sock
+    except socket.timeout:
+        print("\nError: Connection timed out.")
+        print(f"   → Is Dire Wolf running with KISSPORT {port} enabled?")
+    except ConnectionRefusedError:
+        print("\nError: Connection refused.")
+        print(f"   → Dire Wolf not listening on port {port}.")
+    except Exception as e:
+        print(f"\nError: Unexpected connection error: {e}")
+    sys.exit(1)
+
+def send_channel(sock, frames: list[bytes], header: bytes, kiss_port: int, pacer: Pacer, sent: list, errors: list):
+    """
+    Sender thread of one channel: frame, escape and send the SSDV payloads
+    with its own pacing; sent[0] counts frames over all channels
+    """
+    command = bytes([kiss_port << 4])
+    try:
+        for payload in frames:
+            with profiling.span("tx.pace", channel=kiss_port):
+                pacer.wait(len(payload))
+            with profiling.span("tx.send", channel=kiss_port, bytes=len(payload)):
+                sock.sendall(FEND + command + kiss_escape(header + payload) + FEND)
+            with SENT_LOCK:
+                sent[0] += 1
+    except OSError as e:
+        errors.append(e)
+
+def close_all(socks):
+    for sock in socks:
+        sock.close()
+
+def resend_ids(packets: list[bytes], report: dict) -> list[int]:
+    """
+    Packet IDs a missing-packet report from rx.py asks for, after checking
+    that packets are the image it was about: same count and same check packet
+    """
+    if report['total'] is not None and report['total'] != len(packets):
+        raise ValueError(f"the image makes {len(packets)} packets, the report expects {report['total']}")
+    if report['check']:
+        packet_id, crc = report['check']
+        if packet_id >= len(packets) or packets[packet_id][-4:] != crc:
+            raise ValueError("the image or its settings differ from the original transmission")
+    return [i for i in range(len(packets))
+            if any(first <= i and (last is None or i <= last) for first, last in report['ranges'])]
 
 def stop_recording(process):
     process.terminate()
@@ -110,10 +302,36 @@ def main():
     parser.add_argument("filename", help="input image file (JPG, PNG, etc)")
     parser.add_argument("--host", default="127.0.0.1", help="Dire Wolf host (default: 127.0.0.1)")
     parser.add_argument("--port", type=int, default=8001, help="Dire Wolf KISS TCP port (default: 8001)")
+    parser.add_argument("--synth", choices=("ax25", "il2p"),
+                        help="render the frames straight to the WAV as 1200 baud AFSK with this framing, much faster"
+                             " than real time, instead of sending them to Dire Wolf and recording (needs numpy)")
+    parser.add_argument("--channel", action="append", metavar="SPEC",
+                        help="KISS channel to send on: CHANNEL, HOST:PORT or HOST:PORT/CHANNEL; repeat to stripe the"
+                             " frames over several radios, each paced on its own (default: channel 0 of --host:--port)")
     parser.add_argument("--max", type=int, default=DEFAULT_PACKET_LENGTH,
                         help=f"Max data bytes per frame (default: {DEFAULT_PACKET_LENGTH}, min 64, max 256)")
     parser.add_argument("--delay", type=float, default=DEFAULT_DELAY,
                         help=f"Delay between frames in seconds (default: {DEFAULT_DELAY}, use 0.1-3s for longer satellite pass, and 0 for shortest)")
+    parser.add_argument("--baud", type=int, default=ssdv_image.DEFAULT_BAUD,
+                        help=f"Dire Wolf MODEM bit rate, for pacing (default: {ssdv_image.DEFAULT_BAUD})")
+    parser.add_argument("--queue", type=int, default=DEFAULT_QUEUE,
+                        help=f"frames to keep queued in Dire Wolf, 0 sends without pacing (default: {DEFAULT_QUEUE})")
+    parser.add_argument("--order", choices=ORDERINGS, default="sequential",
+                        help="packet transmit order, so a pass cut short still covers the image (default: sequential)")
+    parser.add_argument("--stride", type=int, default=DEFAULT_STRIDE,
+                        help=f"packet step for --order stride (default: {DEFAULT_STRIDE})")
+    parser.add_argument("--roi", nargs=2, type=float, default=[0.5, 0.5], metavar=("X", "Y"),
+                        help="point sent first with --order roi, as fractions of width and height (default: 0.5 0.5)")
+    parser.add_argument("--repair", type=int, default=0,
+                        help="erasure-coded repair frames per packet group, sent after the image (default: 0)")
+    parser.add_argument("--group", type=int, default=erasure.DEFAULT_GROUP,
+                        help=f"packets per repair group (default: {erasure.DEFAULT_GROUP})")
+    parser.add_argument("--aggregate", type=int, default=0, metavar="MTU",
+                        help=f"pack consecutive packets into frames of up to MTU bytes to save per-frame overhead, at"
+                             f" most {aggregate.MAX_MTU}; a lost frame loses all its packets (default: 0, one packet per frame)")
+    parser.add_argument("--resend", metavar="REPORT",
+                        help="send only the packets an rx.py missing-packet report (.missing file or its line) lists,"
+                             " under the same FILE_ID; use the image and settings of the first transmission")
     parser.add_argument("--quality", type=int, default=20,
                         help="JPEG quality 1–95 (default: 20 – good for SSDV)")  
     parser.add_argument("--text", type=str, default='',
@@ -123,9 +341,16 @@ def main():
                         help="Max width and height in pixels (default: 320 320)")
     parser.add_argument("--dir", type=str, default=DEFAULT_AUDIO_DIR,
                         help=f"Directory for save recorded audio wav (default: {DEFAULT_AUDIO_DIR})")
+    parser.add_argument("--cache-dir", type=str, default=DEFAULT_CACHE_DIR,
+                        help=f"Directory for cached SSDV encodes (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"Max size of the encode cache in MB, least recently used go first (default: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument("--no-cache", action="store_true", help="Always encode the image, do not use the cache")
+    profiling.add_arguments(parser)
     parser.add_argument("--version", action='version', version=f"ssdv2sat-%(prog)s v{VERSION} by hobisatelit <https://github.com/hobisatelit>", help="Show the version of the application")
 
     args = parser.parse_args()
+    profiling.start_from_args(args, "tx")
     
     max_w, max_h = args.max_size
     if max_w < 16 or max_h < 16:
@@ -141,9 +366,48 @@ def main():
     if args.delay < 0:
         print("Error: --delay cannot be negative")
         sys.exit(1)
+    if args.baud <= 0 or args.queue < 0:
+        print("Error: --baud must be positive and --queue cannot be negative")
+        sys.exit(1)
+    if args.stride < 1 or not all(0 <= v <= 1 for v in args.roi):
+        print("Error: --stride must be at least 1 and --roi between 0 and 1")
+        sys.exit(1)
+    if args.repair < 0 or args.group < 1 or args.group + args.repair > 256:
+        print("Error: --repair and --group must be positive and add up to at most 256")
+        sys.exit(1)
+    if args.aggregate and not (2 * args.max <= args.aggregate - aggregate.AGGREGATE_HEADER.size
+                               and args.aggregate <= aggregate.MAX_MTU):
+        print(f"Error: --aggregate must leave room for two packets of --max bytes and be at most {aggregate.MAX_MTU}")
+        sys.exit(1)
+    if args.synth:
+        # NumPy is only needed here, so check it before any work is done
+        try:
+            import afsk
+        except ImportError:
+            print("Error: --synth needs numpy (pip install numpy)")
+            sys.exit(1)
+    try:
+        channels = [parse_channel(c, args.host, args.port) for c in args.channel or ["0"]]
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        print(f"Error: --channel: {e}")
+        sys.exit(1)
+
+    report = None
+    if args.resend:
+        try:
+            if os.path.exists(args.resend):
+                with open(args.resend) as f:
+                    report = reports.parse_missing_report(f.read())
+            else:
+                report = reports.parse_missing_report(args.resend)
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot read missing-packet report: {e}")
+            sys.exit(1)
+        if report['callsign'].upper() != args.callsign.upper()[:6] or len(report['image_id']) != 3:
+            print(f"Error: the report is for {report['callsign']} image {report['image_id']}, not a tx.py image of {args.callsign}")
+            sys.exit(1)
+        args.max = report['packet_length']
 
-    HOST = args.host
-    KISS_PORT = args.port
     SRC_CALL = args.callsign
     PACKET_LENGTH = args.max
     FRAME_DELAY = args.delay
@@ -161,7 +425,7 @@ def main():
     basename = os.path.basename(filename)
     basename_noext = os.path.splitext(basename)[0]
     
-    FILE_ID = generate_random_id()
+    FILE_ID = report['image_id'] if report else generate_random_id()
     
     FILE_SUFFIX = f"{SRC_CALL}_{FILE_ID}_{PACKET_LENGTH}b_{FRAME_DELAY}s_{args.quality}q"
     
@@ -171,50 +435,96 @@ def main():
     print(f"FILE_ID           : {FILE_ID}")
     print(f"PACKET_LENGTH     : {PACKET_LENGTH} byte/frame")
     print(f"Frame delay       : {FRAME_DELAY} seconds")
+    print(f"Pacing            : " + (f"{args.queue} frames queued at {args.baud} baud" if args.queue else "off"))
     print(f"Audio output      : {output_wav}")
     print(f"AUDIO DIR         : {os.path.join(os.getcwd(),AUDIO_DIR)}/")
-    print(f"KISS target       : {HOST}:{KISS_PORT}\n")
+    socks = []
+    if args.synth:
+        print(f"Synthesis         : {args.synth.upper()} frames, 1200 baud AFSK\n")
+    else:
+        for host, port, channel in channels:
+            print(f"KISS target       : {host}:{port} channel {channel}")
+        print()
 
-    # === KISS CONNECTION CHECK ===
-    print("Checking KISS connection to Dire Wolf...", end=" ")
-    sys.stdout.flush()
-    sock = None
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(10)
-        sock.connect((HOST, KISS_PORT))
+        # === KISS CONNECTION CHECK ===
+        print("Checking KISS connection to Dire Wolf...", end=" ")
+        sys.stdout.flush()
+        for host, port, _ in channels:
+            try:
+                with profiling.span("tx.connect", host=host, port=port):
+                    socks.append(connect_kiss(host, port))
+            except SystemExit:
+                close_all(socks)
+                raise
         print("SUCCESS ✓")
-    except socket.timeout:
-        print("\nError: Connection timed out.")
-        print("   → Is Dire Wolf running with KISSPORT 8001 enabled?")
-        sys.exit(1)
-    except ConnectionRefusedError:
-        print("\nError: Connection refused.")
-        print("   → Dire Wolf not listening on port 8001.")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\nError: Unexpected connection error: {e}")
-        sys.exit(1)
 
     # === Proceed ===
     print()
     
-    ssdv_process = img2ssdv(PACKET_LENGTH,AUDIO_DIR,filename,SRC_CALL,args.text,args.quality,args.max_size,FILE_SUFFIX)
+    cache = None if args.no_cache else ssdv_image.EncodeCache(args.cache_dir, args.cache_size << 20)
+    try:
+        with profiling.span("tx.img2ssdv"):
+            packets, ssdv_report = img2ssdv(PACKET_LENGTH,AUDIO_DIR,filename,SRC_CALL,args.text,args.quality,args.max_size,FILE_SUFFIX,cache)
+    except (OSError, ValueError) as e:
+        print(f"\nError: SSDV image not created: {e}")
+        close_all(socks)
+        sys.exit(1)
 
-    print(ssdv_process)
+    print(ssdv_report)
 
-    if not os.path.exists(os.path.join(AUDIO_DIR, f"{basename_noext}_ssdv_{FILE_SUFFIX}.bin")):
-        print(f"\nError: SSDV .bin image not found.\nPlease check your config.ini")
-        sys.exit(1)
+    # The destination counts all SSDV packets of the image, also on a resend
+    total_packets = len(packets)
+    repairs = erasure.repair_frames(packets, args.repair, args.group)
+    if report:
+        try:
+            wanted = set(resend_ids(packets, report))
+        except ValueError as e:
+            print(f"\nError: cannot resend: {e}")
+            close_all(socks)
+            sys.exit(1)
+        # Repair frames only for groups with something missing
+        repairs = [f for f in repairs if not wanted.isdisjoint(erasure.group_ids(f))]
+        packets = [p for i, p in enumerate(packets) if i in wanted]
+        print(f"Resending         : {len(packets)} of {total_packets} packets")
+        if not packets:
+            print("Nothing is missing.")
+            close_all(socks)
+            sys.exit(0)
 
-    data = open(os.path.join(AUDIO_DIR, f"{basename_noext}_ssdv_{FILE_SUFFIX}.bin"), 'rb').read()
-    frame_num = 0
-    offset = 0
-    total_bytes = len(data)
-    total_frames = (total_bytes + PACKET_LENGTH - 1) // PACKET_LENGTH
+    # The .bin stays in file order, only the transmission is reordered
+    packets = order_packets(packets, args.order, args.stride, args.roi)
+    if args.order != "sequential":
+        print(f"Packet order      : {args.order}")
+    # Repair frames go last
+    frames = packets + repairs
+    if args.repair:
+        print(f"Repair frames     : {len(repairs)} ({args.repair} per {args.group} packets)")
+    if args.aggregate:
+        frames = aggregate.pack(frames, PACKET_LENGTH, args.aggregate)
+        print(f"Aggregation       : {len(packets) + len(repairs)} packets in {len(frames)} frames of up to {args.aggregate} bytes")
+    total_bytes = sum(len(f) for f in frames)
+    total_frames = len(frames)
 
     src_addr = ax25_address(SRC_CALL)
-    dest_addr = ax25_address(str(FILE_ID) + str(hex(total_frames)[2:]), last=True)
+    dest_addr = ax25_address(str(FILE_ID) + str(hex(total_packets)[2:]), last=True)
+    header = dest_addr + src_addr + b'\x03\xf0'
+
+    if args.synth:
+        print(f"\nRendering {total_bytes} bytes in {total_frames} frames...")
+        t0 = time.monotonic()
+        try:
+            with profiling.span("tx.synth", framing=args.synth, frames=total_frames):
+                seconds = afsk.write_wav(os.path.join(AUDIO_DIR, output_wav), [header + f for f in frames],
+                                         args.synth, gap=FRAME_DELAY)
+        except (OSError, ValueError) as e:
+            print(f"\nError: WAV not written: {e}")
+            sys.exit(1)
+        elapsed = max(time.monotonic() - t0, 1e-3)
+        size_mb = os.path.getsize(os.path.join(AUDIO_DIR, output_wav)) / (1024 * 1024)
+        print(f"WAV file saved: {output_wav} ({size_mb:.2f} MB, {seconds:.1f} s of audio in {elapsed:.1f} s,"
+              f" {seconds / elapsed:.0f}× real time)")
+        print(f"Ready for playback over radio. 73!")
+        return
 
     print("\nStarting WAV recording...")
     wav_process = start_recording(os.path.join(AUDIO_DIR, output_wav))
@@ -226,30 +536,36 @@ def main():
     print()
     print(f"Sending {total_bytes} bytes to Dire Wolf in ~{total_frames} frames...\n")
 
-    while offset < total_bytes:
-        chunk_size = min(PACKET_LENGTH, total_bytes - offset)
-        chunk = data[offset:offset + chunk_size]
-        offset += chunk_size
-        
-        payload = chunk
-        frame = dest_addr + src_addr + b'\x03\xf0' + payload
-        kiss_frame = FEND + b'\x00' + kiss_escape(frame) + FEND
-        
-        try:
-            sock.sendall(kiss_frame)
-            #print(f"Frame {frame_num:4d}/{total_frames-1} → {chunk_size:3d} bytes")
-            show_progress(frame_num, total_frames-1)
-        except BrokenPipeError:
-            print("\nError: Connection lost during transmission.")
-            sock.close()
-            stop_recording(wav_process)
-            sys.exit(1)
-            
-        frame_num += 1
-        
-        time.sleep(FRAME_DELAY)
-    sock.close()
+    # Frame i goes out on channel i mod N, each channel paced on its own
+    pacers = [Pacer(max(len(f) for f in frames), args.baud, args.queue, FRAME_DELAY) for _ in channels]
+    sent, errors = [0], []
+    threads = [threading.Thread(target=send_channel, daemon=True,
+                                args=(sock, frames[i::len(channels)], header, channel, pacer, sent, errors))
+               for i, (sock, (_, _, channel), pacer) in enumerate(zip(socks, channels, pacers))]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        show_progress(max(0, sent[0] - 1), max(1, total_frames-1))
+        time.sleep(0.2)
+    show_progress(max(0, sent[0] - 1), max(1, total_frames-1))
+    close_all(socks)
     print()
+    if errors:
+        print(f"\nError: Connection lost during transmission: {errors[0]}")
+        stop_recording(wav_process)
+        sys.exit(1)
+    for (host, port, channel), pacer in zip(channels, pacers):
+        if len(channels) > 1:
+            print(f"\n{host}:{port} channel {channel}")
+        print(pacer.report())
+    if len(channels) > 1:
+        busy = [p for p in pacers if p.frames]
+        on_air = max(p.on_air_until for p in busy) - min(p.start for p in busy)
+        print(f"\nAll channels      : {total_bytes / max(on_air, 1e-9):.1f} bytes/s over {len(channels)} channels,"
+              f" ~{on_air:.1f} s on air")
+    remaining = max(p.remaining() for p in pacers)
+    if remaining >= 1:
+        print(f"Dire Wolf should finish sending in ~{remaining:.0f} s")
     
     if(wav_process):
         print("\nPress <ENTER> only after the sound ends, or the audio won't save completely")
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+# Copyright 2026 hobisatelit
+# https://github.com/hobisatelit/ssdv2sat
+# License: GPL-3.0-or-later
+
+"""
+Transmit daemon: one long-running tx.py with a queue of images.
+
+`txd.py serve` keeps a single KISS connection to Dire Wolf open
+(reconnecting when it drops) and sends the images submitted to its spool
+directory, highest priority first, paced like tx.py. Images of the same
+priority are sent one after the other, or with --interleave a frame of
+each in turn. The spool is rescanned every second while sending, so jobs
+can be added, reprioritised or cancelled in the middle of a pass.
+
+Spool directory:
+  ID.job        JSON job written by `txd.py submit`: image, priority,
+                quality, max size, text. ID is the 3-character image ID
+                sent on air (A-Z, 0-9); other file names are ignored.
+                Changing its priority reprioritises the job, deleting
+                it cancels the job.
+  status.json   frames sent so far of every queued job, by the daemon
+  done/ID.job   finished, cancelled or failed jobs, with their result
+
+The _small.jpg and _ssdv.bin of each image go to --dir like tx.py's; there
+is no WAV recording, record the pass on the Dire Wolf side.
+
+Usage:
+    python txd.py serve N0CALL
+    python txd.py submit photo.jpg --priority 5 --text "hello"
+    python txd.py list
+    python txd.py priority K7Q 9
+    python txd.py cancel K7Q
+"""
+VERSION = '0.02'
+
+import argparse
+import heapq
+import json
+import os
+import select
+import socket
+import sys
+import time
+
+import aggregate
+import erasure
+import img2ssdv
+import tx
+
+DEFAULT_SPOOL_DIR = 'spool'
+JOB_SUFFIX = '.job'
+STATUS_NAME = 'status.json'
+SCAN_INTERVAL = 1.0
+DEFAULT_QUALITY = 20
+DEFAULT_MAX_SIZE = [320, 320]
+
+
+def _write_json(path: str, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+def submit(spool: str, image: str, priority: int = 0, quality: int = DEFAULT_QUALITY, max_size=DEFAULT_MAX_SIZE,
+           text: str = "") -> str:
+    """Queue an image for the daemon, return its job ID"""
+    os.makedirs(spool, exist_ok=True)
+    while True:
+        job_id = tx.generate_random_id()
+        path = os.path.join(spool, job_id + JOB_SUFFIX)
+        if not os.path.exists(path) and not os.path.exists(os.path.join(spool, "done", job_id + JOB_SUFFIX)):
+            break
+    _write_json(path, {'id': job_id, 'image': os.path.abspath(image), 'priority': priority, 'quality': quality,
+                       'max_size': list(max_size), 'text': text, 'submitted': time.time()})
+    return job_id
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def valid_job(job_id: str, job) -> bool:
+    """
+    Whether a job file can be sent as is: its name an on-air image ID
+    (rx.py reads the first 3 characters of the destination as the ID and
+    the rest as the packet count) and its fields of the right type, with
+    the optional ones filled in with their defaults
+    """
+    if len(job_id) != 3 or any(c not in tx.ALPHANUM for c in job_id):
+        return False
+    if not isinstance(job, dict) or not isinstance(job.get('image'), str):
+        return False
+    job.setdefault('priority', 0)
+    job.setdefault('quality', DEFAULT_QUALITY)
+    job.setdefault('max_size', list(DEFAULT_MAX_SIZE))
+    job.setdefault('text', '')
+    size = job['max_size']
+    return (_is_int(job['priority']) and _is_int(job['quality']) and 1 <= job['quality'] <= 95
+            and isinstance(size, list) and len(size) == 2 and all(_is_int(n) and n >= 16 for n in size)
+            and isinstance(job['text'], str))
+
+
+def read_jobs(spool: str) -> dict:
+    """Queued jobs of a spool directory by ID (the file name); unreadable or malformed job files are left out"""
+    jobs = {}
+    try:
+        names = os.listdir(spool)
+    except OSError:
+        return jobs
+    for name in names:
+        if name.endswith(JOB_SUFFIX):
+            try:
+                with open(os.path.join(spool, name)) as f:
+                    job = json.load(f)
+            except (OSError, ValueError):
+                # Being written, or not a job
+                continue
+            job_id = name[:-len(JOB_SUFFIX)]
+            if not valid_job(job_id, job):
+                continue
+            # The file name is the ID that cancel and priority go by
+            job['id'] = job_id
+            jobs[job['id']] = job
+    return jobs
+
+
+def set_priority(spool: str, job_id: str, priority: int) -> bool:
+    """Change the priority of a queued job; False if there is no such job"""
+    path = os.path.join(spool, job_id + JOB_SUFFIX)
+    try:
+        with open(path) as f:
+            job = json.load(f)
+    except (OSError, ValueError):
+        return False
+    job['priority'] = priority
+    _write_json(path, job)
+    return True
+
+
+def cancel(spool: str, job_id: str) -> bool:
+    """Cancel a queued job, also when it is being sent; False if there is no such job"""
+    try:
+        os.remove(os.path.join(spool, job_id + JOB_SUFFIX))
+        return True
+    except OSError:
+        return False
+
+
+class Job:
+    """A queued image and how far it has been sent"""
+
+    def __init__(self, spec: dict, submitted_order: int):
+        self.spec = spec
+        self.id = spec['id']
+        self.order = submitted_order
+        self.packets = None
+        self.sent = 0
+        self.started = None
+        self.dest_addr = None
+
+    @property
+    def priority(self) -> int:
+        return self.spec.get('priority', 0)
+
+    @property
+    def total(self) -> int | None:
+        return len(self.packets) if self.packets is not None else None
+
+
+class Daemon:
+    """Sends the jobs of a spool directory over one KISS connection"""
+
+    def __init__(self, args):
+        self.args = args
+        self.spool = args.spool
+        self.done_dir = os.path.join(self.spool, "done")
+        os.makedirs(self.done_dir, exist_ok=True)
+        os.makedirs(args.dir, exist_ok=True)
+        self.cache = None if args.no_cache else img2ssdv.EncodeCache(args.cache_dir, args.cache_size << 20)
+        self.src_addr = tx.ax25_address(args.callsign)
+        self.pacer = tx.Pacer(args.aggregate or args.max, args.baud, args.queue, args.delay)
+        self.jobs = {}
+        # (-priority, turn, submit order, ID); with --interleave the turn of
+        # a job goes up with every frame it sends, so equal priorities alternate
+        self.heap = []
+        self.turn = 0
+        self.submitted = 0
+        self.last_scan = 0.0
+        self.sock = None
+
+    def scan(self):
+        """Pick up new, reprioritised and cancelled jobs from the spool"""
+        self.last_scan = time.monotonic()
+        specs = read_jobs(self.spool)
+        for job_id in list(self.jobs):
+            if job_id not in specs:
+                job = self.jobs.pop(job_id)
+                self.finish(job, f"cancelled after {job.sent} frames")
+        for spec in sorted(specs.values(), key=lambda s: s.get('submitted', 0)):
+            job = self.jobs.get(spec['id'])
+            if job:
+                job.spec = spec
+            else:
+                self.submitted += 1
+                self.jobs[spec['id']] = Job(spec, self.submitted)
+                print(f"Queued {spec['id']}: {os.path.basename(spec['image'])} (priority {spec.get('priority', 0)})")
+        turns = {entry[3]: entry[1] for entry in self.heap}
+        self.heap = [(-job.priority, turns.get(job.id, self.turn), job.order, job.id) for job in self.jobs.values()]
+        heapq.heapify(self.heap)
+        _write_json(os.path.join(self.spool, STATUS_NAME),
+                    {job.id: {'sent': job.sent, 'total': job.total} for job in self.jobs.values()})
+
+    def finish(self, job: Job, result: str):
+        job.spec['result'] = result
+        job.spec['finished'] = time.time()
+        _write_json(os.path.join(self.done_dir, job.id + JOB_SUFFIX), job.spec)
+        try:
+            os.remove(os.path.join(self.spool, job.id + JOB_SUFFIX))
+        except OSError:
+            pass
+        print(f"{job.id} {os.path.basename(job.spec['image'])}: {result}")
+
+    def encode(self, job: Job) -> bool:
+        """Encode a job's image the first time it gets a turn"""
+        spec = job.spec
+        try:
+            suffix = f"{self.args.callsign}_{job.id}_{self.args.max}b_{spec['quality']}q"
+            job.packets, report = tx.img2ssdv(self.args.max, self.args.dir, spec['image'], self.args.callsign,
+                                              spec.get('text', ''), spec['quality'], spec['max_size'], suffix, self.cache)
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            # A job file edited since read_jobs checked it, or an image that cannot be encoded
+            del self.jobs[job.id]
+            self.finish(job, f"failed: {e}")
+            return False
+        if self.args.verbose:
+            print(report)
+        packets = tx.order_packets(job.packets, self.args.order, self.args.stride)
+        job.dest_addr = tx.ax25_address(job.id + hex(len(packets))[2:], last=True)
+        job.packets = packets + erasure.repair_frames(packets, self.args.repair, self.args.group)
+        if self.args.aggregate:
+            job.packets = aggregate.pack(job.packets, self.args.max, self.args.aggregate)
+        job.started = time.monotonic()
+        return True
+
+    def next_frame(self) -> tuple[Job, bytes] | None:
+        """KISS frame to send next and its job, or None when the queue is empty"""
+        while self.heap:
+            neg_priority, turn, order, job_id = self.heap[0]
+            job = self.jobs.get(job_id)
+            if not job or (job.packets is None and not self.encode(job)):
+                heapq.heappop(self.heap)
+                continue
+            packet = job.packets[job.sent]
+            if self.args.interleave:
+                self.turn = turn + 1
+                heapq.heapreplace(self.heap, (neg_priority, self.turn, order, job_id))
+            return job, tx.FEND + b'\x00' + tx.kiss_escape(job.dest_addr + self.src_addr + b'\x03\xf0' + packet) + tx.FEND
+        return None
+
+    def connect(self):
+        """Connect to Dire Wolf, retrying with backoff until it answers"""
+        backoff = 1.0
+        while True:
+            try:
+                self.sock = socket.create_connection((self.args.host, self.args.port), timeout=10)
+                print(f"Connected to {self.args.host}:{self.args.port}")
+                return
+            except OSError as e:
+                print(f"KISS connection failed ({e}), retrying in {backoff:.0f} s")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def drain(self) -> bool:
+        """Discard what Dire Wolf sends us (received frames); False if it closed the connection"""
+        while select.select([self.sock], [], [], 0)[0]:
+            try:
+                if not self.sock.recv(65536):
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def send(self, frame: bytes):
+        """Send one frame, reconnecting until it goes through"""
+        while True:
+            if self.sock is None or not self.drain():
+                if self.sock is not None:
+                    self.sock.close()
+                    print("KISS connection lost")
+                self.connect()
+            try:
+                self.sock.sendall(frame)
+                return
+            except OSError:
+                self.sock.close()
+                self.sock = None
+
+    def run(self):
+        self.connect()
+        self.scan()
+        while True:
+            if time.monotonic() - self.last_scan >= SCAN_INTERVAL:
+                self.scan()
+            item = self.next_frame()
+            if not item:
+                time.sleep(SCAN_INTERVAL)
+                self.scan()
+                continue
+            job, frame = item
+            self.pacer.wait(len(job.packets[job.sent]))
+            # The job may have been cancelled while waiting
+            if job.id not in self.jobs:
+                continue
+            self.send(frame)
+            job.sent += 1
+            if job.sent == len(job.packets):
+                del self.jobs[job.id]
+                self.heap = [entry for entry in self.heap if entry[3] != job.id]
+                heapq.heapify(self.heap)
+                self.finish(job, f"sent {job.sent} frames in {time.monotonic() - job.started:.1f} s")
+
+
+def serve(args):
+    if not (64 <= args.max <= 256):
+        print("Error: --max should be between 64 and 256", file=sys.stderr)
+        sys.exit(1)
+    if args.stride < 1:
+        print("Error: --stride must be at least 1", file=sys.stderr)
+        sys.exit(1)
+    if args.repair < 0 or args.group < 1 or args.group + args.repair > 256:
+        print("Error: --repair and --group must be positive and add up to at most 256", file=sys.stderr)
+        sys.exit(1)
+    if args.aggregate and not (2 * args.max <= args.aggregate - aggregate.AGGREGATE_HEADER.size
+                               and args.aggregate <= aggregate.MAX_MTU):
+        print(f"Error: --aggregate must leave room for two packets of --max bytes and be at most {aggregate.MAX_MTU}",
+              file=sys.stderr)
+        sys.exit(1)
+    daemon = Daemon(args)
+    print(f"Spool {os.path.abspath(args.spool)}, sending as {args.callsign} to {args.host}:{args.port}. Ctrl-C to stop.")
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        print()
+        print(daemon.pacer.report())
+        if daemon.sock:
+            daemon.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transmit daemon: send queued images over one Dire Wolf KISS connection")
+    parser.add_argument("--spool", default=DEFAULT_SPOOL_DIR, help=f"spool directory (default: {DEFAULT_SPOOL_DIR})")
+    parser.add_argument("--version", action='version', version=f"ssdv2sat-%(prog)s v{VERSION} by hobisatelit <https://github.com/hobisatelit>", help="Show the version of the application")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("serve", help="run the daemon")
+    p.add_argument("callsign", help="your actual callsign")
+    p.add_argument("--host", default="127.0.0.1", help="Dire Wolf host (default: 127.0.0.1)")
+    p.add_argument("--port", type=int, default=8001, help="Dire Wolf KISS TCP port (default: 8001)")
+    p.add_argument("--max", type=int, default=tx.DEFAULT_PACKET_LENGTH,
+                   help=f"SSDV packet length (default: {tx.DEFAULT_PACKET_LENGTH}, min 64, max 256)")
+    p.add_argument("--delay", type=float, default=tx.DEFAULT_DELAY, help="extra seconds between frames (default: 0)")
+    p.add_argument("--baud", type=int, default=img2ssdv.DEFAULT_BAUD,
+                   help=f"Dire Wolf MODEM bit rate, for pacing (default: {img2ssdv.DEFAULT_BAUD})")
+    p.add_argument("--queue", type=int, default=tx.DEFAULT_QUEUE,
+                   help=f"frames to keep queued in Dire Wolf, 0 sends without pacing (default: {tx.DEFAULT_QUEUE})")
+    p.add_argument("--interleave", action="store_true", help="alternate frames of jobs with the same priority")
+    p.add_argument("--order", choices=tx.ORDERINGS, default="sequential",
+                   help="packet transmit order within an image, see tx.py (default: sequential)")
+    p.add_argument("--stride", type=int, default=tx.DEFAULT_STRIDE,
+                   help=f"packet step for --order stride (default: {tx.DEFAULT_STRIDE})")
+    p.add_argument("--repair", type=int, default=0,
+                   help="erasure-coded repair frames per packet group, sent after each image (default: 0)")
+    p.add_argument("--group", type=int, default=erasure.DEFAULT_GROUP,
+                   help=f"packets per repair group (default: {erasure.DEFAULT_GROUP})")
+    p.add_argument("--aggregate", type=int, default=0, metavar="MTU",
+                   help="pack consecutive packets into frames of up to MTU bytes, see tx.py (default: 0, one packet per frame)")
+    p.add_argument("--dir", default=tx.DEFAULT_AUDIO_DIR, help=f"where the SSDV files go (default: {tx.DEFAULT_AUDIO_DIR})")
+    p.add_argument("--cache-dir", default=tx.DEFAULT_CACHE_DIR, help=f"encoded image cache (default: {tx.DEFAULT_CACHE_DIR})")
+    p.add_argument("--cache-size", type=int, default=tx.DEFAULT_CACHE_SIZE,
+                   help=f"cache size limit in MB (default: {tx.DEFAULT_CACHE_SIZE})")
+    p.add_argument("--no-cache", action="store_true", help="always encode images")
+    p.add_argument("-v", "--verbose", action="store_true", help="print the encoding report of every image")
+
+    p = commands.add_parser("submit", help="queue an image")
+    p.add_argument("image", help="input image file (JPG, PNG, etc)")
+    p.add_argument("--priority", type=int, default=0, help="higher is sent first (default: 0)")
+    p.add_argument("--quality", type=int, default=DEFAULT_QUALITY, help=f"JPEG quality 1-95 (default: {DEFAULT_QUALITY})")
+    p.add_argument("--max-size", nargs=2, type=int, metavar=("WIDTH", "HEIGHT"), default=DEFAULT_MAX_SIZE,
+                   help="max width and height in pixels (default: 320 320)")
+    p.add_argument("--text", default='', help="put small text top-left corner of the image")
+
+    commands.add_parser("list", help="show the queued jobs")
+
+    p = commands.add_parser("priority", help="change the priority of a queued job")
+    p.add_argument("id", help="job ID")
+    p.add_argument("priority", type=int, help="new priority")
+
+    p = commands.add_parser("cancel", help="cancel a queued job")
+    p.add_argument("id", help="job ID")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args)
+    elif args.command == "submit":
+        if not os.path.exists(args.image):
+            print(f"Error: File '{args.image}' not found!", file=sys.stderr)
+            sys.exit(1)
+        if not (1 <= args.quality <= 95) or min(args.max_size) < 16:
+            print("Error: quality must be between 1 and 95 and max dimensions at least 16 pixels", file=sys.stderr)
+            sys.exit(1)
+        job_id = submit(args.spool, args.image, args.priority, args.quality, args.max_size, args.text)
+        print(f"Queued {job_id} → {args.spool}")
+    elif args.command == "list":
+        jobs = read_jobs(args.spool)
+        try:
+            with open(os.path.join(args.spool, STATUS_NAME)) as f:
+                status = json.load(f)
+        except (OSError, ValueError):
+            status = {}
+        for job in sorted(jobs.values(), key=lambda j: (-j.get('priority', 0), j.get('submitted', 0))):
+            st = status.get(job['id'], {})
+            progress = f"{st['sent']}/{st['total']} frames" if st.get('total') else "waiting"
+            print(f"{job['id']}  priority {job.get('priority', 0):3d}  {progress:>16}  {job['image']}")
+        if not jobs:
+            print("No queued jobs")
+    elif args.command == "priority":
+        if not set_priority(args.spool, args.id, args.priority):
+            print(f"Error: no queued job {args.id}", file=sys.stderr)
+            sys.exit(1)
+    elif args.command == "cancel":
+        if not cancel(args.spool, args.id):
+            print(f"Error: no queued job {args.id}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()